@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+ASCII Box Diagrams
+Scans box-drawing diagrams (┌─┐ │ └─┘ with ◄──► / ▼ arrows) in a single pass
+over their rows, recognizes boxes, labels and arrows, and draws them as
+positioned native shapes; parsed geometry is cached per diagram digest
+"""
+
+import argparse
+import hashlib
+import re
+import sys
+import textwrap
+import threading
+from dataclasses import dataclass, field
+
+from pptx.dml.color import RGBColor
+from pptx.util import Emu, Inches, Pt
+
+from diagrams import BOTTOM, LEFT, RIGHT, TOP, Edge, _set_text, add_edge_label, add_node, connect
+
+CORNERS = '┌┐└┘'
+HORIZONTAL = '─┬┴┼'
+WALLS = '│├┤┼'
+# How far (in columns) a wall may drift from the box's top corners; hand-drawn
+# rows with arrows are often one column off
+WALL_SLACK = 2
+
+_HORIZONTAL_ARROW = re.compile(r'^[◄<]?[─\-]{2,}[►>]?$')
+_VERTICAL_ARROW = set('│▼▲↓↑')
+_SEGMENT = re.compile(r'\S+(?: \S+)*')
+_FENCE = re.compile(r'^```[^\n]*\n(.*?)^```', re.MULTILINE | re.DOTALL)
+_HEADING = re.compile(r'^#{1,6}\s+(.*)$', re.MULTILINE)
+
+
+@dataclass
+class Box:
+    top: int
+    left: int
+    right: int
+    bottom: int = None
+    lines: list = field(default_factory=list)
+
+    @property
+    def title(self):
+        """Text before the first bullet, joined into one label"""
+        title = []
+        for line in self.lines:
+            if line.startswith('•'):
+                break
+            title.append(line)
+        return ' '.join(title)
+
+    @property
+    def bullets(self):
+        """Bullet lines with their indented continuation lines folded in"""
+        bullets = []
+        for line in self.lines:
+            if line.startswith('•'):
+                bullets.append(line)
+            elif bullets:
+                bullets[-1] += ' ' + line
+        return bullets
+
+
+@dataclass
+class Arrow:
+    source: int          # box index
+    target: int
+    label: str = None
+    arrow: bool = True   # head at the target
+    arrow_start: bool = False
+    vertical: bool = False
+
+
+@dataclass
+class Label:
+    row: int
+    col: int
+    text: str
+
+
+@dataclass
+class BoxDiagram:
+    rows: int
+    cols: int
+    boxes: list
+    arrows: list
+    labels: list         # free text outside boxes and arrows
+
+
+def _find_wall(line, col, chars, slack=WALL_SLACK):
+    """Column of the wall character nearest col, or None"""
+    for offset in sorted(range(-slack, slack + 1), key=abs):
+        c = col + offset
+        if 0 <= c < len(line) and line[c] in chars:
+            return c
+    return None
+
+
+def _scan(text):
+    """Single pass over the rows: boxes, arrow segments, vertical arrow cells and free text"""
+    grid = textwrap.dedent(text.expandtabs()).strip('\n').splitlines()
+    open_boxes, boxes = [], []
+    arrows, verticals, texts = [], [], []
+    for row, line in enumerate(grid):
+        used = [False] * len(line)
+
+        for box in list(open_boxes):
+            left = _find_wall(line, box.left, '└')
+            right = _find_wall(line, box.right, '┘')
+            if left is not None and right is not None and right > left:
+                box.bottom = row
+                open_boxes.remove(box)
+                span = range(left, right + 1)
+            else:
+                left = _find_wall(line, box.left, WALLS)
+                right = _find_wall(line, box.right, WALLS)
+                if left is None or right is None or right <= left:
+                    continue  # a ragged row; keep the box open
+                content = line[left + 1:right].strip()
+                if content:
+                    box.lines.append(re.sub(r'\s+', ' ', content))
+                span = range(left, right + 1)
+            for c in span:
+                used[c] = True
+
+        col = 0
+        while col < len(line):
+            if line[col] == '┌' and not used[col]:
+                end = col + 1
+                while end < len(line) and line[end] in HORIZONTAL:
+                    end += 1
+                if end < len(line) and line[end] == '┐':
+                    box = Box(row, col, end)
+                    open_boxes.append(box)
+                    boxes.append(box)
+                    for c in range(col, end + 1):
+                        used[c] = True
+                    col = end
+            col += 1
+
+        # Whatever is left is arrows or free text; split on runs of 2+ spaces
+        masked = ''.join(' ' if used[c] else ch for c, ch in enumerate(line))
+        for segment in _SEGMENT.finditer(masked):
+            value = segment.group()
+            if _HORIZONTAL_ARROW.match(value):
+                arrows.append((row, segment.start(), segment.end() - 1, value))
+            elif len(value) == 1 and value in _VERTICAL_ARROW:
+                verticals.append((row, segment.start(), value))
+            elif value.strip(CORNERS + HORIZONTAL + WALLS):
+                texts.append(Label(row, segment.start(), value))
+    return grid, boxes, arrows, verticals, texts
+
+
+def _boxes_at_row(boxes, row):
+    return [(i, b) for i, b in enumerate(boxes) if b.top <= row <= (b.bottom if b.bottom is not None else row)]
+
+
+def parse_box_diagram(text):
+    """Parse a box-drawing diagram into boxes, arrows between them and free labels"""
+    grid, boxes, segments, verticals, texts = _scan(text)
+    unclosed = [b for b in boxes if b.bottom is None]
+    if unclosed:
+        raise ValueError(f"box at row {unclosed[0].top + 1}, column {unclosed[0].left + 1} is never closed")
+
+    arrows = []
+    for row, start, end, value in segments:
+        candidates = _boxes_at_row(boxes, row)
+        # Corner columns, give or take the drift of hand-aligned arrow rows
+        before = [(b.right, i) for i, b in candidates if b.left < start and b.right < start + WALL_SLACK]
+        after = [(b.left, i) for i, b in candidates if b.right > end and b.left > end - WALL_SLACK]
+        if not before or not after:
+            texts.append(Label(row, start, value))
+            continue
+        source, target = max(before)[1], min(after)[1]
+        # Labels sit in the same gap on the other rows both boxes span
+        top = max(boxes[source].top, boxes[target].top)
+        bottom = min(boxes[source].bottom, boxes[target].bottom)
+        gap = (boxes[source].right, boxes[target].left)
+        label = [t for t in texts if top <= t.row <= bottom and gap[0] < t.col < gap[1]]
+        for t in label:
+            texts.remove(t)
+        arrows.append(Arrow(source, target, ' '.join(t.text for t in label) or None,
+                            arrow=value[-1] in '►>', arrow_start=value[0] in '◄<'))
+
+    # Vertical runs: consecutive rows in (nearly) the same column
+    runs = []
+    for row, col, char in verticals:
+        for run in runs:
+            if abs(run['col'] - col) <= 1 and run['rows'][-1] == row - 1:
+                run['rows'].append(row)
+                run['chars'] += char
+                break
+        else:
+            runs.append({'col': col, 'rows': [row], 'chars': char})
+    for run in runs:
+        col, first, last = run['col'], run['rows'][0], run['rows'][-1]
+        above = [(b.bottom, i) for i, b in enumerate(boxes) if b.bottom < first and b.left <= col <= b.right]
+        below = [(b.top, i) for i, b in enumerate(boxes) if b.top > last and b.left <= col <= b.right]
+        if not above or not below:
+            continue  # a stray wall fragment, not a connection
+        upward = '▲' in run['chars'] or '↑' in run['chars']
+        arrows.append(Arrow(max(above)[1], min(below)[1], None, arrow=not upward,
+                            arrow_start=upward, vertical=True))
+
+    return BoxDiagram(len(grid), max((len(line) for line in grid), default=0), boxes, arrows, texts)
+
+
+class BoxDiagramCache:
+    """Parsed diagrams keyed by the SHA-256 of their source text"""
+
+    def __init__(self):
+        self._diagrams = {}
+        self._lock = threading.Lock()
+
+    def parse(self, text):
+        key = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        diagram = self._diagrams.get(key)
+        if diagram is None:
+            diagram = parse_box_diagram(text)
+            with self._lock:
+                self._diagrams[key] = diagram
+        return diagram
+
+    def clear(self):
+        with self._lock:
+            self._diagrams.clear()
+
+
+_default_cache = BoxDiagramCache()
+
+
+def box_diagram(text):
+    """Parsed diagram from the process-wide cache"""
+    return _default_cache.parse(text)
+
+
+def box_diagram_blocks(markdown):
+    """{heading: source} for every fenced block that contains a box-drawing diagram"""
+    headings = [(m.start(), m.group(1)) for m in _HEADING.finditer(markdown)]
+    blocks = {}
+    for block in _FENCE.finditer(markdown):
+        if '┌' not in block.group(1):
+            continue
+        title = ''
+        for start, text in headings:
+            if start > block.start():
+                break
+            title = text
+        title = re.sub(r'[^\w\s.&/()-]', '', title).strip()
+        blocks[title] = block.group(1)
+    return blocks
+
+
+def draw_box_diagram(slide, diagram, left, top, width, height, fill=None, line=None, text=None,
+                     font_size=Pt(12)):
+    """Draw a parsed box diagram scaled into the given area; returns the box shapes"""
+    fill = fill or RGBColor(0xE6, 0xF3, 0xFF)
+    line = line or RGBColor(0x00, 0x66, 0xCC)
+    text = text or RGBColor(0x33, 0x33, 0x33)
+    col_w = width / max(diagram.cols, 1)
+    row_h = height / max(diagram.rows, 1)
+    # Proportional text needs ~1.2x less width than the 0.6em Courier cells it replaces
+    size = Pt(min(font_size.pt, Emu(int(col_w)).pt / 0.6 * 1.2, Emu(int(row_h)).pt * 0.9))
+
+    def x(col):
+        return left + col * col_w
+
+    def y(row):
+        return top + row * row_h
+
+    shapes = []
+    for box in diagram.boxes:
+        shapes.append(add_node(slide, 'rect', x(box.left), y(box.top), (box.right - box.left + 1) * col_w,
+                               (box.bottom - box.top + 1) * row_h, box.title, fill, line, text,
+                               size, details=box.bullets))
+    label_size = Pt(max(size.pt - 2, 7))
+    for arrow in diagram.arrows:
+        edge = Edge(None, None, arrow.label, arrow=arrow.arrow, arrow_start=arrow.arrow_start)
+        source, target = shapes[arrow.source], shapes[arrow.target]
+        sites = (BOTTOM, TOP) if arrow.vertical else (RIGHT, LEFT)
+        connector = connect(slide, source, sites[0], target, sites[1], edge, line)
+        if arrow.label:
+            mid = ((connector.begin_x + connector.end_x) // 2, (connector.begin_y + connector.end_y) // 2)
+            add_edge_label(slide, mid, arrow.label, not arrow.vertical, label_size, text)
+    for label in diagram.labels:
+        box = slide.shapes.add_textbox(Emu(int(x(label.col))), Emu(int(y(label.row))),
+                                       Emu(int(len(label.text) * col_w * 1.2)), Emu(int(row_h)))
+        _set_text(box.text_frame, [(label.text, size, True)], text, align=None)
+        box.text_frame.word_wrap = False
+    return shapes
+
+
+def main():
+    from pptx import Presentation
+
+    parser = argparse.ArgumentParser(description="Convert the box diagrams in a Markdown file into native slides")
+    parser.add_argument('source', help="Markdown file, e.g. workflow_diagrams.md")
+    parser.add_argument('-o', '--output', default='box_diagrams.pptx')
+    args = parser.parse_args()
+
+    with open(args.source, encoding='utf-8') as f:
+        blocks = box_diagram_blocks(f.read())
+    prs = Presentation()
+    for title, source in blocks.items():
+        slide = prs.slides.add_slide(prs.slide_layouts[5])  # Title only
+        slide.shapes.title.text = title
+        draw_box_diagram(slide, box_diagram(source), Inches(0.3), Inches(1.6),
+                         prs.slide_width - Inches(0.6), prs.slide_height - Inches(2.0))
+    prs.save(args.output)
+    print(f"✅ Converted {len(blocks)} diagrams: {args.output}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except (OSError, ValueError) as e:
+        print(f"❌ Error converting diagrams: {e}")
+        sys.exit(1)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Deck Generation Benchmark
+Measures decks per second, peak RSS and output size for the 20-slide deck and
+for synthetic bullet decks, across the generator's build modes, and writes the
+results as JSON so runs can be compared between versions
+"""
+
+import argparse
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+from importlib import metadata
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SIZES = (100, 1000, 10000)
+MODES = ('per-paragraph', 'inherited', 'template-cached', 'prototype', 'streaming', 'parallel')
+BULLETS_PER_SLIDE = 6
+RESULTS_VERSION = 1
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None where unsupported"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def deck_bullets():
+    """(heading, bullets) groups harvested from the real deck's content slides"""
+    from create_presentation import build_presentation
+    from deck_theme import BULLET, HEADING, SMALL_BULLET
+
+    groups = []
+    for slide in build_presentation().slides:
+        for shape in slide.placeholders:
+            if shape.placeholder_format.idx != 1 or not shape.has_text_frame:
+                continue
+            for p in shape.text_frame.paragraphs:
+                if p.level == HEADING and p.text.strip():
+                    groups.append((p.text, []))
+                elif p.level in (BULLET, SMALL_BULLET) and groups:
+                    groups[-1][1].append((p.level, p.text))
+    return [(heading, bullets) for heading, bullets in groups if bullets]
+
+
+def _style_per_paragraph(p, level, colors):
+    """The generator's original styling: explicit run properties on every paragraph"""
+    from pptx.util import Pt
+    from deck_theme import HEADING, SMALL_BULLET
+
+    if level == HEADING:
+        p.font.size = Pt(18)
+        p.font.bold = True
+        p.font.color.rgb = colors.PRIMARY_BLUE
+    else:
+        p.font.size = Pt(14 if level == SMALL_BULLET else 16)
+        p.font.color.rgb = colors.TEXT_DARK
+
+
+def _fill_synthetic(add_slide, slides, mode, groups):
+    from create_presentation import deck_settings
+    from deck_theme import HEADING
+
+    colors = deck_settings().colors
+    for n in range(slides):
+        heading, bullets = groups[n % len(groups)]
+        slide = add_slide()
+        slide.shapes.title.text = f"Synthetic Slide {n + 1}"
+        frame = slide.placeholders[1].text_frame
+        paragraphs = [(HEADING, heading)] + bullets[:BULLETS_PER_SLIDE]
+        for i, (level, text) in enumerate(paragraphs):
+            p = frame.paragraphs[0] if i == 0 else frame.add_paragraph()
+            p.text = text
+            p.level = level
+            if mode == 'per-paragraph':
+                _style_per_paragraph(p, level, colors)
+
+
+def synthetic_ir(slides, groups):
+    """The synthetic bullet deck as slide IR, for the prototype and parallel builds"""
+    from slide_ir import Bullet, Section, Slide
+
+    deck = []
+    for n in range(slides):
+        heading, bullets = groups[n % len(groups)]
+        items = []
+        for level, text in bullets[:BULLETS_PER_SLIDE]:
+            marker, _, text = text.partition(' ')
+            items.append(Bullet(text, marker, level))
+        deck.append(Slide(f"Synthetic Slide {n + 1}", (Section(heading, items=tuple(items)),)))
+    return deck
+
+
+def build_synthetic(slides, mode, groups):
+    """Serialized deck of bullet slides in one of MODES"""
+    from pptx import Presentation
+    from create_presentation import PRIMARY_BLUE, TEXT_DARK
+    from deck_io import deck_bytes
+    from deck_theme import apply_theme
+    from streaming_writer import StreamingDeckWriter
+    from template_cache import new_presentation
+
+    if mode == 'streaming':
+        buffer = io.BytesIO()
+        with StreamingDeckWriter(buffer, theme=(PRIMARY_BLUE, TEXT_DARK)) as writer:
+            _fill_synthetic(lambda: writer.add_slide(1), slides, mode, groups)
+        return buffer.getvalue()
+
+    if mode == 'parallel':
+        from create_presentation import deck_settings
+        from parallel_build import build_parallel
+
+        buffer = io.BytesIO()
+        build_parallel(synthetic_ir(slides, groups), deck_settings().colors, buffer)
+        return buffer.getvalue()
+
+    if mode == 'prototype':
+        from create_presentation import deck_settings
+        from slide_ir import render_deck
+
+        colors = deck_settings().colors
+        prs = new_presentation(theme=(PRIMARY_BLUE, TEXT_DARK))
+        return deck_bytes(render_deck(prs, synthetic_ir(slides, groups), colors))
+
+    if mode == 'template-cached':
+        prs = new_presentation(theme=(PRIMARY_BLUE, TEXT_DARK))
+    else:
+        prs = Presentation()
+        if mode == 'inherited':
+            apply_theme(prs, PRIMARY_BLUE, TEXT_DARK)
+    layout = prs.slide_layouts[1]
+    _fill_synthetic(lambda: prs.slides.add_slide(layout), slides, mode, groups)
+    return deck_bytes(prs)
+
+
+def run_case(case, slides, mode, min_time):
+    """Run one benchmark case in this process and return its result record"""
+    from deck_io import deck_bytes
+
+    if case == 'deck':
+        from create_presentation import build_presentation
+        from template_cache import _default_cache
+
+        def build():
+            if mode == 'inherited':
+                _default_cache.clear()  # re-read and re-theme the template every deck
+            return deck_bytes(build_presentation())
+        build()  # untimed warm-up: imports and template cache
+    else:
+        groups = deck_bullets()  # also serves as the warm-up
+
+        def build():
+            return build_synthetic(slides, mode, groups)
+
+    iterations = 0
+    start = time.perf_counter()
+    while True:
+        output_bytes = len(build())
+        iterations += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+    return {
+        'case': case,
+        'slides': slides,
+        'mode': mode,
+        'iterations': iterations,
+        'seconds_per_deck': elapsed / iterations,
+        'decks_per_second': iterations / elapsed,
+        'output_bytes': output_bytes,
+        'peak_rss_bytes': peak_rss_bytes(),
+    }
+
+
+def _run_isolated(case, slides, mode, min_time):
+    """Run one case in a fresh interpreter so peak RSS is per case"""
+    command = [sys.executable, __file__, '--run-case', case, str(slides), mode, str(min_time)]
+    completed = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
+
+
+def cases(sizes, modes):
+    """(case, slides, mode) for every benchmark in the suite"""
+    # The real deck only has the inherited styling; compare cached vs uncached template
+    for mode in modes:
+        if mode in ('inherited', 'template-cached'):
+            yield 'deck', 20, mode
+    for slides in sizes:
+        for mode in modes:
+            yield 'synthetic', slides, mode
+
+
+def environment():
+    try:
+        pptx_version = metadata.version('python-pptx')
+    except metadata.PackageNotFoundError:
+        pptx_version = None
+    return {'python': platform.python_version(), 'python_pptx': pptx_version,
+            'platform': platform.platform(), 'machine': platform.machine()}
+
+
+def run_suite(sizes=DEFAULT_SIZES, modes=MODES, min_time=1.0, progress=None):
+    """Run every case and return the results document"""
+    results = []
+    for case, slides, mode in cases(sizes, modes):
+        result = _run_isolated(case, slides, mode, min_time)
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return {'version': RESULTS_VERSION, 'environment': environment(),
+            'min_time': min_time, 'results': results}
+
+
+def _print_result(result):
+    rss = result['peak_rss_bytes']
+    rss = f"{rss / (1024 * 1024):7.1f} MiB" if rss is not None else '      n/a'
+    print(f"   {result['case']:<9} {result['slides']:>6} slides  {result['mode']:<15}"
+          f" {result['decks_per_second']:9.2f} decks/s  {rss}  {result['output_bytes'] / 1024:9.1f} KiB")
+
+
+def main():
+    if len(sys.argv) == 6 and sys.argv[1] == '--run-case':
+        _, _, case, slides, mode, min_time = sys.argv
+        print(json.dumps(run_case(case, int(slides), mode, float(min_time))))
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark deck generation throughput and output size")
+    parser.add_argument('-o', '--output', default='benchmark_results.json',
+                        help="JSON results file")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help="slide counts for the synthetic bullet decks")
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--min-time', type=float, default=1.0,
+                        help="seconds to repeat each case for (at least one timed build)")
+    args = parser.parse_args()
+
+    print("📊 Benchmarking deck generation")
+    suite = run_suite(args.sizes, args.modes, args.min_time, progress=_print_result)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(suite, f, indent=2)
+        f.write('\n')
+    print(f"✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
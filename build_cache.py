@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Deck Build Cache
+Stores finished decks in a local directory keyed on a hash of everything that
+affects the output, evicting the least recently used decks past a size limit
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from importlib import metadata, util
+
+DEFAULT_CACHE_DIR = '.deck_cache'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+CACHE_SUFFIX = '.pptx'
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def pptx_environment():
+    """python-pptx version and default template digest, found without importing pptx"""
+    version = metadata.version('python-pptx')
+    spec = util.find_spec('pptx')
+    template = os.path.join(spec.submodule_search_locations[0], 'templates', 'default.pptx')
+    return version, file_digest(template)
+
+
+def cache_key(*parts):
+    """Combine build inputs (strings, bytes or dicts) into one cache key"""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, dict):
+            part = '\n'.join(f"{k}={part[k]}" for k in sorted(part))
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        h.update(hashlib.sha256(part).digest())
+    return h.hexdigest()
+
+
+class BuildCache:
+    """Directory of finished decks with LRU size-based eviction
+
+    Entry recency is the file mtime, refreshed on every hit.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def get(self, key):
+        """Return the cached deck path for key, or None on a miss"""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def fetch(self, key, output):
+        """Copy a cached deck to a path or binary stream; returns False on a miss"""
+        path = self.get(key)
+        if path is None:
+            return False
+        if hasattr(output, 'write'):
+            with open(path, 'rb') as f:
+                shutil.copyfileobj(f, output)
+        else:
+            shutil.copyfile(path, output)
+        return True
+
+    def put_bytes(self, key, data):
+        """Store an in-memory deck under key and evict old entries"""
+        os.makedirs(self.directory, exist_ok=True)
+        # Write to a temp file first so concurrent readers never see a partial deck
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+        self.evict()
+
+    def entries(self):
+        """(mtime, size, path) of every cached deck, oldest first"""
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if not name.endswith(CACHE_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        """Delete least recently used decks until the cache fits max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Remove every cached deck"""
+        for _, _, path in self.entries():
+            os.remove(path)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Native Chart Parts
+Adds python-pptx chart parts without its per-chart costs: the embedded
+workbook is written in one pass from NumPy arrays into a cached workbook
+skeleton, the chart XML is a copy of a cached template per chart design with
+its data caches swapped in, and part names come from a per-package counter
+instead of a walk over every part in the deck
+"""
+
+import copy
+import io
+import itertools
+import re
+import weakref
+import zipfile
+from functools import lru_cache
+from numbers import Real
+from xml.sax.saxutils import escape
+
+import numpy as np
+from pptx.chart.chart import Chart as PptxChart
+from pptx.chart.data import CategoryChartData, XyChartData
+from pptx.chart.xmlwriter import ChartXmlWriter
+from pptx.dml.color import RGBColor
+from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+from pptx.parts.chart import ChartPart
+from pptx.parts.embeddedpackage import EmbeddedXlsxPart
+from pptx.util import Pt
+
+from deck_io import ZIP_EPOCH, canonicalize_package
+
+LINE, COLUMN, AREA, XY = 'line', 'column', 'area', 'xy'
+CHART_TYPES = {
+    LINE: XL_CHART_TYPE.LINE,
+    COLUMN: XL_CHART_TYPE.COLUMN_CLUSTERED,
+    AREA: XL_CHART_TYPE.AREA,
+    XY: XL_CHART_TYPE.XY_SCATTER_LINES_NO_MARKERS,
+}
+CHART_FONT_SIZE = Pt(11)
+LINE_WIDTH = Pt(2.25)
+
+SHEET = 'xl/worksheets/sheet1.xml'
+_SHEET_XML = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+              '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+              '<dimension ref="A1:{last}"/><sheetData>{rows}</sheetData></worksheet>')
+_PART_NUMBER = re.compile(r'^/ppt/(?:charts/chart|embeddings/Microsoft_Excel_Sheet)(\d+)\.')
+# Next free chart/workbook number per package
+_counters = weakref.WeakKeyDictionary()
+
+
+def column_letter(index):
+    """Spreadsheet column name of a 0-based column index: 0 -> A, 26 -> AA"""
+    name = ''
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        name = chr(65 + rest) + name
+    return name
+
+
+def _numeric(values):
+    return all(isinstance(v, Real) and not isinstance(v, bool) for v in values)
+
+
+def _text(values):
+    """Cell text of a float array; NaN and infinities become empty, which charts show as gaps"""
+    values = np.asarray(values, dtype=float)
+    text = values.astype(str)
+    text[~np.isfinite(values)] = ''
+    return text
+
+
+@lru_cache(maxsize=1)
+def _workbook_skeleton():
+    """Every part of a one-sheet workbook except the sheet, from one XlsxWriter run with dates pinned"""
+    data = CategoryChartData()
+    data.categories = (1,)
+    data.add_series('', (1,))
+    with zipfile.ZipFile(io.BytesIO(canonicalize_package(data.xlsx_blob, embedded=True))) as workbook:
+        return tuple((name, workbook.read(name)) for name in workbook.namelist())
+
+
+def workbook_blob(x, names, columns):
+    """xlsx bytes holding x in column A and one column per series, series names in row 1"""
+    values = _text(np.asarray(columns, dtype=float).T.reshape(len(x), len(names)))
+    letters = np.array([column_letter(i) for i in range(1, len(names) + 1)])
+    numbers = np.arange(2, len(x) + 2).astype(str)
+    # Every data cell of the sheet in one vectorized pass: <c r="B2"><v>0.25</v></c>
+    cells = np.char.add(np.char.add('<c r="', np.char.add(letters[None, :], numbers[:, None])), '"><v>')
+    cells = np.char.add(np.char.add(cells, values), '</v></c>')
+    cells[values == ''] = ''
+    if _numeric(x):
+        first = np.char.add(np.char.add(np.char.add('<c r="A', numbers), '"><v>'), np.char.add(_text(x), '</v></c>'))
+    else:
+        first = [f'<c r="A{n}" t="inlineStr"><is><t>{escape(str(v))}</t></is></c>' for n, v in zip(numbers, x)]
+    header = ''.join(f'<c r="{letter}1" t="inlineStr"><is><t>{escape(name)}</t></is></c>'
+                     for letter, name in zip(letters, names))
+    rows = [f'<row r="1">{header}</row>']
+    rows += [f'<row r="{n}">{a}{"".join(row)}</row>' for n, a, row in zip(numbers, first, cells.tolist())]
+    sheet = _SHEET_XML.format(last=f"{column_letter(len(names))}{len(x) + 1}", rows=''.join(rows))
+
+    # Stored, not deflated: the deck's own zip compresses the workbook as a whole
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_STORED) as workbook:
+        for name, blob in _workbook_skeleton():
+            workbook.writestr(zipfile.ZipInfo(name, date_time=ZIP_EPOCH), sheet.encode('utf-8') if name == SHEET else blob)
+    return out.getvalue()
+
+
+def _cache_ref(tag, ref, values):
+    """c:numRef or c:strRef with its cached points, values already as cell text"""
+    points = ''.join(f'<c:pt idx="{i}"><c:v>{v}</c:v></c:pt>' for i, v in enumerate(values) if v != '')
+    if tag == 'c:numRef':
+        cache = f'<c:numCache><c:formatCode>General</c:formatCode><c:ptCount val="{len(values)}"/>{points}</c:numCache>'
+    else:
+        cache = f'<c:strCache><c:ptCount val="{len(values)}"/>{points}</c:strCache>'
+    return f'<{tag}><c:f>{ref}</c:f>{cache}</{tag}>'
+
+
+def _data_element(tag, ref, values):
+    if _numeric(values):
+        inner = _cache_ref('c:numRef', ref, _text(values).tolist())
+    else:
+        inner = _cache_ref('c:strRef', ref, [escape(str(v)) for v in values])
+    return parse_xml(f'<{tag} {nsdecls("c")}>{inner}</{tag}>')
+
+
+@lru_cache(maxsize=64)
+def _template(kind, series_count, x_title, y_title, y_format, legend):
+    """Styled c:chartSpace of one chart design holding placeholder data"""
+    if kind == XY:
+        data = XyChartData()
+        for i in range(series_count):
+            series = data.add_series(str(i))
+            series.add_data_point(0, 0)
+    else:
+        data = CategoryChartData()
+        data.categories = (0,)
+        for i in range(series_count):
+            data.add_series(str(i), (0,))
+    chart_space = parse_xml(ChartXmlWriter(CHART_TYPES[kind], data).xml.encode('utf-8'))
+    chart = PptxChart(chart_space, None)
+    chart.font.size = CHART_FONT_SIZE
+    chart.has_legend = legend
+    if legend:
+        chart.legend.position = XL_LEGEND_POSITION.RIGHT if kind == XY else XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+    plot = chart.plots[0]
+    if kind == COLUMN:
+        plot.gap_width = 60
+    for series in plot.series:
+        # Placeholder colors, replaced per chart
+        if kind in (LINE, XY):
+            series.smooth = False
+            series.format.line.color.rgb = RGBColor(0, 0, 0)
+            series.format.line.width = LINE_WIDTH
+        else:
+            series.format.fill.solid()
+            series.format.fill.fore_color.rgb = RGBColor(0, 0, 0)
+    value_axis = chart.value_axis
+    value_axis.tick_labels.number_format, value_axis.tick_labels.number_format_is_linked = y_format, False
+    value_axis.has_major_gridlines = True
+    for axis, title in ((chart.category_axis, x_title), (value_axis, y_title)):
+        if title:
+            axis.has_title = True
+            axis.axis_title.text_frame.text = title
+    # The workbook is always the chart part's first relationship
+    chart_space._add_externalData().rId = 'rId1'
+    return chart_space
+
+
+def chart_xml(kind, x, series, x_title=None, y_title=None, y_format='General'):
+    """c:chartSpace for series of (name, RGBColor, values) over x, read from Sheet1 as workbook_blob() lays it out"""
+    element = copy.deepcopy(_template(kind, len(series), x_title, y_title, y_format, len(series) > 1))
+    last = len(x) + 1
+    x_tag, y_tag = ('c:xVal', 'c:yVal') if kind == XY else ('c:cat', 'c:val')
+    x_element = _data_element(x_tag, f"Sheet1!$A$2:$A${last}", x)
+    for index, (ser, (name, color, values)) in enumerate(zip(element.iter(qn('c:ser')), series)):
+        letter = column_letter(index + 1)
+        ser.replace(ser.find(qn('c:tx')), _data_element('c:tx', f"Sheet1!${letter}$1", [name]))
+        ser.find(qn('c:spPr')).find('.//' + qn('a:srgbClr')).set('val', str(color))
+        ser.replace(ser.find(qn(x_tag)), copy.deepcopy(x_element))
+        ser.replace(ser.find(qn(y_tag)), _data_element(y_tag, f"Sheet1!${letter}$2:${letter}${last}", values))
+    if kind == XY:
+        axis = PptxChart(element, None).category_axis
+        axis.minimum_scale, axis.maximum_scale = min(x), max(x)
+    return element
+
+
+def _next_number(package):
+    """Chart and workbook part number not yet taken in package; scans the package once"""
+    counter = _counters.get(package)
+    if counter is None:
+        taken = [int(m.group(1)) for m in (_PART_NUMBER.match(str(part.partname)) for part in package.iter_parts()) if m]
+        counter = _counters[package] = itertools.count(max(taken, default=0) + 1)
+    return next(counter)
+
+
+def add_chart(slide, kind, x, series, left, top, width, height, x_title=None, y_title=None, y_format='General'):
+    """Add a chart of series (name, RGBColor, values) over x to slide; returns the graphic frame shape
+
+    Use it for every chart of a presentation: part numbers are counted per
+    package, not looked up, so python-pptx's add_chart() could reuse one.
+    """
+    if kind not in CHART_TYPES:
+        raise ValueError(f"unknown chart kind {kind!r}; expected one of {', '.join(CHART_TYPES)}")
+    package = slide.part.package
+    number = _next_number(package)
+    chart_part = ChartPart(PackURI(f"/ppt/charts/chart{number}.xml"), CT.DML_CHART, package,
+                           chart_xml(kind, x, series, x_title, y_title, y_format))
+    workbook = EmbeddedXlsxPart(PackURI(f"/ppt/embeddings/Microsoft_Excel_Sheet{number}.xlsx"), CT.SML_SHEET,
+                                package, workbook_blob(x, [name for name, _, _ in series],
+                                                       [values for _, _, values in series]))
+    chart_part.relate_to(workbook, RT.PACKAGE)
+    rid = slide.part.relate_to(chart_part, RT.CHART)
+    shapes = slide.shapes
+    return shapes._shape_factory(shapes._add_chart_graphicFrame(rid, left, top, width, height))
@@ -4,55 +4,153 @@ ISO 15118 vs OCPP 1.6 Presentation Generator
 Creates a beautiful PowerPoint presentation from markdown content
 """
 
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
-from pptx.enum.shapes import MSO_SHAPE
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import replace
+from types import SimpleNamespace
+import argparse
+import fnmatch
+import io
+import json
+import math
+import os
 import re
+import sys
+import time
 
-def create_iso_15118_presentation():
-    """Create the ISO 15118 presentation"""
-    
-    # Create presentation
-    prs = Presentation()
-    
-    # Define colors
-    PRIMARY_BLUE = RGBColor(0, 102, 204)
-    SECONDARY_GREEN = RGBColor(0, 204, 102)
-    ACCENT_ORANGE = RGBColor(255, 102, 0)
-    BACKGROUND_GRAY = RGBColor(245, 245, 245)
-    TEXT_DARK = RGBColor(51, 51, 51)
-    LIGHT_BLUE = RGBColor(173, 216, 230)
-    LIGHT_GREEN = RGBColor(144, 238, 144)
-    
-    # Slide 1: Title Slide
-    slide_layout = prs.slide_layouts[0]  # Title slide
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    subtitle = slide.placeholders[1]
-    
-    title.text = "ISO 15118: The Next Generation of EV Charging Communication"
-    subtitle.text = "Comparing ISO 15118 with OCPP 1.6: Benefits for Vendors, Grid, and Users"
-    
-    # Apply formatting
-    title.text_frame.paragraphs[0].font.size = Pt(32)
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    subtitle.text_frame.paragraphs[0].font.size = Pt(18)
-    subtitle.text_frame.paragraphs[0].font.color.rgb = TEXT_DARK
-    
-    # Slide 2: Agenda
-    slide_layout = prs.slide_layouts[1]  # Title and content
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "Agenda"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
+from build_cache import BuildCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, cache_key, file_digest, pptx_environment
+from deck_io import STDOUT, deck_bytes, open_output, save_deck
+from deck_theme import BULLET, SMALL_BULLET
+from diagrams import mermaid_blocks
+from feature_matrix import KEY_DIFFERENCES, KEY_PROTOCOLS, comparison_table, feature_matrix_slides, feature_rows
+from instrumentation import NULL_PROFILER, BuildProfiler, builder_name
+from slide_ir import (BOX, COLUMN, LINE, MERMAID, TITLE_LAYOUT, Bullet, Chart, Diagram, Listing, PrototypeRenderer,
+                      Section, Slide, Text)
+from template_cache import new_presentation
+from text_fit import split_overflowing
+
+OUTPUT_FILE = 'ISO_15118_vs_OCPP_1.6_Presentation.pptx'
+PREVIEW_FILE = 'ISO_15118_vs_OCPP_1.6_Preview.pptx'
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Mermaid sources of the native workflow diagrams
+DIAGRAM_SOURCE = os.path.join(PACKAGE_DIR, 'diagram_instructions.md')
+# Files besides this one whose contents change the generated deck; deck_watch.py
+# restarts on a change to any of the Python modules and rebuilds on the rest
+BUILD_INPUTS = ('deck_theme.py', 'deck_io.py', 'diagrams.py', 'ascii_diagrams.py', 'text_fit.py', 'slide_ir.py',
+                'template_cache.py', 'streaming_writer.py', 'parallel_build.py', 'ocpp_logs.py', 'v2g_traces.py',
+                'time_to_charge.py', 'chart_parts.py', 'smart_charging.py', 'table_parts.py', 'feature_matrix.py',
+                'diagram_instructions.md')
+
+# Variant defaults; a batch manifest entry may override any of these
+DEFAULT_TITLE = "ISO 15118: The Next Generation of EV Charging Communication"
+DEFAULT_SUBTITLE = "Comparing ISO 15118 with OCPP 1.6: Benefits for Vendors, Grid, and Users"
+DEFAULT_CONTACT = ["📧 Email: [Your Email]", "📱 Phone: [Your Phone]", "🌐 Website: [Your Website]"]
+AUDIENCES = ('vendors', 'grid', 'users')
+
+# Adoption scenario for the vendor chart, not market data: logistic share of new
+# DC stations per year, midpoints placed on the Future Outlook phases
+ADOPTION_YEARS = tuple(range(2024, 2031))
+ADOPTION_MIDPOINTS = (("ISO 15118-2 or -20", 2026.5), ("ISO 15118-20", 2028.0))
+ADOPTION_STEEPNESS = 1.1
+# Height in inches of the charts on the advantages slides
+ADVANTAGE_CHART_HEIGHT = 3.6
+
+# Define colors
+PRIMARY_BLUE = RGBColor(0, 102, 204)
+SECONDARY_GREEN = RGBColor(0, 204, 102)
+ACCENT_ORANGE = RGBColor(255, 102, 0)
+BACKGROUND_GRAY = RGBColor(245, 245, 245)
+TEXT_DARK = RGBColor(51, 51, 51)
+LIGHT_BLUE = RGBColor(173, 216, 230)
+LIGHT_GREEN = RGBColor(144, 238, 144)
+
+def palette():
+    """Name -> hex string of every theme color defined in this module"""
+    return {name: str(value) for name, value in globals().items() if isinstance(value, RGBColor)}
+
+def deck_cache_key(reproducible=False, selection=None, parallel=False, variant=None):
+    """Cache key covering slide content, theme colors, template and library version"""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        source = f.read()
+    inputs = {name: file_digest(os.path.join(PACKAGE_DIR, name)) for name in BUILD_INPUTS}
+    # Logs and trace indexes can be gigabytes; size and modification time stand in for a digest
+    settings = deck_settings(variant)
+    for path in settings.ocpp_logs + ((settings.v2g_index,) if settings.v2g_index else ()):
+        st = os.stat(path)
+        inputs[f"data:{os.path.abspath(path)}"] = f"{st.st_size}:{st.st_mtime_ns}"
+    version, template_digest = pptx_environment()
+    mode = (f"reproducible={reproducible};epoch={os.environ.get('SOURCE_DATE_EPOCH', '')};slides={selection or ''};"
+            f"parallel={parallel};variant={json.dumps(variant, sort_keys=True)}")
+    return cache_key(source, inputs, palette(), template_digest, version, mode)
+
+def _strings(variant, key, default=()):
+    """A variant field that takes a string or a list of strings, as a list"""
+    value = variant.get(key, default)
+    if not value:
+        value = ()
+    elif isinstance(value, str):
+        value = [value]
+    if not isinstance(value, (list, tuple)) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{key} must be a string or a list of strings, got {value!r}")
+    return list(value)
+
+def deck_settings(variant=None):
+    """Resolve a variant spec (dict) into the settings the slide builders read"""
+    variant = variant or {}
+    for key in ('name', 'title', 'subtitle', 'v2g_index'):
+        if not isinstance(variant.get(key, ''), str):
+            raise ValueError(f"{key} must be a string, got {variant[key]!r}")
+    colors = palette()
+    overrides = variant.get('colors') or {}
+    if not isinstance(overrides, dict):
+        raise ValueError(f"colors must be an object of name: hex value, got {overrides!r}")
+    for name, value in overrides.items():
+        if name not in colors:
+            raise ValueError(f"Unknown theme color {name!r}; expected one of {', '.join(sorted(colors))}")
+        if not isinstance(value, str):
+            raise ValueError(f"Theme color {name} must be a hex string, got {value!r}")
+        colors[name] = value.lstrip('#')
+    audience = _strings(variant, 'audience') or AUDIENCES
+    unknown = set(audience) - set(AUDIENCES)
+    if unknown:
+        raise ValueError(f"Unknown audience {', '.join(sorted(unknown))}; expected {', '.join(AUDIENCES)}")
+    ocpp_logs = _strings(variant, 'ocpp_logs')
+    v2g_sessions = _strings(variant, 'v2g_sessions')
+    contact = _strings(variant, 'contact', DEFAULT_CONTACT)
+    site = variant.get('site') or {}
+    if site:
+        from time_to_charge import site_parameters
+        site = site_parameters(site)  # fail fast on unknown or out-of-range parameters
+    return SimpleNamespace(
+        name=variant.get('name', 'default'),
+        title=variant.get('title', DEFAULT_TITLE),
+        subtitle=variant.get('subtitle', DEFAULT_SUBTITLE),
+        contact=tuple(contact),
+        audience=tuple(audience),
+        ocpp_logs=tuple(ocpp_logs),
+        v2g_index=variant.get('v2g_index'),
+        v2g_sessions=tuple(v2g_sessions),
+        site=tuple(sorted(site.items())),
+        colors=SimpleNamespace(**{name: RGBColor.from_string(value) for name, value in colors.items()}),
+    )
+
+def mermaid_source(name):
+    """Source of the Mermaid block under the given heading of diagram_instructions.md"""
+    with open(DIAGRAM_SOURCE, encoding='utf-8') as f:
+        return mermaid_blocks(f.read())[name]
+
+def bullets(items, marker='•', level=BULLET):
+    """Bullet records for a list of strings"""
+    return tuple(Bullet(item, marker, level) for item in items)
+
+def title_slide(settings):
+    """Slide 1: Title Slide"""
+    return Slide(settings.title, layout=TITLE_LAYOUT, subtitle=settings.subtitle,
+                 title_size=32, subtitle_size=18)
+
+def agenda_slide(settings):
+    """Slide 2: Agenda"""
     agenda_items = [
         "Introduction to EV Charging Protocols",
         "OCPP 1.6 Overview & Architecture",
@@ -66,30 +164,12 @@ def create_iso_15118_presentation():
         "References & Resources"
     ]
     
-    for i, item in enumerate(agenda_items):
-        p = content_text.paragraphs[i] if i < len(content_text.paragraphs) else content_text.add_paragraph()
-        p.text = f"• {item}"
-        p.font.size = Pt(18)
-        p.font.color.rgb = TEXT_DARK
-    
-    # Slide 3: Introduction
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "Introduction to EV Charging Protocols"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
-    # Why Communication Protocols Matter
-    p1 = content_text.paragraphs[0]
-    p1.text = "Why Communication Protocols Matter:"
-    p1.font.bold = True
-    p1.font.size = Pt(18)
-    p1.font.color.rgb = PRIMARY_BLUE
-    
+    # Agenda items sit at the heading level, unbolded
+    items = tuple(Text(f"• {item}", color='TEXT_DARK', bold=False) for item in agenda_items)
+    return Slide("Agenda", (Section(items=items),))
+
+def introduction_slide(settings):
+    """Slide 3: Introduction"""
     reasons = [
         "Interoperability: Seamless charging across different networks",
         "Security: Secure data exchange between EV and charging station", 
@@ -98,20 +178,6 @@ def create_iso_15118_presentation():
         "Billing: Automated payment processing"
     ]
     
-    for i, reason in enumerate(reasons):
-        p = content_text.add_paragraph()
-        p.text = f"• {reason}"
-        p.font.size = Pt(16)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    # Evolution Timeline
-    p_timeline = content_text.add_paragraph()
-    p_timeline.text = "Evolution Timeline:"
-    p_timeline.font.bold = True
-    p_timeline.font.size = Pt(18)
-    p_timeline.font.color.rgb = PRIMARY_BLUE
-    
     timeline_items = [
         "2012: OCPP 1.5 released",
         "2015: OCPP 1.6 released", 
@@ -119,31 +185,13 @@ def create_iso_15118_presentation():
         "2022: ISO 15118-20 (V2G) published"
     ]
     
-    for item in timeline_items:
-        p = content_text.add_paragraph()
-        p.text = f"• {item}"
-        p.font.size = Pt(16)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    # Slide 4: OCPP 1.6 Overview
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "OCPP 1.6 Overview"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
-    # What is OCPP 1.6
-    p1 = content_text.paragraphs[0]
-    p1.text = "What is OCPP 1.6?"
-    p1.font.bold = True
-    p1.font.size = Pt(18)
-    p1.font.color.rgb = PRIMARY_BLUE
-    
+    return Slide("Introduction to EV Charging Protocols", (
+        Section("Why Communication Protocols Matter:", items=bullets(reasons)),
+        Section("Evolution Timeline:", items=bullets(timeline_items)),
+    ))
+
+def ocpp_overview_slide(settings):
+    """Slide 4: OCPP 1.6 Overview"""
     ocpp_features = [
         "Open Charge Point Protocol 1.6",
         "WebSocket-based communication",
@@ -151,20 +199,6 @@ def create_iso_15118_presentation():
         "Central System to Charge Point communication"
     ]
     
-    for feature in ocpp_features:
-        p = content_text.add_paragraph()
-        p.text = f"• {feature}"
-        p.font.size = Pt(16)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    # Key Features
-    p_features = content_text.add_paragraph()
-    p_features.text = "Key Features:"
-    p_features.font.bold = True
-    p_features.font.size = Pt(18)
-    p_features.font.color.rgb = SECONDARY_GREEN
-    
     features = [
         "Real-time communication",
         "Transaction management",
@@ -174,20 +208,6 @@ def create_iso_15118_presentation():
         "Extensible message structure"
     ]
     
-    for feature in features:
-        p = content_text.add_paragraph()
-        p.text = f"✅ {feature}"
-        p.font.size = Pt(16)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    # Limitations
-    p_limitations = content_text.add_paragraph()
-    p_limitations.text = "Limitations:"
-    p_limitations.font.bold = True
-    p_limitations.font.size = Pt(18)
-    p_limitations.font.color.rgb = ACCENT_ORANGE
-    
     limitations = [
         "No direct EV-to-charging station communication",
         "Manual authentication required",
@@ -195,31 +215,15 @@ def create_iso_15118_presentation():
         "No vehicle-to-grid (V2G) support"
     ]
     
-    for limitation in limitations:
-        p = content_text.add_paragraph()
-        p.text = f"❌ {limitation}"
-        p.font.size = Pt(16)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    # Slide 5: OCPP 1.6 System Architecture
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "OCPP 1.6 System Architecture"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
-    p1 = content_text.paragraphs[0]
-    p1.text = "OCPP 1.6 Communication Flow:"
-    p1.font.bold = True
-    p1.font.size = Pt(18)
-    p1.font.color.rgb = PRIMARY_BLUE
-    
-    # Create architecture diagram using text
+    return Slide("OCPP 1.6 Overview", (
+        Section("What is OCPP 1.6?", items=bullets(ocpp_features)),
+        Section("Key Features:", 'SECONDARY_GREEN', bullets(features, '✅')),
+        Section("Limitations:", 'ACCENT_ORANGE', bullets(limitations, '❌')),
+    ))
+
+def ocpp_architecture_slide(settings):
+    """Slide 5: OCPP 1.6 System Architecture"""
+    # Architecture diagram, drawn as native shapes
     architecture_text = """
     ┌─────────────────┐    WebSocket    ┌──────────────────┐    HTTP/REST    ┌─────────────────┐
     │   Electric      │ ◄──────────────► │   Charging       │ ◄──────────────► │   Central       │
@@ -232,19 +236,6 @@ def create_iso_15118_presentation():
     └─────────────────┘                 └──────────────────┘                 └─────────────────┘
     """
     
-    p_arch = content_text.add_paragraph()
-    p_arch.text = architecture_text
-    p_arch.font.size = Pt(12)
-    p_arch.font.color.rgb = TEXT_DARK
-    p_arch.font.name = 'Courier New'
-    
-    # Key Components
-    p_components = content_text.add_paragraph()
-    p_components.text = "Key Components:"
-    p_components.font.bold = True
-    p_components.font.size = Pt(18)
-    p_components.font.color.rgb = SECONDARY_GREEN
-    
     components = [
         "Charging Station: OCPP client with WebSocket connection",
         "Central System: Backend server managing multiple stations",
@@ -252,71 +243,28 @@ def create_iso_15118_presentation():
         "Authentication: Manual via RFID, mobile app, or manual input"
     ]
     
-    for component in components:
-        p = content_text.add_paragraph()
-        p.text = f"• {component}"
-        p.font.size = Pt(14)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    # Slide 6: OCPP 1.6 Workflow
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "OCPP 1.6 Charging Workflow"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
-    p1 = content_text.paragraphs[0]
-    p1.text = "OCPP 1.6 Charging Process:"
-    p1.font.bold = True
-    p1.font.size = Pt(18)
-    p1.font.color.rgb = PRIMARY_BLUE
-    
-    # Create workflow diagram using text
-    workflow_text = """
-    1. User arrives at charging station
-    2. Manual authentication required:
-       ├─ RFID card swipe
-       ├─ Mobile app scan
-       └─ Manual input (PIN/card)
-    3. Station sends authentication to Central System
-    4. Central System validates and authorizes
-    5. Station starts charging session
-    6. Real-time status updates via WebSocket
-    7. Charging session monitoring
-    8. Session termination
-    9. Billing and payment processing
-    10. Receipt generation
-    """
-    
-    p_workflow = content_text.add_paragraph()
-    p_workflow.text = workflow_text
-    p_workflow.font.size = Pt(14)
-    p_workflow.font.color.rgb = TEXT_DARK
-    p_workflow.font.name = 'Courier New'
-    
-    # Slide 7: ISO 15118 Overview
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "ISO 15118 Overview"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
-    # What is ISO 15118
-    p1 = content_text.paragraphs[0]
-    p1.text = "What is ISO 15118?"
-    p1.font.bold = True
-    p1.font.size = Pt(18)
-    p1.font.color.rgb = PRIMARY_BLUE
-    
+    return Slide("OCPP 1.6 System Architecture", (
+        Section("OCPP 1.6 Communication Flow:", items=(Diagram(BOX, architecture_text),)),
+        Section("Key Components:", 'SECONDARY_GREEN', bullets(components, level=SMALL_BULLET)),
+    ))
+
+def ocpp_workflow_slide(settings):
+    """Slide 6: OCPP 1.6 Workflow"""
+    # Native flowchart from the Mermaid source
+    return Slide("OCPP 1.6 Charging Workflow", (
+        Section("OCPP 1.6 Charging Process:", items=(Diagram(MERMAID, mermaid_source("OCPP 1.6 Workflow")),)),
+    ))
+
+def ocpp_log_slides(settings):
+    """Slides 6a-6d: summary of the OCPP-J logs given with --ocpp-log, if any"""
+    if not settings.ocpp_logs:
+        return ()
+    # NumPy is only needed for log-driven decks
+    from ocpp_logs import cached_summary, log_summary_slides
+    return log_summary_slides(cached_summary(settings.ocpp_logs))
+
+def iso_overview_slide(settings):
+    """Slide 7: ISO 15118 Overview"""
     iso_features = [
         "International standard for EV charging communication",
         "Direct communication between EV and charging station",
@@ -324,20 +272,6 @@ def create_iso_15118_presentation():
         "Plug-and-Charge (PnC) capability"
     ]
     
-    for feature in iso_features:
-        p = content_text.add_paragraph()
-        p.text = f"• {feature}"
-        p.font.size = Pt(16)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    # Key Components
-    p_components = content_text.add_paragraph()
-    p_components.text = "Key Components:"
-    p_components.font.bold = True
-    p_components.font.size = Pt(18)
-    p_components.font.color.rgb = SECONDARY_GREEN
-    
     components = [
         "ISO 15118-1: General information and use-case definition",
         "ISO 15118-2: Network and application protocol requirements",
@@ -348,31 +282,14 @@ def create_iso_15118_presentation():
         "ISO 15118-20: 2nd generation network and application protocol requirements"
     ]
     
-    for component in components:
-        p = content_text.add_paragraph()
-        p.text = f"• {component}"
-        p.font.size = Pt(14)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    # Slide 8: ISO 15118 System Architecture
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "ISO 15118 System Architecture"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
-    p1 = content_text.paragraphs[0]
-    p1.text = "ISO 15118 Communication Flow:"
-    p1.font.bold = True
-    p1.font.size = Pt(18)
-    p1.font.color.rgb = PRIMARY_BLUE
-    
-    # Create architecture diagram using text
+    return Slide("ISO 15118 Overview", (
+        Section("What is ISO 15118?", items=bullets(iso_features)),
+        Section("Key Components:", 'SECONDARY_GREEN', bullets(components, level=SMALL_BULLET)),
+    ))
+
+def iso_architecture_slide(settings):
+    """Slide 8: ISO 15118 System Architecture"""
+    # Architecture diagram, drawn as native shapes
     architecture_text = """
     ┌─────────────────┐    ISO 15118    ┌──────────────────┐    OCPP/HTTP    ┌─────────────────┐
     │   Electric      │ ◄──────────────► │   Charging       │ ◄──────────────► │   Central       │
@@ -385,19 +302,6 @@ def create_iso_15118_presentation():
     └─────────────────┘                 └──────────────────┘                 └─────────────────┘
     """
     
-    p_arch = content_text.add_paragraph()
-    p_arch.text = architecture_text
-    p_arch.font.size = Pt(12)
-    p_arch.font.color.rgb = TEXT_DARK
-    p_arch.font.name = 'Courier New'
-    
-    # Key Components
-    p_components = content_text.add_paragraph()
-    p_components.text = "Key Components:"
-    p_components.font.bold = True
-    p_components.font.size = Pt(18)
-    p_components.font.color.rgb = SECONDARY_GREEN
-    
     components = [
         "Electric Vehicle: ISO 15118 client with digital certificate",
         "Charging Station: ISO 15118 server + OCPP client",
@@ -405,74 +309,29 @@ def create_iso_15118_presentation():
         "Authentication: Automatic via PKI digital certificates"
     ]
     
-    for component in components:
-        p = content_text.add_paragraph()
-        p.text = f"• {component}"
-        p.font.size = Pt(14)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    # Slide 9: ISO 15118 Workflow
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "ISO 15118 Plug-and-Charge Workflow"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
-    p1 = content_text.paragraphs[0]
-    p1.text = "ISO 15118 Plug-and-Charge Process:"
-    p1.font.bold = True
-    p1.font.size = Pt(18)
-    p1.font.color.rgb = PRIMARY_BLUE
-    
-    # Create workflow diagram using text
-    workflow_text = """
-    1. User plugs in EV to charging station
-    2. Automatic ISO 15118 handshake:
-       ├─ Vehicle identification
-       ├─ Digital certificate exchange
-       └─ Authentication validation
-    3. Station requests charging parameters from vehicle
-    4. Vehicle provides:
-       ├─ Battery capacity and state
-       ├─ Charging preferences
-       └─ Payment information
-    5. Station starts charging session
-    6. Real-time communication during charging
-    7. V2G capabilities (if supported)
-    8. Session termination
-    9. Automatic billing and payment
-    10. Receipt sent to vehicle/user
-    """
-    
-    p_workflow = content_text.add_paragraph()
-    p_workflow.text = workflow_text
-    p_workflow.font.size = Pt(14)
-    p_workflow.font.color.rgb = TEXT_DARK
-    p_workflow.font.name = 'Courier New'
-    
-    # Slide 10: System Architecture Comparison
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "System Architecture Comparison"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
-    p1 = content_text.paragraphs[0]
-    p1.text = "OCPP 1.6 vs ISO 15118 Architecture:"
-    p1.font.bold = True
-    p1.font.size = Pt(18)
-    p1.font.color.rgb = PRIMARY_BLUE
-    
-    # Create comparison diagram using text
+    return Slide("ISO 15118 System Architecture", (
+        Section("ISO 15118 Communication Flow:", items=(Diagram(BOX, architecture_text),)),
+        Section("Key Components:", 'SECONDARY_GREEN', bullets(components, level=SMALL_BULLET)),
+    ))
+
+def iso_workflow_slide(settings):
+    """Slide 9: ISO 15118 Workflow"""
+    # Native flowchart from the Mermaid source
+    return Slide("ISO 15118 Plug-and-Charge Workflow", (
+        Section("ISO 15118 Plug-and-Charge Process:",
+                items=(Diagram(MERMAID, mermaid_source("ISO 15118 Workflow")),)),
+    ))
+
+def iso_trace_slides(settings):
+    """Slides 9a-9f: recorded sessions from the --v2g-index trace index, if any"""
+    if not settings.v2g_index:
+        return ()
+    from v2g_traces import index_slides
+    return index_slides(settings.v2g_index, settings.v2g_sessions)
+
+def architecture_comparison_slide(settings):
+    """Slide 10: System Architecture Comparison"""
+    # Comparison diagram, drawn as native shapes
     comparison_text = """
     OCPP 1.6 Architecture:
     ┌─────────┐    WebSocket    ┌─────────┐    HTTP/REST    ┌─────────┐
@@ -487,19 +346,6 @@ def create_iso_15118_presentation():
     └─────────┘                 └─────────┘                 └─────────┘
     """
     
-    p_comp = content_text.add_paragraph()
-    p_comp.text = comparison_text
-    p_comp.font.size = Pt(12)
-    p_comp.font.color.rgb = TEXT_DARK
-    p_comp.font.name = 'Courier New'
-    
-    # Key Differences
-    p_diffs = content_text.add_paragraph()
-    p_diffs.text = "Key Architectural Differences:"
-    p_diffs.font.bold = True
-    p_diffs.font.size = Pt(18)
-    p_diffs.font.color.rgb = SECONDARY_GREEN
-    
     differences = [
         "OCPP 1.6: No direct EV communication",
         "ISO 15118: Direct EV-to-station communication",
@@ -509,30 +355,13 @@ def create_iso_15118_presentation():
         "ISO 15118: Rich vehicle information exchange"
     ]
     
-    for diff in differences:
-        p = content_text.add_paragraph()
-        p.text = f"• {diff}"
-        p.font.size = Pt(14)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    # Slide 11: Workflow Comparison
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "Workflow Comparison"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
-    p1 = content_text.paragraphs[0]
-    p1.text = "OCPP 1.6 vs ISO 15118 Workflow:"
-    p1.font.bold = True
-    p1.font.size = Pt(18)
-    p1.font.color.rgb = PRIMARY_BLUE
-    
+    return Slide("System Architecture Comparison", (
+        Section("OCPP 1.6 vs ISO 15118 Architecture:", items=(Diagram(BOX, comparison_text),)),
+        Section("Key Architectural Differences:", 'SECONDARY_GREEN', bullets(differences, level=SMALL_BULLET)),
+    ))
+
+def workflow_comparison_slide(settings):
+    """Slides 11-11a: Workflow Comparison and simulated time to charge for the variant's site"""
     # Create workflow comparison using text
     workflow_comp_text = """
     OCPP 1.6 Workflow:
@@ -544,19 +373,6 @@ def create_iso_15118_presentation():
     5. Monitor → 6. Stop → 7. Auto billing → 8. Auto receipt
     """
     
-    p_workflow_comp = content_text.add_paragraph()
-    p_workflow_comp.text = workflow_comp_text
-    p_workflow_comp.font.size = Pt(14)
-    p_workflow_comp.font.color.rgb = TEXT_DARK
-    p_workflow_comp.font.name = 'Courier New'
-    
-    # Key Differences
-    p_diffs = content_text.add_paragraph()
-    p_diffs.text = "Workflow Differences:"
-    p_diffs.font.bold = True
-    p_diffs.font.size = Pt(18)
-    p_diffs.font.color.rgb = SECONDARY_GREEN
-    
     workflow_diffs = [
         "Authentication: Manual vs Automatic",
         "User Experience: Multiple steps vs Plug-and-Charge",
@@ -565,84 +381,38 @@ def create_iso_15118_presentation():
         "V2G Support: Not available vs Full support"
     ]
     
-    for diff in workflow_diffs:
-        p = content_text.add_paragraph()
-        p.text = f"• {diff}"
-        p.font.size = Pt(14)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    # Slide 12: Key Differences: Communication Architecture
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "Key Differences: Communication Architecture"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
-    p1 = content_text.paragraphs[0]
-    p1.text = "OCPP 1.6 Architecture:"
-    p1.font.bold = True
-    p1.font.size = Pt(18)
-    p1.font.color.rgb = PRIMARY_BLUE
-    
-    p2 = content_text.add_paragraph()
-    p2.text = "[EV] ←→ [Charging Station] ←→ [Central System] ←→ [Backend Services]"
-    p2.font.size = Pt(16)
-    p2.font.color.rgb = TEXT_DARK
-    
-    p3 = content_text.add_paragraph()
-    p3.text = "ISO 15118 Architecture:"
-    p3.font.bold = True
-    p3.font.size = Pt(18)
-    p3.font.color.rgb = SECONDARY_GREEN
-    
-    p4 = content_text.add_paragraph()
-    p4.text = "[EV] ←→ [Charging Station] ←→ [Central System] ←→ [Backend Services]"
-    p4.font.size = Pt(16)
-    p4.font.color.rgb = TEXT_DARK
-    
-    p5 = content_text.add_paragraph()
-    p5.text = "     (Direct Communication)"
-    p5.font.size = Pt(14)
-    p5.font.color.rgb = ACCENT_ORANGE
-    p5.font.italic = True
-    
-    # Key Differences Table
-    p_table = content_text.add_paragraph()
-    p_table.text = "Key Differences:"
-    p_table.font.bold = True
-    p_table.font.size = Pt(18)
-    p_table.font.color.rgb = SECONDARY_GREEN
-    
-    differences = [
-        "Communication Path: Central System ↔ Charging Station vs EV ↔ Charging Station",
-        "Authentication: Manual (RFID, App) vs Automatic (Digital Certificate)",
-        "Data Exchange: Limited vehicle data vs Rich vehicle information",
-        "Security: TLS encryption vs PKI-based security"
-    ]
-    
-    for diff in differences:
-        p = content_text.add_paragraph()
-        p.text = f"• {diff}"
-        p.font.size = Pt(14)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    # Slide 13: Advantages for Vendors
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "Advantages for Vendors"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
+    from time_to_charge import cached_simulation, time_to_charge_slide
+    return (
+        Slide("Workflow Comparison", (
+            Section("OCPP 1.6 vs ISO 15118 Workflow:", items=(Listing(workflow_comp_text),)),
+            Section("Workflow Differences:", 'SECONDARY_GREEN', bullets(workflow_diffs, level=SMALL_BULLET)),
+        )),
+        time_to_charge_slide(cached_simulation(dict(settings.site))),
+    )
+
+def key_differences_slide(settings):
+    """Slide 12: Key Differences: Communication Architecture"""
+    path = "[EV] ←→ [Charging Station] ←→ [Central System] ←→ [Backend Services]"
+    
+    return Slide("Key Differences: Communication Architecture", (
+        Section("OCPP 1.6 Architecture:", items=(
+            Text(path, size=16, color='TEXT_DARK', bold=False),
+        )),
+        Section("ISO 15118 Architecture:", 'SECONDARY_GREEN', (
+            Text(path, size=16, color='TEXT_DARK', bold=False),
+            Text("     (Direct Communication)", size=14, color='ACCENT_ORANGE', bold=False, italic=True),
+        )),
+        Section("Key Differences:", 'SECONDARY_GREEN', (
+            comparison_table(feature_rows(KEY_DIFFERENCES, KEY_PROTOCOLS), KEY_PROTOCOLS, size=14),
+        )),
+    ))
+
+def adoption_scenario(midpoint, years=ADOPTION_YEARS, steepness=ADOPTION_STEEPNESS):
+    """Logistic share per year reaching one half at midpoint, to whole percent"""
+    return tuple(round(1 / (1 + math.exp(-steepness * (year - midpoint))), 2) for year in years)
+
+def vendor_advantages_slide(settings):
+    """Slides 13-13a: Advantages for Vendors and the adoption scenario"""
     vendor_types = [
         ("Hardware Vendors", [
             "Higher-value charging stations",
@@ -664,31 +434,24 @@ def create_iso_15118_presentation():
         ])
     ]
     
-    for vendor_type, benefits in vendor_types:
-        p = content_text.add_paragraph()
-        p.text = f"{vendor_type}:"
-        p.font.bold = True
-        p.font.size = Pt(18)
-        p.font.color.rgb = PRIMARY_BLUE
-        
-        for benefit in benefits:
-            p_benefit = content_text.add_paragraph()
-            p_benefit.text = f"✅ {benefit}"
-            p_benefit.font.size = Pt(16)
-            p_benefit.font.color.rgb = TEXT_DARK
-            p_benefit.level = 1
-    
-    # Slide 14: Advantages for Grid Operators
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "Advantages for Grid Operators"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
+    adoption = Chart(ADOPTION_YEARS, tuple(
+        (name, color, adoption_scenario(midpoint))
+        for (name, midpoint), color in zip(ADOPTION_MIDPOINTS, ('PRIMARY_BLUE', 'SECONDARY_GREEN'))
+    ), y_title="Share of new DC stations", kind=COLUMN, height=ADVANTAGE_CHART_HEIGHT)
+    return (
+        Slide("Advantages for Vendors", tuple(
+            Section(f"{vendor_type}:", items=bullets(benefits, '✅'))
+            for vendor_type, benefits in vendor_types
+        )),
+        Slide("Advantages for Vendors: Adoption Timeline", (
+            Section("ISO 15118 Share of New DC Charging Stations:", items=(adoption,)),
+            Section(items=(Text("Scenario, not market data: early adoption 2024-2025, mass market 2026-2028, "
+                                "full penetration 2029-2030", size=12, color='TEXT_DARK', bold=False, italic=True),)),
+        ), name='vendor_adoption'),
+    )
+
+def grid_advantages_slide(settings):
+    """Slides 14-14a: Advantages for Grid Operators and the fleet peak load"""
     grid_benefits = [
         ("Smart Grid Integration", [
             "Demand response capabilities",
@@ -710,31 +473,27 @@ def create_iso_15118_presentation():
         ])
     ]
     
-    for benefit_type, benefits in grid_benefits:
-        p = content_text.add_paragraph()
-        p.text = f"{benefit_type}:"
-        p.font.bold = True
-        p.font.size = Pt(18)
-        p.font.color.rgb = SECONDARY_GREEN
-        
-        for benefit in benefits:
-            p_benefit = content_text.add_paragraph()
-            p_benefit.text = f"✅ {benefit}"
-            p_benefit.font.size = Pt(16)
-            p_benefit.font.color.rgb = TEXT_DARK
-            p_benefit.level = 1
-    
-    # Slide 15: Advantages for Users
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "Advantages for Users"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
+    from smart_charging import CHARGER_KW, load_profile
+    profile = load_profile()
+    load = Chart(tuple(profile.labels), (
+        ("Charging on arrival", 'ACCENT_ORANGE', tuple(profile.unmanaged_kw.round(1).tolist())),
+        ("ISO 15118 charge schedules", 'SECONDARY_GREEN', tuple(profile.scheduled_kw.round(1).tolist())),
+    ), y_title="kW", y_format='0', kind=LINE, height=ADVANTAGE_CHART_HEIGHT)
+    return (
+        Slide("Advantages for Grid Operators", tuple(
+            Section(f"{benefit_type}:", 'SECONDARY_GREEN', bullets(benefits, '✅'))
+            for benefit_type, benefits in grid_benefits
+        )),
+        Slide("Advantages for Grid Operators: Peak Load", (
+            Section(f"{profile.vehicles} EVs Charging Overnight at {CHARGER_KW:g} kW:", items=(load,)),
+            Section(items=(Text(f"Same energy, peak {profile.unmanaged_kw.max():.0f} kW → "
+                                f"{profile.scheduled_kw.max():.0f} kW ({profile.peak_reduction:.0%} lower)",
+                                size=14, color='SECONDARY_GREEN', bold=True),)),
+        ), name='grid_peak_load'),
+    )
+
+def user_advantages_slide(settings):
+    """Slides 15-15a: Advantages for Users and their simulated time to charge"""
     user_benefits = [
         ("Enhanced User Experience", [
             "Plug-and-Charge convenience",
@@ -756,31 +515,26 @@ def create_iso_15118_presentation():
         ])
     ]
     
-    for benefit_type, benefits in user_benefits:
-        p = content_text.add_paragraph()
-        p.text = f"{benefit_type}:"
-        p.font.bold = True
-        p.font.size = Pt(18)
-        p.font.color.rgb = SECONDARY_GREEN
-        
-        for benefit in benefits:
-            p_benefit = content_text.add_paragraph()
-            p_benefit.text = f"✅ {benefit}"
-            p_benefit.font.size = Pt(16)
-            p_benefit.font.color.rgb = TEXT_DARK
-            p_benefit.level = 1
-    
-    # Slide 16: Implementation Challenges
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "Implementation Challenges"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
+    from time_to_charge import WORKFLOWS, cached_simulation
+    compared = ((WORKFLOWS[2], 'PRIMARY_BLUE'), (WORKFLOWS[3], 'SECONDARY_GREEN'))
+    names, shares = cached_simulation(dict(settings.site)).histogram([label for label, _ in compared])
+    waits = Chart(tuple(names), tuple((label, color, tuple(shares[label].round(4).tolist())) for label, color in compared),
+                  x_title="Seconds from arrival to charging", y_title="Sessions", kind=COLUMN,
+                  height=ADVANTAGE_CHART_HEIGHT)
+    return (
+        Slide("Advantages for Users", tuple(
+            Section(f"{benefit_type}:", 'SECONDARY_GREEN', bullets(benefits, '✅'))
+            for benefit_type, benefits in user_benefits
+        )),
+        Slide("Advantages for Users: Time to Charge", (
+            Section("Sessions by Time From Arrival to Charging:", 'SECONDARY_GREEN', (waits,)),
+            Section(items=(Text("Simulated for this site, as in Workflow Comparison: Time to Charge",
+                                size=12, color='TEXT_DARK', bold=False, italic=True),)),
+        ), name='user_time_to_charge'),
+    )
+
+def challenges_slide(settings):
+    """Slide 16: Implementation Challenges"""
     challenges = [
         ("Technical Challenges", [
             "Complex PKI infrastructure",
@@ -802,31 +556,13 @@ def create_iso_15118_presentation():
         ])
     ]
     
-    for challenge_type, items in challenges:
-        p = content_text.add_paragraph()
-        p.text = f"{challenge_type}:"
-        p.font.bold = True
-        p.font.size = Pt(18)
-        p.font.color.rgb = ACCENT_ORANGE
-        
-        for item in items:
-            p_item = content_text.add_paragraph()
-            p_item.text = f"🔧 {item}"
-            p_item.font.size = Pt(16)
-            p_item.font.color.rgb = TEXT_DARK
-            p_item.level = 1
-    
-    # Slide 17: Future Outlook
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "Future Outlook"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
+    return Slide("Implementation Challenges", tuple(
+        Section(f"{challenge_type}:", 'ACCENT_ORANGE', bullets(items, '🔧'))
+        for challenge_type, items in challenges
+    ))
+
+def future_outlook_slide(settings):
+    """Slide 17: Future Outlook"""
     outlook_items = [
         ("Market Trends", [
             "Growing EV adoption",
@@ -847,37 +583,13 @@ def create_iso_15118_presentation():
         ])
     ]
     
-    for item_type, items in outlook_items:
-        p = content_text.add_paragraph()
-        p.text = f"{item_type}:"
-        p.font.bold = True
-        p.font.size = Pt(18)
-        p.font.color.rgb = SECONDARY_GREEN
-        
-        for item in items:
-            p_item = content_text.add_paragraph()
-            p_item.text = f"📈 {item}"
-            p_item.font.size = Pt(16)
-            p_item.font.color.rgb = TEXT_DARK
-            p_item.level = 1
-    
-    # Slide 18: Conclusion
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "Conclusion"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
-    p1 = content_text.paragraphs[0]
-    p1.text = "Key Takeaways:"
-    p1.font.bold = True
-    p1.font.size = Pt(18)
-    p1.font.color.rgb = PRIMARY_BLUE
-    
+    return Slide("Future Outlook", tuple(
+        Section(f"{item_type}:", 'SECONDARY_GREEN', bullets(items, '📈'))
+        for item_type, items in outlook_items
+    ))
+
+def conclusion_slide(settings):
+    """Slide 18: Conclusion"""
     takeaways = [
         "ISO 15118 is the future of EV charging",
         "Significant advantages over OCPP 1.6",
@@ -885,19 +597,6 @@ def create_iso_15118_presentation():
         "Investment in future technology"
     ]
     
-    for takeaway in takeaways:
-        p = content_text.add_paragraph()
-        p.text = f"🎯 {takeaway}"
-        p.font.size = Pt(16)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    p_next = content_text.add_paragraph()
-    p_next.text = "Next Steps:"
-    p_next.font.bold = True
-    p_next.font.size = Pt(18)
-    p_next.font.color.rgb = SECONDARY_GREEN
-    
     next_steps = [
         "Assess current infrastructure",
         "Plan migration strategy",
@@ -905,30 +604,13 @@ def create_iso_15118_presentation():
         "Monitor market developments"
     ]
     
-    for step in next_steps:
-        p = content_text.add_paragraph()
-        p.text = f"➡️ {step}"
-        p.font.size = Pt(16)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    # Slide 19: References
-    slide_layout = prs.slide_layouts[1]
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    title.text = "References & Resources"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    content = slide.placeholders[1]
-    content_text = content.text_frame
-    
-    p1 = content_text.paragraphs[0]
-    p1.text = "Official Standards:"
-    p1.font.bold = True
-    p1.font.size = Pt(18)
-    p1.font.color.rgb = PRIMARY_BLUE
-    
+    return Slide("Conclusion", (
+        Section("Key Takeaways:", items=bullets(takeaways, '🎯')),
+        Section("Next Steps:", 'SECONDARY_GREEN', bullets(next_steps, '➡️')),
+    ))
+
+def references_slide(settings):
+    """Slide 19: References"""
     standards = [
         "ISO 15118-1:2019: General information and use-case definition",
         "ISO 15118-2:2016: Network and application protocol requirements",
@@ -936,19 +618,6 @@ def create_iso_15118_presentation():
         "ISO 15118-20:2022: 2nd generation network and application protocol requirements"
     ]
     
-    for standard in standards:
-        p = content_text.add_paragraph()
-        p.text = f"• {standard}"
-        p.font.size = Pt(14)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    p_orgs = content_text.add_paragraph()
-    p_orgs.text = "Industry Organizations:"
-    p_orgs.font.bold = True
-    p_orgs.font.size = Pt(18)
-    p_orgs.font.color.rgb = SECONDARY_GREEN
-    
     orgs = [
         "CharIN e.V.: Charging Interface Initiative",
         "OCA: Open Charge Alliance",
@@ -956,33 +625,331 @@ def create_iso_15118_presentation():
         "SAE International: Society of Automotive Engineers"
     ]
     
-    for org in orgs:
-        p = content_text.add_paragraph()
-        p.text = f"• {org}"
-        p.font.size = Pt(14)
-        p.font.color.rgb = TEXT_DARK
-        p.level = 1
-    
-    # Slide 20: Thank You
-    slide_layout = prs.slide_layouts[0]  # Title slide
-    slide = prs.slides.add_slide(slide_layout)
-    
-    title = slide.shapes.title
-    subtitle = slide.placeholders[1]
-    
-    title.text = "Thank You!"
-    title.text_frame.paragraphs[0].font.color.rgb = PRIMARY_BLUE
-    
-    subtitle.text = "Questions & Discussion\n\nContact Information:\n📧 Email: [Your Email]\n📱 Phone: [Your Phone]\n🌐 Website: [Your Website]"
-    subtitle.text_frame.paragraphs[0].font.color.rgb = TEXT_DARK
+    return Slide("References & Resources", (
+        Section("Official Standards:", items=bullets(standards, level=SMALL_BULLET)),
+        Section("Industry Organizations:", 'SECONDARY_GREEN', bullets(orgs, level=SMALL_BULLET)),
+    ))
+
+def thank_you_slide(settings):
+    """Slide 20: Thank You"""
+    subtitle = "Questions & Discussion\n\nContact Information:\n" + "\n".join(settings.contact)
+    return Slide("Thank You!", layout=TITLE_LAYOUT, subtitle=subtitle)
+
+# Slide builders in deck order, tagged with the audience a slide is specific to
+SLIDES = [
+    (title_slide, None),
+    (agenda_slide, None),
+    (introduction_slide, None),
+    (ocpp_overview_slide, None),
+    (ocpp_architecture_slide, None),
+    (ocpp_workflow_slide, None),
+    (ocpp_log_slides, None),
+    (iso_overview_slide, None),
+    (iso_architecture_slide, None),
+    (iso_workflow_slide, None),
+    (iso_trace_slides, None),
+    (architecture_comparison_slide, None),
+    (workflow_comparison_slide, None),
+    (key_differences_slide, None),
+    (feature_matrix_slides, None),
+    (vendor_advantages_slide, 'vendors'),
+    (grid_advantages_slide, 'grid'),
+    (user_advantages_slide, 'users'),
+    (challenges_slide, None),
+    (future_outlook_slide, None),
+    (conclusion_slide, None),
+    (references_slide, None),
+    (thank_you_slide, None),
+]
+
+def deck_ir(settings):
+    """The deck as slide IR for resolved settings, in order
+
+    A builder returns one Slide or a tuple of them (possibly empty).
+    """
+    slides = []
+    for build_slide, audience in SLIDES:
+        if audience is not None and audience not in settings.audience:
+            continue
+        built = build_slide(settings)
+        for ir in built if isinstance(built, tuple) else (built,):
+            slides.append(replace(ir, name=ir.name or builder_name(build_slide)))
+    return tuple(slides)
+
+def select_slides(slides, spec):
+    """The slides picked by a selection such as "5-7", "1,3" or "Advantages*", in deck order
+
+    Numbers are 1-based positions in the slide IR, before overflowing text is
+    continued on "(cont.)" slides: a picked slide brings its continuations with
+    it, and continuations take no number of their own, so in a deck with splits
+    number N can differ from slide N of the built file. Anything else is a
+    case-insensitive glob matched against slide titles and builder names.
+    Duplicates and overlapping terms pick a slide once.
+    """
+    picked = set()
+    for term in (term.strip() for term in spec.split(',')):
+        if not term:
+            continue
+        bounds = re.fullmatch(r'(\d*)-(\d*)|(\d+)', term)
+        if bounds and term != '-':
+            first, last, single = bounds.groups()
+            first = int(single or first or 1)
+            last = int(single or last or len(slides))
+            if not 1 <= first <= last <= len(slides):
+                raise ValueError(f"slide range {term!r} is outside 1-{len(slides)}")
+            picked.update(range(first - 1, last))
+            continue
+        pattern = term.lower()
+        matches = {i for i, ir in enumerate(slides)
+                   if fnmatch.fnmatchcase(ir.title.lower(), pattern)
+                   or (ir.name and fnmatch.fnmatchcase(ir.name.lower(), pattern))}
+        if not matches:
+            raise ValueError(f"no slide title matches {term!r}")
+        picked |= matches
+    if not picked:
+        raise ValueError(f"slide selection {spec!r} is empty")
+    return tuple(slides[i] for i in sorted(picked))
+
+def build_presentation(variant=None, profiler=NULL_PROFILER, selection=None):
+    """Build the ISO 15118 presentation in memory and return it
+
+    selection (see select_slides) renders only part of the deck as a preview.
+    """
+    settings = deck_settings(variant)
+    
+    # Create presentation from the parsed, themed template
+    with profiler.phase('template'):
+        prs = new_presentation(theme=(settings.colors.PRIMARY_BLUE, settings.colors.TEXT_DARK))
+    
+    with profiler.phase('ir'):
+        slides = deck_ir(settings)
+        if selection:
+            slides = select_slides(slides, selection)
+    
+    with profiler.phase('build'):
+        renderer = PrototypeRenderer(prs, settings.colors)
+        for ir in slides:
+            with profiler.slide(prs, ir.name):
+                renderer.render(ir)
+    
+    # Text that runs past its placeholder continues on "(cont.)" slides
+    with profiler.phase('fit'):
+        split_overflowing(prs)
+    return prs
+
+def create_iso_15118_presentation(output=OUTPUT_FILE, reproducible=False, variant=None,
+                                  profiler=NULL_PROFILER):
+    """Create the ISO 15118 presentation
+
+    output may be a path, a binary file-like object (BytesIO, pipe, socket) or
+    "-" for stdout.
+    """
+    prs = build_presentation(variant, profiler)
     
     # Save the presentation
-    prs.save('ISO_15118_vs_OCPP_1.6_Presentation.pptx')
-    print("✅ Presentation created successfully: ISO_15118_vs_OCPP_1.6_Presentation.pptx")
+    with profiler.phase('save'):
+        save_deck(prs, output, reproducible=reproducible)
+    return prs
+
+def render_variant(variant=None, reproducible=False):
+    """Build one variant and return the serialized .pptx bytes"""
+    return deck_bytes(build_presentation(variant), reproducible=reproducible)
+
+def render_parallel(variant=None, reproducible=False, jobs=None, selection=None):
+    """Like render_variant, but slides are rendered across worker processes and merged"""
+    from parallel_build import build_parallel
+
+    settings = deck_settings(variant)
+    slides = deck_ir(settings)
+    if selection:
+        slides = select_slides(slides, selection)
+    buffer = io.BytesIO()
+    build_parallel(slides, settings.colors, buffer, jobs=jobs, reproducible=reproducible)
+    return buffer.getvalue()
+
+def warm_template_cache():
+    """Parse the default template up front (process pool initializer)"""
+    new_presentation(theme=(PRIMARY_BLUE, TEXT_DARK))
+
+def _build_variant(variant, output, reproducible):
+    start = time.perf_counter()
+    create_iso_15118_presentation(output, reproducible=reproducible, variant=variant)
+    return time.perf_counter() - start
+
+def load_manifest(manifest_path):
+    """Read a batch manifest: {"output_dir": ..., "variants": [{"name": ...}, ...]}"""
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {'variants': manifest}
+    names = [variant.get('name') for variant in manifest.get('variants', [])]
+    if not names or not all(names):
+        raise ValueError(f"{manifest_path}: every variant needs a 'name'")
+    if len(set(names)) != len(names):
+        raise ValueError(f"{manifest_path}: variant names must be unique")
+    for variant in manifest['variants']:
+        deck_settings(variant)  # fail fast on bad colors or audiences
+    # Relative output directories are resolved against the manifest's location
+    manifest['output_dir'] = os.path.join(os.path.dirname(os.path.abspath(manifest_path)),
+                                          manifest.get('output_dir', '.'))
+    return manifest
+
+def build_variants(manifest_path, jobs=None, reproducible=False):
+    """Build every variant in a manifest across a process pool
+
+    Returns a list of (name, output, seconds, error) tuples in manifest order.
+    """
+    manifest = load_manifest(manifest_path)
+    os.makedirs(manifest['output_dir'], exist_ok=True)
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=warm_template_cache) as pool:
+        futures = {}
+        for variant in manifest['variants']:
+            output = os.path.join(manifest['output_dir'], variant.get('output') or f"{variant['name']}.pptx")
+            future = pool.submit(_build_variant, variant, output, reproducible)
+            futures[future] = (variant['name'], output)
+        for future in as_completed(futures):
+            name, output = futures[future]
+            try:
+                results[name] = (name, output, future.result(), None)
+            except Exception as e:
+                results[name] = (name, output, None, e)
+    return [results[variant['name']] for variant in manifest['variants']]
+
+def _print_batch_summary(results, elapsed):
+    failed = [r for r in results if r[3] is not None]
+    width = max(len(name) for name, _, _, _ in results)
+    print(f"{'✅' if not failed else '❌'} Built {len(results) - len(failed)}/{len(results)} variants in {elapsed:.2f}s")
+    for name, output, seconds, error in results:
+        if error is None:
+            print(f"   {name:<{width}}  {seconds:6.2f}s  {output}")
+        else:
+            print(f"   {name:<{width}}  failed: {error}")
+
+def _print_profile_summary(report, path, log, top=5):
+    phases = ', '.join(f"{p['name']} {p['seconds'] * 1000:.1f}ms" for p in report['phases'])
+    print(f"📊 Build profile written to {path}: {phases}", file=log)
+    for record in sorted(report['slides'], key=lambda r: r['seconds'], reverse=True)[:top]:
+        memory = f"  {record['allocated_bytes'] / 1024:8.1f} KiB" if 'allocated_bytes' in record else ''
+        print(f"   {record['index']:>2}. {record['name']:<24} {record['seconds'] * 1000:7.2f}ms"
+              f"{memory}  {record['xml_bytes'] / 1024:6.1f} KiB XML", file=log)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the ISO 15118 vs OCPP 1.6 presentation")
+    parser.add_argument('-o', '--output',
+                        help=f"output .pptx path, or - to stream the deck to stdout (default: {OUTPUT_FILE}, "
+                             f"or {PREVIEW_FILE} with --slides)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="always rebuild, bypassing the deck cache")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help="directory holding cached decks")
+    parser.add_argument('--cache-size-mb', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="evict least recently used decks beyond this size")
+    parser.add_argument('--reproducible', action='store_true',
+                        help="write byte-identical output for identical inputs (honours SOURCE_DATE_EPOCH)")
+    parser.add_argument('--batch', metavar='MANIFEST',
+                        help="build every variant listed in a JSON manifest")
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help="worker processes for --batch and --parallel (default: CPU count)")
+    parser.add_argument('--profile', metavar='REPORT',
+                        help="rebuild with per-phase and per-slide timing/memory, written as JSON")
+    parser.add_argument('--profile-no-memory', action='store_true',
+                        help="with --profile, skip allocation tracing (lower overhead)")
+    parser.add_argument('--watch', action='store_true',
+                        help="stay running and rebuild only the changed slides whenever the sources change")
+    parser.add_argument('--parallel', action='store_true',
+                        help="render slides in worker processes and merge the slide parts into one deck")
+    parser.add_argument('--slides', metavar='SELECTION',
+                        help='build a preview of some slides only: source slide positions ("5-7", "1,3"), '
+                             'counted without "(cont.)" continuation slides, or title globs ("Advantages*")')
+    parser.add_argument('--ocpp-log', metavar='LOG', nargs='+', default=[],
+                        help="add summary slides for OCPP-J message logs (.log, .jsonl, optionally .gz)")
+    parser.add_argument('--v2g-index', metavar='DB',
+                        help="add sequence and timing slides for sessions in a v2g_traces.py session index")
+    parser.add_argument('--v2g-session', metavar='ID', nargs='+', default=[],
+                        help="with --v2g-index, the sessions to show (default: the median session of the "
+                             "most common protocol/authorization groups)")
+    args = parser.parse_args()
+    variant = {}
+    if args.ocpp_log:
+        variant['ocpp_logs'] = args.ocpp_log
+    if args.v2g_index:
+        variant['v2g_index'] = args.v2g_index
+        variant['v2g_sessions'] = args.v2g_session
+    variant = variant or None
+    if args.output is None:
+        args.output = PREVIEW_FILE if args.slides else OUTPUT_FILE
+    if args.slides and args.batch:
+        parser.error("--slides cannot be combined with --batch")
+    if args.parallel and (args.profile or args.watch):
+        parser.error("--parallel cannot be combined with --profile or --watch")
+    if variant and (args.watch or args.batch):
+        parser.error("--ocpp-log and --v2g-index cannot be combined with --watch or --batch")
+    if args.v2g_session and not args.v2g_index:
+        parser.error("--v2g-session needs --v2g-index")
+    if args.slides:
+        # Reject a bad selection before any build work starts
+        selected = select_slides(deck_ir(deck_settings(variant)), args.slides)
+
+    if args.watch:
+        from deck_watch import watch_generator
+        if args.output == STDOUT:
+            parser.error("--watch needs an output file")
+        print("👀 Watching the generator and its inputs; Ctrl-C to stop")
+        try:
+            watch_generator(args.output, reproducible=args.reproducible, selection=args.slides)
+        except KeyboardInterrupt:
+            print("✅ Stopped watching")
+        return
+
+    if args.batch:
+        start = time.perf_counter()
+        results = build_variants(args.batch, jobs=args.jobs, reproducible=args.reproducible)
+        _print_batch_summary(results, time.perf_counter() - start)
+        return
+
+    # Status messages must not corrupt a deck streamed to stdout
+    log = sys.stderr if args.output == STDOUT else sys.stdout
+    name = 'stdout' if args.output == STDOUT else args.output
+
+    cache = None if args.no_cache else BuildCache(args.cache_dir, args.cache_size_mb * 1024 * 1024)
+    key = deck_cache_key(args.reproducible, args.slides, args.parallel, variant) if cache else None
+    profiler = BuildProfiler(memory=not args.profile_no_memory) if args.profile else NULL_PROFILER
+    with open_output(args.output) as stream:
+        # A profiled run always rebuilds; a cache hit would measure nothing
+        if cache and not args.profile and cache.fetch(key, stream):
+            print(f"✅ Presentation unchanged, restored from cache: {name}", file=log)
+        else:
+            if args.parallel:
+                data = render_parallel(variant, reproducible=args.reproducible, jobs=args.jobs,
+                                       selection=args.slides)
+            else:
+                with profiler if args.profile else nullcontext():
+                    prs = build_presentation(variant, profiler, selection=args.slides)
+                    # Serialize once in memory; the same bytes go to the output and the cache
+                    with profiler.phase('save'):
+                        data = deck_bytes(prs, reproducible=args.reproducible)
+            stream.write(data)
+            if args.slides:
+                print(f"✅ Preview of {len(selected)} slide(s) created: {name}", file=log)
+            else:
+                print(f"✅ Presentation created successfully: {name}", file=log)
+            if cache:
+                cache.put_bytes(key, data)
+    if args.reproducible and args.output != STDOUT:
+        print(f"   sha256: {file_digest(args.output)}", file=log)
+    if args.profile:
+        profiler.write(args.profile)
+        _print_profile_summary(profiler.report(), args.profile, log)
 
 if __name__ == "__main__":
     try:
-        create_iso_15118_presentation()
+        main()
+    except ImportError as e:
+        print(f"❌ Error creating presentation: {e}", file=sys.stderr)
+        print("Please install required packages: pip install python-pptx==1.0.2 numpy", file=sys.stderr)
+        sys.exit(1)
     except Exception as e:
-        print(f"❌ Error creating presentation: {e}")
-        print("Please install required packages: pip install python-pptx") 
\ No newline at end of file
+        # stderr: with -o - stdout carries the deck
+        print(f"❌ Error creating presentation: {e}", file=sys.stderr)
+        sys.exit(1)
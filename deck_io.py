@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Deck Save Helpers
+Writes presentations to a path, any binary file-like object or stdout,
+optionally as byte-reproducible packages where identical inputs always yield
+identical .pptx bytes
+"""
+
+import contextlib
+import datetime
+import io
+import os
+import re
+import sys
+import zipfile
+
+from lxml import etree
+
+# Earliest timestamp a zip entry can hold
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+CONTENT_TYPES = '[Content_Types].xml'
+# Output target meaning "write the package to stdout"
+STDOUT = '-'
+PACKAGE_RELS = '_rels/.rels'
+CORE_PROPERTIES = 'docProps/core.xml'
+DCTERMS = 'http://purl.org/dc/terms/'
+
+
+def _build_timestamp():
+    """SOURCE_DATE_EPOCH as a UTC datetime, or None when unset"""
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if not epoch:
+        return None
+    return datetime.datetime.fromtimestamp(int(epoch), tz=datetime.timezone.utc).replace(tzinfo=None)
+
+
+def _zip_date_time():
+    stamp = _build_timestamp()
+    if stamp is None or stamp.year < 1980:
+        return ZIP_EPOCH
+    return stamp.timetuple()[:6]
+
+
+def _natural_key(value):
+    """Sort rId2 before rId10"""
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', value)]
+
+
+def _part_order(name):
+    """[Content_Types].xml and the package rels first, then parts by name"""
+    if name == CONTENT_TYPES:
+        return (0, [])
+    if name == PACKAGE_RELS:
+        return (1, [])
+    return (2, _natural_key(name))
+
+
+def normalize_xml(name, blob):
+    """Re-serialize one XML part with a fixed declaration and child order"""
+    root = etree.fromstring(blob)
+    if name == CONTENT_TYPES:
+        # Defaults (by extension) before overrides (by part name)
+        root[:] = sorted(root, key=lambda e: (etree.QName(e).localname != 'Default',
+                                              e.get('Extension') or e.get('PartName') or ''))
+    elif name.endswith('.rels'):
+        root[:] = sorted(root, key=lambda e: _natural_key(e.get('Id', '')))
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def _pin_core_dates(blob, date_time):
+    """Set created/modified of a core properties part to the build time"""
+    root = etree.fromstring(blob)
+    stamp = datetime.datetime(*date_time).strftime('%Y-%m-%dT%H:%M:%SZ')
+    for tag in ('created', 'modified'):
+        for element in root.iter(f'{{{DCTERMS}}}{tag}'):
+            element.text = stamp
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def canonicalize_package(data, embedded=False):
+    """Rewrite a saved .pptx with fixed timestamps, canonical part order and normalized XML"""
+    date_time = _zip_date_time()
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as src, \
+            zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED) as dst:
+        for name in sorted(src.namelist(), key=_part_order):
+            blob = src.read(name)
+            if name.endswith('.xlsx'):
+                # Chart workbooks are packages too, stamped with the time they were written
+                blob = canonicalize_package(blob, embedded=True)
+            elif embedded and name == CORE_PROPERTIES:
+                blob = _pin_core_dates(blob, date_time)
+            elif name.endswith('.xml') or name.endswith('.rels'):
+                blob = normalize_xml(name, blob)
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.create_system = 0
+            info.external_attr = 0o644 << 16
+            dst.writestr(info, blob, compresslevel=6)
+    return out.getvalue()
+
+
+def stamp_core_properties(prs):
+    """Pin created/modified dates so they do not leak the build time"""
+    stamp = _build_timestamp()
+    props = prs.core_properties
+    if stamp is not None:
+        props.created = stamp
+        props.modified = stamp
+    props.revision = 1
+
+
+def deck_bytes(prs, reproducible=False):
+    """Serialize a presentation to bytes"""
+    if reproducible:
+        stamp_core_properties(prs)
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    data = buffer.getvalue()
+    return canonicalize_package(data) if reproducible else data
+
+
+@contextlib.contextmanager
+def open_output(target):
+    """Binary stream for a path, an already-open file-like object or STDOUT
+
+    A path is written through a temp file beside it and only replaced once the
+    block completes, so a failed build leaves the previous deck in place.
+    """
+    if target == STDOUT:
+        stream = sys.stdout.buffer
+        if stream.isatty():
+            raise ValueError("refusing to write a binary .pptx to a terminal; redirect stdout or use -o FILE")
+        yield stream
+        stream.flush()
+    elif hasattr(target, 'write'):
+        yield target
+    else:
+        tmp_path = f"{target}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                yield f
+            os.replace(tmp_path, target)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def write_output(target, data):
+    """Write an already-serialized deck to a path, file-like object or STDOUT"""
+    with open_output(target) as stream:
+        stream.write(data)
+
+
+def save_deck(prs, target, reproducible=False):
+    """Save a presentation to a path, file-like object (BytesIO, pipe, socket) or STDOUT
+
+    Non-seekable streams are fine: the zip is written with data descriptors.
+    """
+    if reproducible:
+        write_output(target, deck_bytes(prs, reproducible=True))
+        return
+    with open_output(target) as stream:
+        prs.save(stream)
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Deck Rendering Service
+Local asyncio HTTP service that renders variant specs into .pptx decks using a
+bounded pool of warm worker processes; identical concurrent requests share one
+build and finished decks are cached by spec hash
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import sys
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from urllib.parse import quote
+
+from create_presentation import deck_ir, deck_settings, render_variant, warm_template_cache
+from exporters import export
+
+PPTX_MIME = 'application/vnd.openxmlformats-officedocument.presentationml.presentation'
+MAX_BODY_BYTES = 1024 * 1024
+MAX_HEADER_LINES = 100
+DEFAULT_FILENAME = 'ISO_15118_vs_OCPP_1.6_Presentation'
+# Characters a quoted filename parameter cannot carry safely
+_UNSAFE_FILENAME = re.compile(r'["\\;]')
+
+
+class HTTPError(Exception):
+    """Request failure carrying the HTTP status to reply with"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def spec_hash(spec, reproducible):
+    """Stable hash of a variant spec (key order does not matter)"""
+    canonical = json.dumps({'spec': spec, 'reproducible': reproducible},
+                           sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def render_preview(spec):
+    """HTML slideshow of a variant spec; runs in a worker, like render_variant()"""
+    settings = deck_settings(spec)
+    return export(deck_ir(settings), settings, formats=('html',))['html']
+
+
+class ResultCache:
+    """In-memory LRU of rendered decks bounded by total size"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+
+    def get(self, key):
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+        return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DeckRenderer:
+    """Runs deck and preview builds in a process pool, coalescing identical in-flight requests"""
+
+    def __init__(self, workers=None, cache_bytes=256 * 1024 * 1024, max_pending=64):
+        # Workers must not be forked from the serving process: they would inherit
+        # open client sockets and keep those connections from closing
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                        initializer=warm_template_cache)
+        self.cache = ResultCache(cache_bytes)
+        self.max_pending = max_pending
+        self._inflight = {}
+        self.stats = {'hits': 0, 'coalesced': 0, 'builds': 0, 'rejected': 0, 'previews': 0}
+
+    @property
+    def inflight(self):
+        """Number of distinct builds currently running or queued"""
+        return len(self._inflight)
+
+    async def render(self, spec, reproducible=False):
+        """Return (deck bytes, how) where how is 'hit', 'coalesced' or 'miss'"""
+        return await self._run(spec_hash(spec, reproducible), render_variant, spec, reproducible)
+
+    async def preview(self, spec):
+        """Return (HTML preview bytes, how); the IR can take the time-to-charge simulation and chart data"""
+        self.stats['previews'] += 1
+        return await self._run(spec_hash(spec, 'preview'), render_preview, spec)
+
+    async def _run(self, key, build, *args):
+        """Cached result for key, the build already in flight for it, or a new build in the pool"""
+        data = self.cache.get(key)
+        if data is not None:
+            self.stats['hits'] += 1
+            return data, 'hit'
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            # shield: one cancelled client must not cancel the shared build
+            return await asyncio.shield(future), 'coalesced'
+
+        if len(self._inflight) >= self.max_pending:
+            self.stats['rejected'] += 1
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "too many builds in progress, retry later")
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, build, *args)
+        self._inflight[key] = future
+        self.stats['builds'] += 1
+        try:
+            data = await asyncio.shield(future)
+        finally:
+            self._inflight.pop(key, None)
+        self.cache.put(key, data)
+        return data, 'miss'
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+async def _read_request(reader):
+    """Parse one HTTP/1.1 request; returns None when the client closed the connection"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, version = request_line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "malformed request line")
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "too many headers")
+
+    length = headers.get('content-length', '') or '0'
+    if not (length.isascii() and length.isdigit()):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "invalid Content-Length")
+    length = int(length)
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "request body too large")
+    body = await reader.readexactly(length) if length else b''
+    return method, target, version, headers, body
+
+
+def _response(status, body, content_type='application/json', headers=None, keep_alive=True):
+    status = HTTPStatus(status)
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}",
+             f"Content-Type: {content_type}",
+             f"Content-Length: {len(body)}",
+             f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+def content_disposition(name):
+    """Attachment header for name.pptx, safe for any spec name
+
+    Control characters (CR/LF could add headers) and quotes are dropped; names
+    outside ASCII get an ASCII fallback plus an RFC 5987 filename* parameter.
+    """
+    name = ''.join(ch for ch in str(name) if not unicodedata.category(ch).startswith('C'))
+    name = _UNSAFE_FILENAME.sub('', name).strip() or DEFAULT_FILENAME
+    fallback = name.encode('ascii', 'replace').decode('ascii').replace('?', '_')
+    header = f'attachment; filename="{fallback}.pptx"'
+    if fallback != name:
+        header += f"; filename*=UTF-8''{quote(name + '.pptx', safe='')}"
+    return header
+
+
+def _json_body(payload):
+    return json.dumps(payload).encode('utf-8')
+
+
+class DeckServer:
+    """HTTP front end: POST /render or /preview with a JSON variant spec, GET /health"""
+
+    def __init__(self, renderer):
+        self.renderer = renderer
+
+    async def _dispatch(self, method, target, body):
+        """Route one request; returns (status, body, content type, extra headers)"""
+        path = target.split('?', 1)[0]
+        if path == '/health':
+            if method != 'GET':
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "use GET")
+            payload = dict(self.renderer.stats, cached=len(self.renderer.cache),
+                           inflight=self.renderer.inflight)
+            return HTTPStatus.OK, _json_body(payload), 'application/json', {}
+        if path not in ('/render', '/preview'):
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"no route for {path}")
+        if method != 'POST':
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "use POST")
+
+        try:
+            spec = json.loads(body or b'{}')
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "body must be a JSON variant spec")
+        if not isinstance(spec, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "body must be a JSON object")
+        local_files = sorted({'ocpp_logs', 'v2g_index'}.intersection(spec))
+        if local_files:
+            # Clients must not make the service read files off its own disk
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"{', '.join(local_files)} is not accepted over HTTP")
+        reproducible = bool(spec.pop('reproducible', False))
+        try:
+            deck_settings(spec)
+        except (ValueError, TypeError) as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+
+        if path == '/preview':
+            page, how = await self.renderer.preview(spec)
+            return HTTPStatus.OK, page, 'text/html; charset=utf-8', {'X-Deck-Cache': how}
+
+        data, how = await self.renderer.render(spec, reproducible)
+        return HTTPStatus.OK, data, PPTX_MIME, {
+            'Content-Disposition': content_disposition(spec.get('name', DEFAULT_FILENAME)),
+            'X-Deck-Cache': how,
+        }
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                    if request is None:
+                        break
+                    method, target, version, headers, body = request
+                    keep_alive = (headers.get('connection', '').lower() != 'close'
+                                  and version == 'HTTP/1.1')
+                    status, payload, content_type, extra = await self._dispatch(method, target, body)
+                    # Built here so a header that cannot be encoded still gets an error reply
+                    response = _response(status, payload, content_type, extra, keep_alive)
+                except HTTPError as e:
+                    keep_alive = False
+                    response = _response(e.status, _json_body({'error': str(e)}), keep_alive=False)
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as e:
+                    keep_alive = False
+                    response = _response(HTTPStatus.INTERNAL_SERVER_ERROR, _json_body({'error': f"build failed: {e}"}),
+                                         keep_alive=False)
+                writer.write(response)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def serve(host, port, renderer):
+    server = DeckServer(renderer)
+    listener = await asyncio.start_server(server.handle, host, port)
+    addresses = ', '.join(str(sock.getsockname()) for sock in listener.sockets)
+    print(f"✅ Deck service listening on {addresses}", file=sys.stderr)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve rendered ISO 15118 decks over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8815)
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="build worker processes")
+    parser.add_argument('--max-pending', type=int, default=64,
+                        help="distinct builds allowed in flight before replying 503")
+    parser.add_argument('--cache-mb', type=int, default=256,
+                        help="in-memory result cache size")
+    args = parser.parse_args()
+
+    renderer = DeckRenderer(args.workers, args.cache_mb * 1024 * 1024, args.max_pending)
+    try:
+        asyncio.run(serve(args.host, args.port, renderer))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        renderer.close()
+
+
+if __name__ == "__main__":
+    main()
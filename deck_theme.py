@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Deck Theme
+Writes the project's palette and text size hierarchy into the slide master and
+layout placeholders once, so slide paragraphs inherit their styling by level
+instead of carrying their own run properties; tables likewise take their fills,
+borders and bold header from one shared table style
+"""
+
+import copy
+
+from lxml import etree
+from pptx.enum.shapes import PP_PLACEHOLDER
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import nsdecls, qn
+
+# Paragraph levels of the content placeholder and the style each one inherits
+HEADING = 0        # 18pt bold, primary color
+BULLET = 1         # 16pt, dark text
+SMALL_BULLET = 2   # 14pt, dark text, same indent as BULLET
+LISTING = 3        # 14pt Courier New, no bullet (numbered workflow text)
+DIAGRAM = 4        # 12pt Courier New, no bullet (box-drawing diagrams)
+
+MONOSPACE_FONT = 'Courier New'
+
+# Table style of every native table: primary-colored bold header row, bold first
+# column, banded rows in a tint of the primary color
+TABLE_STYLE_ID = '{9B5E3C1A-4F2D-4E8B-A7C6-15118D0C0A16}'
+TABLE_STYLE_NAME = 'ISO 15118 Comparison'
+_BORDER = '<a:{side}><a:ln w="6350"><a:solidFill><a:srgbClr val="{color}"><a:tint val="50000"/></a:srgbClr></a:solidFill></a:ln></a:{side}>'
+_TABLE_STYLE_XML = (
+    '<a:tblStyle {nsdecls} styleId="{style_id}" styleName="{style_name}">'
+    '<a:wholeTbl><a:tcTxStyle><a:fontRef idx="minor"/><a:srgbClr val="{text}"/></a:tcTxStyle>'
+    '<a:tcStyle><a:tcBdr>{borders}</a:tcBdr><a:fill><a:solidFill><a:srgbClr val="FFFFFF"/></a:solidFill></a:fill>'
+    '</a:tcStyle></a:wholeTbl>'
+    '<a:band1H><a:tcStyle><a:tcBdr/><a:fill><a:solidFill><a:srgbClr val="{primary}"><a:tint val="15000"/>'
+    '</a:srgbClr></a:solidFill></a:fill></a:tcStyle></a:band1H>'
+    '<a:firstCol><a:tcTxStyle b="on"><a:fontRef idx="minor"/><a:srgbClr val="{text}"/></a:tcTxStyle>'
+    '<a:tcStyle><a:tcBdr/></a:tcStyle></a:firstCol>'
+    '<a:firstRow><a:tcTxStyle b="on"><a:fontRef idx="minor"/><a:srgbClr val="FFFFFF"/></a:tcTxStyle>'
+    '<a:tcStyle><a:tcBdr/><a:fill><a:solidFill><a:srgbClr val="{primary}"/></a:solidFill></a:fill></a:tcStyle>'
+    '</a:firstRow></a:tblStyle>'
+)
+
+# Fill elements a:defRPr may carry; only one is allowed
+_FILLS = ('a:noFill', 'a:solidFill', 'a:gradFill', 'a:blipFill', 'a:pattFill', 'a:grpFill')
+
+
+def _level_tag(level):
+    return qn(f'a:lvl{level + 1}pPr')
+
+
+def _get_or_add_level(list_style, level):
+    """Return the a:lvlNpPr for a paragraph level, inserted in document order"""
+    tag = _level_tag(level)
+    lvl = list_style.find(tag)
+    if lvl is not None:
+        return lvl
+    lvl = list_style.makeelement(tag, {})
+    for later in range(level + 1, 9):
+        successor = list_style.find(_level_tag(later))
+        if successor is not None:
+            successor.addprevious(lvl)
+            return lvl
+    list_style.append(lvl)
+    return lvl
+
+
+def _set_run_defaults(lvl, size=None, bold=None, color=None, font=None):
+    """Set the default run properties (a:defRPr) of one paragraph level"""
+    def_rpr = lvl.find(qn('a:defRPr'))
+    if def_rpr is None:
+        def_rpr = lvl.makeelement(qn('a:defRPr'), {})
+        # defRPr is the last paragraph-property child apart from extLst
+        ext_lst = lvl.find(qn('a:extLst'))
+        if ext_lst is not None:
+            ext_lst.addprevious(def_rpr)
+        else:
+            lvl.append(def_rpr)
+    if size is not None:
+        def_rpr.set('sz', str(int(size * 100)))
+    if bold is not None:
+        def_rpr.set('b', '1' if bold else '0')
+    if color is not None:
+        for tag in _FILLS:
+            for fill in def_rpr.findall(qn(tag)):
+                def_rpr.remove(fill)
+        fill = def_rpr.makeelement(qn('a:solidFill'), {})
+        fill.append(fill.makeelement(qn('a:srgbClr'), {'val': str(color)}))
+        ln = def_rpr.find(qn('a:ln'))
+        if ln is not None:
+            ln.addnext(fill)
+        else:
+            def_rpr.insert(0, fill)
+    if font is not None:
+        latin = def_rpr.find(qn('a:latin'))
+        if latin is None:
+            latin = def_rpr.makeelement(qn('a:latin'), {})
+            # latin follows fills/effects and precedes ea/cs/sym
+            following = [def_rpr.find(qn(t)) for t in ('a:ea', 'a:cs', 'a:sym', 'a:hlinkClick',
+                                                       'a:hlinkMouseOver', 'a:rtl', 'a:extLst')]
+            following = [e for e in following if e is not None]
+            if following:
+                following[0].addprevious(latin)
+            else:
+                def_rpr.append(latin)
+        latin.set('typeface', font)
+
+
+def _set_no_bullet(lvl, mar_l, indent=0):
+    """Plain (unbulleted) paragraphs at the given left margin"""
+    lvl.set('marL', str(mar_l))
+    lvl.set('indent', str(indent))
+    for tag in ('a:buFont', 'a:buChar', 'a:buAutoNum', 'a:buBlip', 'a:buNone'):
+        for bullet in lvl.findall(qn(tag)):
+            lvl.remove(bullet)
+    bu_none = lvl.makeelement(qn('a:buNone'), {})
+    following = [lvl.find(qn(t)) for t in ('a:tabLst', 'a:defRPr', 'a:extLst')]
+    following = [e for e in following if e is not None]
+    if following:
+        following[0].addprevious(bu_none)
+    else:
+        lvl.append(bu_none)
+
+
+def _placeholder_list_style(layout, ph_type):
+    """a:lstStyle of the layout placeholder with the given type, created if missing"""
+    for shape in layout.placeholders:
+        if shape.element.ph_type == ph_type:
+            tx_body = shape.element.find(qn('p:txBody'))
+            lst_style = tx_body.find(qn('a:lstStyle'))
+            if lst_style is None:
+                lst_style = tx_body.makeelement(qn('a:lstStyle'), {})
+                tx_body.find(qn('a:bodyPr')).addnext(lst_style)
+            return lst_style
+    return None
+
+
+def _set_table_style(prs, primary_color, text_color):
+    """Add or replace the deck's table style in ppt/tableStyles.xml"""
+    part = prs.part.part_related_by(RT.TABLE_STYLES)
+    styles = etree.fromstring(part.blob)
+    for old in styles.findall(qn('a:tblStyle')):
+        if old.get('styleId') == TABLE_STYLE_ID:
+            styles.remove(old)
+    borders = ''.join(_BORDER.format(side=side, color=primary_color)
+                      for side in ('left', 'right', 'top', 'bottom', 'insideH', 'insideV'))
+    styles.append(etree.fromstring(_TABLE_STYLE_XML.format(
+        nsdecls=nsdecls('a'), style_id=TABLE_STYLE_ID, style_name=TABLE_STYLE_NAME, borders=borders,
+        primary=primary_color, text=text_color)))
+    part._blob = etree.tostring(styles, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def apply_theme(prs, primary_color, text_color):
+    """Write the deck's title, heading, bullet and diagram styles into the master, and its table style
+
+    Safe to call more than once on the same presentation.
+    """
+    tx_styles = prs.slide_master.element.find(qn('p:txStyles'))
+
+    # Slide titles
+    title_style = tx_styles.find(qn('p:titleStyle'))
+    _set_run_defaults(_get_or_add_level(title_style, 0), color=primary_color)
+
+    # Content placeholder hierarchy
+    body_style = tx_styles.find(qn('p:bodyStyle'))
+    _set_run_defaults(_get_or_add_level(body_style, HEADING), size=18, bold=True, color=primary_color)
+    bullet = _get_or_add_level(body_style, BULLET)
+    _set_run_defaults(bullet, size=16, bold=False, color=text_color)
+
+    # Small bullets share the BULLET indent and marker, only the size differs
+    small = copy.deepcopy(bullet)
+    small.tag = _level_tag(SMALL_BULLET)
+    body_style.replace(_get_or_add_level(body_style, SMALL_BULLET), small)
+    _set_run_defaults(small, size=14)
+
+    heading_margin = _get_or_add_level(body_style, HEADING).get('marL', '342900')
+    for level, size in ((LISTING, 14), (DIAGRAM, 12)):
+        lvl = _get_or_add_level(body_style, level)
+        _set_run_defaults(lvl, size=size, bold=False, color=text_color, font=MONOSPACE_FONT)
+        _set_no_bullet(lvl, heading_margin)
+
+    # Title slide subtitle
+    subtitle_style = _placeholder_list_style(prs.slide_layouts[0], PP_PLACEHOLDER.SUBTITLE)
+    if subtitle_style is not None:
+        _set_run_defaults(_get_or_add_level(subtitle_style, 0), color=text_color)
+
+    _set_table_style(prs, primary_color, text_color)
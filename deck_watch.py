@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Deck Watch Mode
+Long-lived rebuild loop: polls the deck sources, keeps python-pptx, the parsed
+template and the current presentation in memory, and re-renders only the
+slides whose content changed before rewriting the output
+"""
+
+import importlib
+import os
+import sys
+import time
+
+import markdown_deck
+from deck_io import save_deck
+from markdown_deck import _drop_slide, _move_slide, _renumber_slide_parts
+from slide_ir import PrototypeRenderer, digest
+from template_cache import new_presentation
+from text_fit import split_overflowing
+
+POLL_INTERVAL = 0.2
+
+
+class FileWatcher:
+    """Polls files for changes by modification time and size"""
+
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.interval = interval
+        self._stamps = {path: self._stamp(path) for path in self.paths}
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def poll(self):
+        """Paths changed since the last poll"""
+        changed = []
+        for path in self.paths:
+            stamp = self._stamp(path)
+            if stamp != self._stamps[path]:
+                self._stamps[path] = stamp
+                changed.append(path)
+        return changed
+
+    def wait(self):
+        """Block until something changes; editors often write twice, so settle one interval"""
+        while True:
+            time.sleep(self.interval)
+            changed = self.poll()
+            if changed:
+                time.sleep(self.interval)
+                return sorted(set(changed + self.poll()))
+
+
+class IncrementalDeck:
+    """A rendered deck that can be brought up to date with new slide IR
+
+    Each IR slide owns its rendered slide plus any "(cont.)" slides the fit
+    check split off it; only owners whose IR digest changed are re-rendered.
+    """
+
+    def __init__(self, colors):
+        self.colors = colors
+        self.prs = new_presentation(theme=(colors.PRIMARY_BLUE, colors.TEXT_DARK))
+        self.digests = []
+        self.sizes = []  # rendered slides per IR slide, in deck order
+
+    def _drop_group(self, start, size):
+        for _ in range(size):
+            _drop_slide(self.prs, start)
+        # Close the gap in partnames, as a fresh build has none
+        _renumber_slide_parts(self.prs)
+
+    def _split(self, sizes):
+        """Split overflowing slides; a "(cont.)" slide joins the group of the slide before it"""
+        owners = {}
+        slides = iter(self.prs.slides)
+        for index, size in enumerate(sizes):
+            for _ in range(size):
+                owners[next(slides).part] = index
+        # Slides that already fit measure in well under a millisecond each
+        split_overflowing(self.prs)
+        sizes = [0] * len(sizes)
+        owner = 0
+        for slide in self.prs.slides:
+            owner = owners.get(slide.part, owner)
+            sizes[owner] += 1
+        return sizes
+
+    def update(self, slides):
+        """Re-render changed slides; returns the 1-based numbers of the IR slides rendered"""
+        digests = [digest(ir) for ir in slides]
+        sizes = list(self.sizes)
+        rebuilt = []
+        renderer = PrototypeRenderer(self.prs, self.colors)
+
+        # Slides removed from the end of the deck
+        for index in range(len(self.digests) - 1, len(digests) - 1, -1):
+            self._drop_group(sum(sizes[:index]), sizes.pop())
+        # Changed slides are replaced in place; later positions are unaffected
+        for index in range(len(sizes)):
+            if self.digests[index] != digests[index]:
+                start = sum(sizes[:index])
+                self._drop_group(start, sizes[index])
+                renderer.render(slides[index])
+                _move_slide(self.prs, len(self.prs.slides) - 1, start)
+                sizes[index] = 1
+                rebuilt.append(index + 1)
+        # New slides at the end
+        for index in range(len(self.digests), len(digests)):
+            renderer.render(slides[index])
+            sizes.append(1)
+            rebuilt.append(index + 1)
+
+        if rebuilt:
+            sizes = self._split(sizes)
+            _renumber_slide_parts(self.prs)
+        self.digests, self.sizes = digests, sizes
+        return rebuilt
+
+
+def _restart(log):
+    print("🔄 Renderer code changed, restarting", file=log)
+    log.flush()
+    os.execv(sys.executable, [sys.executable] + sys.argv)
+
+
+def watch_generator(output, reproducible=False, interval=POLL_INTERVAL, log=sys.stdout, selection=None):
+    """Rebuild the generated deck whenever create_presentation.py or its inputs change
+
+    selection picks source slides the way select_slides() does, "(cont.)" slides included.
+    """
+    generator = importlib.import_module('create_presentation')
+    generator_file = os.path.abspath(generator.__file__)
+    package_dir = generator.PACKAGE_DIR
+    watcher = FileWatcher([generator_file] + [os.path.join(package_dir, name)
+                                                  for name in generator.BUILD_INPUTS], interval)
+    # Imported modules cannot be reloaded safely in place (cached IR, lru_caches,
+    # classes held by live objects), so a change to one restarts the process;
+    # data files such as the diagram instructions are re-read on every build
+    renderers = {os.path.join(package_dir, name) for name in generator.BUILD_INPUTS if name.endswith('.py')}
+    deck = None
+
+    while True:
+        start = time.perf_counter()
+        try:
+            settings = generator.deck_settings()
+            if deck is None or vars(settings.colors) != vars(deck.colors):
+                deck = IncrementalDeck(settings.colors)
+            slides = generator.deck_ir(settings)
+            if selection:
+                slides = generator.select_slides(slides, selection)
+            removed = len(deck.digests) > len(slides)
+            rebuilt = deck.update(slides)
+            if rebuilt or removed:
+                save_deck(deck.prs, output, reproducible=reproducible)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"✅ Rebuilt {len(rebuilt)} slide(s) {rebuilt} in {elapsed:.0f}ms: {output}", file=log)
+        except Exception as e:  # keep watching through typos in the sources
+            print(f"❌ Build failed: {type(e).__name__}: {e}", file=log)
+            deck = None  # a half-updated deck cannot be diffed; rebuild it next time
+        log.flush()
+
+        changed = watcher.wait()
+        if renderers.intersection(changed):
+            _restart(log)
+        if generator_file in changed:
+            try:
+                generator = importlib.reload(generator)
+            except Exception as e:
+                print(f"❌ Could not reload {os.path.basename(generator_file)}: {e}", file=log)
+
+
+def watch_markdown(source, output, reproducible=False, interval=POLL_INTERVAL, log=sys.stdout):
+    """Recompile the markdown deck whenever its source changes"""
+    watcher = FileWatcher([source], interval)
+    prs = new_presentation(theme=(markdown_deck.PRIMARY_BLUE, markdown_deck.TEXT_DARK))
+    digests = []
+
+    while True:
+        start = time.perf_counter()
+        try:
+            with open(source, encoding='utf-8') as f:
+                md_slides = markdown_deck.parse_markdown_slides(f.read())
+            rebuilt = markdown_deck.update_slides(prs, md_slides, digests)
+            digests = [md_slide.digest for md_slide in md_slides]
+            if rebuilt:
+                save_deck(prs, output, reproducible=reproducible)
+                markdown_deck.write_manifest(source, output, digests)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"✅ Rebuilt {len(rebuilt)} slide(s) {rebuilt} in {elapsed:.0f}ms: {output}", file=log)
+        except Exception as e:
+            print(f"❌ Build failed: {type(e).__name__}: {e}", file=log)
+            prs = new_presentation(theme=(markdown_deck.PRIMARY_BLUE, markdown_deck.TEXT_DARK))
+            digests = []
+        log.flush()
+        watcher.wait()
@@ -0,0 +1,722 @@
+#!/usr/bin/env python3
+"""
+Native Diagrams
+Parses the Mermaid flowchart subset used in diagram_instructions.md, lays the
+graph out in layers (longest-path ranking, barycenter ordering) and draws it
+as native autoshapes and connectors; layouts are memoized by graph hash.
+Mermaid sequence diagrams (participants, messages, notes, loops) are drawn as
+lifelines with one row per message
+"""
+
+import hashlib
+import re
+import threading
+from dataclasses import dataclass, field
+
+from pptx.dml.color import RGBColor
+from pptx.enum.dml import MSO_LINE
+from pptx.enum.shapes import MSO_CONNECTOR, MSO_SHAPE
+from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
+from pptx.oxml.ns import qn
+from pptx.util import Emu, Inches, Pt
+
+ORDERING_SWEEPS = 12
+
+# Mermaid node brackets -> shape name, longest delimiters first
+_BRACKETS = (
+    ('([', '])', 'stadium'),
+    ('[(', ')]', 'cylinder'),
+    ('[[', ']]', 'subroutine'),
+    ('((', '))', 'circle'),
+    ('[', ']', 'rect'),
+    ('(', ')', 'rounded'),
+    ('{', '}', 'diamond'),
+    ('>', ']', 'flag'),
+)
+
+# shape name -> (autoshape, glue connectors to its four top/left/bottom/right sites)
+SHAPES = {
+    'rect': (MSO_SHAPE.RECTANGLE, True),
+    'rounded': (MSO_SHAPE.ROUNDED_RECTANGLE, True),
+    'stadium': (MSO_SHAPE.FLOWCHART_TERMINATOR, True),
+    'subroutine': (MSO_SHAPE.FLOWCHART_PREDEFINED_PROCESS, True),
+    'cylinder': (MSO_SHAPE.FLOWCHART_MAGNETIC_DISK, True),
+    'diamond': (MSO_SHAPE.FLOWCHART_DECISION, True),
+    'flag': (MSO_SHAPE.RECTANGLE, True),
+    'circle': (MSO_SHAPE.OVAL, False),
+}
+
+# Connection site indexes of four-site shapes
+TOP, LEFT, BOTTOM, RIGHT = range(4)
+
+_HEADER = re.compile(r'^(?:graph|flowchart)(?:\s+(TD|TB|BT|LR|RL))?\s*;?$')
+_NODE_ID = re.compile(r'[A-Za-z0-9_]+')
+# -->, ---, -.->, -.-, ==>, ===, <-->, <==>, <-.->, with an optional |label|;
+# or the "-- label -->" form
+_ARROW = re.compile(r'\s*(?:(?P<inline>--|==|-\.)\s*(?P<text>[^-=.|>][^|>]*?)\s*(?P<tail>-->|==>|\.->|---|===|\.-)'
+                    r'|(?P<arrow><?-->|---|<?-\.->|-\.-|<?==>|===))\s*(?:\|(?P<label>[^|]*)\|)?\s*')
+_STYLE = re.compile(r'^style\s+([A-Za-z0-9_]+)\s+(.+)$')
+_UNSUPPORTED = re.compile(r'^(subgraph|end|classDef|class|linkStyle|click|direction)\b')
+_BREAK = re.compile(r'<br\s*/?>', re.IGNORECASE)
+_FENCE = re.compile(r'^```mermaid\s*\n(.*?)^```', re.MULTILINE | re.DOTALL)
+_SEQUENCE_HEADER = re.compile(r'^sequenceDiagram$')
+_PARTICIPANT = re.compile(r'^(?:participant|actor)\s+([A-Za-z0-9_]+)(?:\s+as\s+(.+))?$')
+# ->> and -->> draw arrowheads, -> and --> plain lines; two dashes make it dashed
+_MESSAGE = re.compile(r'^([A-Za-z0-9_]+)\s*(-->>|->>|-->|->)\s*([A-Za-z0-9_]+)\s*:\s*(.*)$')
+_NOTE = re.compile(r'^Note\s+(?:over|left of|right of)\s+([A-Za-z0-9_]+)(?:\s*,\s*([A-Za-z0-9_]+))?\s*:\s*(.*)$',
+                   re.IGNORECASE)
+_LOOP = re.compile(r'^loop(?:\s+(.*))?$')
+_HEADING = re.compile(r'^#{1,6}\s+(.*)$', re.MULTILINE)
+
+
+@dataclass
+class Node:
+    id: str
+    label: str
+    shape: str = 'rect'
+    fill: str = None
+    stroke: str = None
+    stroke_width: float = None  # points
+
+
+@dataclass
+class Edge:
+    source: str
+    target: str
+    label: str = None
+    arrow: bool = True
+    arrow_start: bool = False
+    dashed: bool = False
+    thick: bool = False
+
+
+@dataclass
+class Graph:
+    direction: str = 'TD'
+    nodes: dict = field(default_factory=dict)
+    edges: list = field(default_factory=list)
+
+    @property
+    def layout_digest(self):
+        """Hash of everything the layout depends on (not labels or styles)"""
+        h = hashlib.sha256(self.direction.encode('utf-8'))
+        for node_id in self.nodes:
+            h.update(b'\0n' + node_id.encode('utf-8'))
+        for edge in self.edges:
+            h.update(f"\0e{edge.source}\0{edge.target}".encode('utf-8'))
+        return h.hexdigest()
+
+
+@dataclass
+class Note:
+    first: str   # participant ids the note spans
+    last: str
+    text: str
+
+
+@dataclass
+class Loop:
+    label: str
+    first: int   # index of the first step inside the loop
+    end: int     # index after its last step
+
+
+@dataclass
+class SequenceDiagram:
+    participants: dict = field(default_factory=dict)  # id -> label, in order of appearance
+    steps: list = field(default_factory=list)         # Edge (a message) or Note, one row each
+    loops: list = field(default_factory=list)
+
+
+@dataclass
+class Layout:
+    """Abstract layered layout: rank along the flow, position across it"""
+    ranks: dict          # node id -> rank
+    positions: dict      # node id -> position within the rank, centered on 0
+    rank_count: int
+    breadth: int         # most nodes in any rank
+    routes: list         # per edge: [(rank, position), ...] from source to target
+    reversed_edges: set  # indexes of edges drawn against the flow
+
+
+def _hex_color(value):
+    value = value.strip().lstrip('#')
+    if len(value) == 3:
+        value = ''.join(c * 2 for c in value)
+    if not re.fullmatch(r'[0-9A-Fa-f]{6}', value):
+        raise ValueError(f"unsupported color {value!r}")
+    return value.upper()
+
+
+def _clean_label(text):
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        text = text[1:-1]
+    return _BREAK.sub('\n', text).strip()
+
+
+def _parse_node(line, pos, graph):
+    """Parse NODE or NODE[label] at pos; returns (node id, new pos)"""
+    match = _NODE_ID.match(line, pos)
+    if not match:
+        raise ValueError(f"expected a node id at {line[pos:]!r}")
+    node_id = match.group()
+    pos = match.end()
+    for opening, closing, shape in _BRACKETS:
+        if line.startswith(opening, pos):
+            end = line.find(closing, pos + len(opening))
+            if end < 0:
+                raise ValueError(f"unterminated {opening} in {line!r}")
+            label = _clean_label(line[pos + len(opening):end])
+            node = graph.nodes.get(node_id)
+            if node is None:
+                graph.nodes[node_id] = Node(node_id, label, shape)
+            else:
+                node.label, node.shape = label, shape
+            return node_id, end + len(closing)
+    graph.nodes.setdefault(node_id, Node(node_id, node_id))
+    return node_id, pos
+
+
+def _parse_style(node, spec):
+    for item in spec.split(','):
+        name, _, value = item.partition(':')
+        name, value = name.strip(), value.strip()
+        if name == 'fill':
+            node.fill = _hex_color(value)
+        elif name == 'stroke':
+            node.stroke = _hex_color(value)
+        elif name == 'stroke-width':
+            node.stroke_width = float(value.rstrip('px')) * 0.75  # CSS px -> pt
+
+
+def parse_mermaid(source):
+    """Parse a Mermaid graph/flowchart (nodes, edges, labels, style lines) into a Graph"""
+    graph = None
+    for number, raw in enumerate(source.splitlines(), 1):
+        line = raw.split('%%', 1)[0].strip().rstrip(';')
+        if not line:
+            continue
+        try:
+            if graph is None:
+                header = _HEADER.match(line)
+                if not header:
+                    raise ValueError("diagram must start with 'graph' or 'flowchart'")
+                graph = Graph(header.group(1) or 'TD')
+                continue
+            unsupported = _UNSUPPORTED.match(line)
+            if unsupported:
+                raise ValueError(f"'{unsupported.group(1)}' is not in the supported Mermaid subset")
+            style = _STYLE.match(line)
+            if style:
+                node = graph.nodes.get(style.group(1))
+                if node is None:
+                    raise ValueError(f"style for unknown node {style.group(1)!r}")
+                _parse_style(node, style.group(2))
+                continue
+            source_id, pos = _parse_node(line, 0, graph)
+            while pos < len(line):
+                arrow = _ARROW.match(line, pos)
+                if not arrow:
+                    raise ValueError(f"unsupported syntax {line[pos:]!r}")
+                kind = arrow.group('arrow') or (arrow.group('inline') + arrow.group('tail'))
+                label = arrow.group('label') if arrow.group('label') is not None else arrow.group('text')
+                target_id, pos = _parse_node(line, arrow.end(), graph)
+                graph.edges.append(Edge(source_id, target_id, _clean_label(label) if label else None,
+                                        arrow=kind.endswith('>'), arrow_start=kind.startswith('<'),
+                                        dashed='.' in kind, thick='=' in kind))
+                source_id = target_id
+        except ValueError as e:
+            raise ValueError(f"Mermaid line {number}: {e}") from None
+    if graph is None:
+        raise ValueError("empty Mermaid diagram")
+    return graph
+
+
+def parse_sequence(source):
+    """Parse a Mermaid sequenceDiagram (participants, messages, notes, loops)"""
+    diagram = None
+    open_loops = []
+    for number, raw in enumerate(source.splitlines(), 1):
+        line = raw.split('%%', 1)[0].strip().rstrip(';')
+        if not line:
+            continue
+        try:
+            if diagram is None:
+                if not _SEQUENCE_HEADER.match(line):
+                    raise ValueError("diagram must start with 'sequenceDiagram'")
+                diagram = SequenceDiagram()
+                continue
+            participant = _PARTICIPANT.match(line)
+            message = _MESSAGE.match(line)
+            note = _NOTE.match(line)
+            loop = _LOOP.match(line)
+            if participant:
+                diagram.participants[participant.group(1)] = _clean_label(participant.group(2) or participant.group(1))
+            elif message:
+                source_id, kind, target_id, label = message.groups()
+                for node_id in (source_id, target_id):
+                    diagram.participants.setdefault(node_id, node_id)
+                diagram.steps.append(Edge(source_id, target_id, _clean_label(label) or None,
+                                          arrow=kind.endswith('>>'), dashed=kind.startswith('--')))
+            elif note:
+                first, last, text = note.groups()
+                for node_id in (first, last or first):
+                    diagram.participants.setdefault(node_id, node_id)
+                diagram.steps.append(Note(first, last or first, _clean_label(text)))
+            elif loop:
+                open_loops.append(Loop(_clean_label(loop.group(1) or ''), len(diagram.steps), None))
+            elif line == 'end':
+                if not open_loops:
+                    raise ValueError("'end' without a loop")
+                finished = open_loops.pop()
+                finished.end = len(diagram.steps)
+                diagram.loops.append(finished)
+            else:
+                raise ValueError(f"unsupported syntax {line!r}")
+        except ValueError as e:
+            raise ValueError(f"Mermaid line {number}: {e}") from None
+    if diagram is None:
+        raise ValueError("empty Mermaid diagram")
+    if open_loops:
+        raise ValueError(f"Mermaid loop {open_loops[-1].label!r} is never closed with 'end'")
+    return diagram
+
+
+def parse_diagram(source):
+    """A Graph for a flowchart or a SequenceDiagram for a sequenceDiagram source"""
+    for raw in source.splitlines():
+        line = raw.split('%%', 1)[0].strip()
+        if line:
+            return parse_sequence(source) if _SEQUENCE_HEADER.match(line) else parse_mermaid(source)
+    raise ValueError("empty Mermaid diagram")
+
+
+def mermaid_blocks(markdown):
+    """{heading: source} for every ```mermaid block, keyed by the nearest heading above it"""
+    headings = [(m.start(), m.group(1)) for m in _HEADING.finditer(markdown)]
+    blocks = {}
+    for block in _FENCE.finditer(markdown):
+        title = ''
+        for start, text in headings:
+            if start > block.start():
+                break
+            title = text
+        title = title.replace('*', '').strip().rstrip(':').strip()
+        blocks[title] = block.group(1)
+    return blocks
+
+
+def _break_cycles(node_ids, edges):
+    """Indexes of edges to reverse so the graph becomes acyclic (DFS back edges)"""
+    successors = {node_id: [] for node_id in node_ids}
+    for i, edge in enumerate(edges):
+        successors[edge.source].append((i, edge.target))
+    state = dict.fromkeys(node_ids, 0)  # 0 new, 1 on stack, 2 done
+    reversed_edges = set()
+    for root in node_ids:
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            node, children = stack[-1]
+            for i, child in children:
+                if state[child] == 1:
+                    reversed_edges.add(i)
+                elif state[child] == 0:
+                    state[child] = 1
+                    stack.append((child, iter(successors[child])))
+                    break
+            else:
+                state[node] = 2
+                stack.pop()
+    return reversed_edges
+
+
+def _assign_ranks(node_ids, links):
+    """Longest-path layering over acyclic (source, target) links"""
+    indegree = dict.fromkeys(node_ids, 0)
+    successors = {node_id: [] for node_id in node_ids}
+    for source, target in links:
+        if source != target:
+            successors[source].append(target)
+            indegree[target] += 1
+    ranks = dict.fromkeys(node_ids, 0)
+    ready = [node_id for node_id in node_ids if indegree[node_id] == 0]
+    while ready:
+        node = ready.pop(0)
+        for child in successors[node]:
+            ranks[child] = max(ranks[child], ranks[node] + 1)
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+    return ranks
+
+
+def _crossings(upper, lower, links):
+    """Edge crossings between two adjacent ordered ranks"""
+    upper_index = {node: i for i, node in enumerate(upper)}
+    lower_index = {node: i for i, node in enumerate(lower)}
+    pairs = sorted((upper_index[s], lower_index[t]) for s, t in links
+                   if s in upper_index and t in lower_index)
+    count = 0
+    for i, (_, a) in enumerate(pairs):
+        for _, b in pairs[i + 1:]:
+            if b < a:
+                count += 1
+    return count
+
+
+def _order_ranks(layers, links):
+    """Barycenter sweeps (down then up), keeping the ordering with fewest crossings"""
+    down = {}
+    up = {}
+    for source, target in links:
+        down.setdefault(target, []).append(source)
+        up.setdefault(source, []).append(target)
+
+    def total(layers):
+        return sum(_crossings(layers[r], layers[r + 1], links) for r in range(len(layers) - 1))
+
+    best = [list(layer) for layer in layers]
+    best_crossings = total(best)
+    current = [list(layer) for layer in layers]
+    for sweep in range(ORDERING_SWEEPS):
+        if best_crossings == 0:
+            break
+        going_down = sweep % 2 == 0
+        rank_order = range(1, len(current)) if going_down else range(len(current) - 2, -1, -1)
+        for r in rank_order:
+            fixed = current[r - 1] if going_down else current[r + 1]
+            neighbours = down if going_down else up
+            index = {node: i for i, node in enumerate(fixed)}
+
+            def barycenter(item):
+                i, node = item
+                linked = [index[n] for n in neighbours.get(node, ()) if n in index]
+                return sum(linked) / len(linked) if linked else i
+
+            current[r] = [node for _, node in sorted(enumerate(current[r]), key=barycenter)]
+        crossings = total(current)
+        if crossings < best_crossings:
+            best, best_crossings = [list(layer) for layer in current], crossings
+    return best
+
+
+def _compute_layout(graph):
+    node_ids = list(graph.nodes)
+    reversed_edges = _break_cycles(node_ids, graph.edges)
+    links = [(e.target, e.source) if i in reversed_edges else (e.source, e.target)
+             for i, e in enumerate(graph.edges)]
+    ranks = _assign_ranks(node_ids, links)
+
+    # Long edges pass through one dummy node per intermediate rank
+    all_ranks = dict(ranks)
+    chains = []
+    unit_links = []
+    for i, (source, target) in enumerate(links):
+        chain = [source]
+        for r in range(ranks[source] + 1, ranks[target]):
+            dummy = ('dummy', i, r)
+            all_ranks[dummy] = r
+            chain.append(dummy)
+        chain.append(target)
+        chains.append(chain)
+        unit_links.extend(zip(chain, chain[1:]))
+
+    rank_count = max(all_ranks.values(), default=-1) + 1
+    layers = [[] for _ in range(rank_count)]
+    for node in list(node_ids) + [n for n in all_ranks if isinstance(n, tuple)]:
+        layers[all_ranks[node]].append(node)
+    layers = _order_ranks(layers, unit_links)
+
+    positions = {}
+    for layer in layers:
+        offset = (len(layer) - 1) / 2
+        for i, node in enumerate(layer):
+            positions[node] = i - offset
+
+    routes = []
+    for i, chain in enumerate(chains):
+        points = [(all_ranks[n], positions[n]) for n in chain]
+        routes.append(points[::-1] if i in reversed_edges else points)
+    return Layout(
+        ranks={node_id: ranks[node_id] for node_id in node_ids},
+        positions={node_id: positions[node_id] for node_id in node_ids},
+        rank_count=rank_count,
+        breadth=max((len(layer) for layer in layers), default=0),
+        routes=routes,
+        reversed_edges=reversed_edges,
+    )
+
+
+class LayoutCache:
+    """Layouts keyed by Graph.layout_digest, so unchanged graphs are laid out once"""
+
+    def __init__(self):
+        self._layouts = {}
+        self._lock = threading.Lock()
+
+    def layout(self, graph):
+        key = graph.layout_digest
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = _compute_layout(graph)
+            with self._lock:
+                self._layouts[key] = layout
+        return layout
+
+    def clear(self):
+        with self._lock:
+            self._layouts.clear()
+
+    def __len__(self):
+        return len(self._layouts)
+
+
+_default_layouts = LayoutCache()
+
+
+def layout_graph(graph):
+    """Layered layout of a graph from the process-wide layout cache"""
+    return _default_layouts.layout(graph)
+
+
+def site_point(shape, site):
+    """Slide coordinates of a top/left/bottom/right connection site"""
+    x, y, cx, cy = shape.left, shape.top, shape.width, shape.height
+    return {
+        TOP: (x + cx // 2, y),
+        LEFT: (x, y + cy // 2),
+        BOTTOM: (x + cx // 2, y + cy),
+        RIGHT: (x + cx, y + cy // 2),
+    }[site]
+
+
+def _add_line_end(line, tag):
+    ln = line._get_or_add_ln()
+    for old in ln.findall(qn(tag)):
+        ln.remove(old)
+    end = ln.makeelement(qn(tag), {'type': 'triangle', 'w': 'med', 'len': 'med'})
+    # headEnd precedes tailEnd; both come last apart from extLst
+    following = [ln.find(qn(t)) for t in ('a:tailEnd', 'a:extLst') if t != tag]
+    following = [e for e in following if e is not None]
+    if following:
+        following[0].addprevious(end)
+    else:
+        ln.append(end)
+
+
+def _style_line(line, edge, color):
+    line.color.rgb = color
+    line.width = Pt(2.5 if edge.thick else 1.5)
+    if edge.dashed:
+        line.dash_style = MSO_LINE.DASH
+    if edge.arrow_start:
+        _add_line_end(line, 'a:headEnd')
+    if edge.arrow:
+        _add_line_end(line, 'a:tailEnd')
+
+
+def _set_text(text_frame, lines, color, align=PP_ALIGN.CENTER):
+    """Fill a text frame with (text, size, bold) lines as explicitly styled runs"""
+    text_frame.word_wrap = True
+    text_frame.vertical_anchor = MSO_ANCHOR.MIDDLE
+    for margin in ('margin_left', 'margin_right', 'margin_top', 'margin_bottom'):
+        setattr(text_frame, margin, Inches(0.03))
+    for i, (line, size, bold) in enumerate(lines):
+        p = text_frame.paragraphs[0] if i == 0 else text_frame.add_paragraph()
+        p.alignment = align
+        # Run properties: shape text does not inherit the placeholder theme levels
+        run = p.add_run()
+        run.text = line
+        run.font.size = size
+        run.font.bold = bold
+        run.font.color.rgb = color
+
+
+def add_node(slide, shape_name, left, top, width, height, label, fill, line, text,
+             font_size=Pt(12), stroke_width=None, details=()):
+    """One diagram node: an autoshape with a centered label and optional detail lines"""
+    autoshape, _ = SHAPES[shape_name]
+    shape = slide.shapes.add_shape(autoshape, Emu(int(left)), Emu(int(top)), Emu(int(width)), Emu(int(height)))
+    shape.fill.solid()
+    shape.fill.fore_color.rgb = fill
+    shape.line.color.rgb = line
+    shape.line.width = Pt(stroke_width) if stroke_width else Pt(1.5)
+    lines = [(part, font_size, bool(details)) for part in label.split('\n') if part or not details]
+    detail_size = Pt(max(font_size.pt - 2, 7))
+    lines.extend((detail, detail_size, False) for detail in details)
+    _set_text(shape.text_frame, lines, text)
+    return shape
+
+
+def connect(slide, source, begin_site, target, end_site, edge, color, glue=(True, True)):
+    """Straight connector between two node shapes, glued where the shape supports it"""
+    begin, end = site_point(source, begin_site), site_point(target, end_site)
+    connector = slide.shapes.add_connector(MSO_CONNECTOR.STRAIGHT, *begin, *end)
+    if glue[0]:
+        connector.begin_connect(source, begin_site)
+    if glue[1]:
+        connector.end_connect(target, end_site)
+    _style_line(connector.line, edge, color)
+    return connector
+
+
+def add_polyline(slide, points, edge, color):
+    """Unfilled freeform through points, styled like a connector"""
+    builder = slide.shapes.build_freeform(*points[0], scale=1.0)
+    builder.add_line_segments(points[1:], close=False)
+    path = builder.convert_to_shape()
+    path.fill.background()
+    _style_line(path.line, edge, color)
+    return path
+
+
+def add_edge_label(slide, mid, label, horizontal, font_size, color):
+    """Edge label above a horizontal edge or beside a vertical one"""
+    box_w, box_h = Inches(1.4), Inches(0.3)
+    if horizontal:
+        box_left, box_top = mid[0] - box_w // 2, mid[1] - box_h
+    else:
+        box_left, box_top = mid[0] + Inches(0.05), mid[1] - box_h // 2
+    box = slide.shapes.add_textbox(Emu(int(box_left)), Emu(int(box_top)), box_w, box_h)
+    _set_text(box.text_frame, [(label, font_size, False)], color)
+    return box
+
+
+def draw_diagram(slide, graph, left, top, width, height, fill=None, line=None, text=None,
+                 font_size=Pt(12), max_node_width=Inches(2.6), max_node_height=Inches(1.0)):
+    """Draw a graph as autoshapes and connectors inside the given box
+
+    fill, line and text are RGBColor defaults for nodes without Mermaid styles.
+    Returns {node id: shape}.
+    """
+    layout = layout_graph(graph)
+    fill = fill or RGBColor(0xE6, 0xF3, 0xFF)
+    line = line or RGBColor(0x00, 0x66, 0xCC)
+    text = text or RGBColor(0x33, 0x33, 0x33)
+    horizontal = graph.direction in ('LR', 'RL')
+    flipped = graph.direction in ('BT', 'RL')
+
+    # Rank axis runs along the flow, breadth axis across it
+    rank_extent, breadth_extent = (width, height) if horizontal else (height, width)
+    rank_cell = rank_extent / max(layout.rank_count, 1)
+    breadth_cell = breadth_extent / max(layout.breadth, 1)
+    node_along = min(rank_cell * 0.6, max_node_width if horizontal else max_node_height)
+    node_across = min(breadth_cell * 0.85, max_node_height if horizontal else max_node_width)
+
+    def center(rank, position):
+        """Slide coordinates (EMU) of a layout cell's center"""
+        if flipped:
+            rank = layout.rank_count - 1 - rank
+        along = (rank + 0.5) * rank_cell
+        across = breadth_extent / 2 + position * breadth_cell
+        if horizontal:
+            return int(left + along), int(top + across)
+        return int(left + across), int(top + along)
+
+    node_w, node_h = (node_along, node_across) if horizontal else (node_across, node_along)
+    shapes = {}
+    for node_id, node in graph.nodes.items():
+        cx, cy = center(layout.ranks[node_id], layout.positions[node_id])
+        w, h = (min(node_w, node_h),) * 2 if node.shape == 'circle' else (node_w, node_h)
+        shapes[node_id] = add_node(
+            slide, node.shape, cx - w / 2, cy - h / 2, w, h, node.label,
+            RGBColor.from_string(node.fill) if node.fill else fill,
+            RGBColor.from_string(node.stroke) if node.stroke else line,
+            text, font_size, node.stroke_width)
+
+    # Sites facing downstream / upstream along the flow
+    exit_site, entry_site = {
+        'TD': (BOTTOM, TOP), 'TB': (BOTTOM, TOP), 'BT': (TOP, BOTTOM),
+        'LR': (RIGHT, LEFT), 'RL': (LEFT, RIGHT),
+    }[graph.direction]
+    label_size = Pt(max(font_size.pt - 2, 8))
+    for i, (edge, route) in enumerate(zip(graph.edges, layout.routes)):
+        source, target = shapes[edge.source], shapes[edge.target]
+        begin_site, end_site = (entry_site, exit_site) if i in layout.reversed_edges else (exit_site, entry_site)
+        if len(route) == 2:
+            glue = (SHAPES[graph.nodes[edge.source].shape][1], SHAPES[graph.nodes[edge.target].shape][1])
+            connect(slide, source, begin_site, target, end_site, edge, line, glue)
+            points = [site_point(source, begin_site), site_point(target, end_site)]
+            mid = ((points[0][0] + points[1][0]) // 2, (points[0][1] + points[1][1]) // 2)
+        else:
+            # Edges spanning several ranks follow their dummy-node route
+            points = [center(r, p) for r, p in route]
+            points[0] = site_point(source, begin_site)
+            points[-1] = site_point(target, end_site)
+            add_polyline(slide, points, edge, line)
+            mid = points[len(points) // 2]
+        if edge.label:
+            add_edge_label(slide, mid, edge.label, horizontal, label_size, text)
+    return shapes
+
+
+def draw_sequence(slide, diagram, left, top, width, height, fill=None, line=None, text=None,
+                  font_size=Pt(12), max_row=Inches(0.45)):
+    """Draw a SequenceDiagram inside the given box: participant boxes, lifelines, one row per step
+
+    Returns {participant id: header shape}.
+    """
+    fill = fill or RGBColor(0xE6, 0xF3, 0xFF)
+    line = line or RGBColor(0x00, 0x66, 0xCC)
+    text = text or RGBColor(0x33, 0x33, 0x33)
+    ids = list(diagram.participants)
+    column = width / max(len(ids), 1)
+    x = {node_id: int(left + (i + 0.5) * column) for i, node_id in enumerate(ids)}
+    header_h = Inches(0.4)
+    body_top = top + header_h + Inches(0.1)
+    # A quarter row below the last step holds the lifeline ends
+    row = min((top + height - body_top) / (max(len(diagram.steps), 1) + 0.25), max_row)
+    body_bottom = int(body_top + row * len(diagram.steps))
+    # Labels sit in the row above their arrow; shrink them with the rows
+    label_size = Pt(max(min(font_size.pt - 2, row / 12700 * 0.5), 7))
+
+    shapes = {}
+    box_w = min(column * 0.7, Inches(2.4))
+    lifeline = Edge(None, None, arrow=False, dashed=True)
+    for node_id in ids:
+        shapes[node_id] = add_node(slide, 'rect', x[node_id] - box_w / 2, top, box_w, header_h,
+                                   diagram.participants[node_id], fill, line, text, font_size)
+        connector = slide.shapes.add_connector(MSO_CONNECTOR.STRAIGHT, x[node_id], int(top + header_h),
+                                               x[node_id], body_bottom + int(row * 0.25))
+        _style_line(connector.line, lifeline, line)
+        connector.line.width = Pt(0.75)
+
+    for loop in diagram.loops:
+        frame_left = int(min(x.values()) - column * 0.45)
+        frame_top = int(body_top + loop.first * row + row * 0.05)
+        frame = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, frame_left, frame_top,
+                                       int(column * (len(ids) - 0.1)), int(row * (loop.end - loop.first) - row * 0.1))
+        frame.fill.background()
+        _style_line(frame.line, Edge(None, None, arrow=False, dashed=True), line)
+        frame.line.width = Pt(1)
+        box = slide.shapes.add_textbox(frame_left, frame_top, int(column * 0.4), int(row * 0.9))
+        _set_text(box.text_frame, [(f"loop {loop.label}".strip(), label_size, True)], line, PP_ALIGN.LEFT)
+
+    for i, step in enumerate(diagram.steps):
+        row_top = body_top + i * row
+        if isinstance(step, Note):
+            first, last = sorted((x[step.first], x[step.last]))
+            add_node(slide, 'rect', first - column * 0.35, row_top + row * 0.1, last - first + column * 0.7,
+                     row * 0.8, step.text, fill, line, text, label_size)
+            continue
+        y = int(row_top + row * 0.8)
+        begin, end = x[step.source], x[step.target]
+        if begin == end:
+            # A message to itself loops out to the right and back
+            loop_w = int(column * 0.2)
+            add_polyline(slide, [(begin, int(row_top + row * 0.45)), (begin + loop_w, int(row_top + row * 0.45)),
+                                 (begin + loop_w, y), (begin, y)], step, line)
+            label_left, label_w = begin + loop_w, int(column * 0.6)
+        else:
+            connector = slide.shapes.add_connector(MSO_CONNECTOR.STRAIGHT, begin, y, end, y)
+            _style_line(connector.line, step, line)
+            label_left, label_w = min(begin, end), abs(end - begin)
+        if step.label:
+            box = slide.shapes.add_textbox(Emu(int(label_left)), Emu(int(row_top + row * 0.05)),
+                                           Emu(int(label_w)), Emu(int(row * 0.7)))
+            _set_text(box.text_frame, [(step.label, label_size, False)], text)
+    return shapes
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Deck Exporters
+Renders one in-memory slide IR to PPTX, Markdown (the "## Slide N:" format of
+ISO_15118_Presentation.md) and a static HTML slideshow in a single pass over
+the slides, so every format shows the same content
+"""
+
+import argparse
+import html
+import math
+import os
+import sys
+import textwrap
+
+from deck_io import deck_bytes
+from deck_theme import SMALL_BULLET
+from slide_ir import (COLUMN, MERMAID, TITLE_LAYOUT, XY, Bullet, Chart, Diagram, Listing, PrototypeRenderer, Table,
+                      Text)
+from template_cache import new_presentation
+from text_fit import split_overflowing
+
+FORMATS = ('pptx', 'md', 'html')
+# Plot area of HTML charts in CSS pixels, and its margins for axis labels and the legend
+CHART_SIZE = (600, 240)
+CHART_MARGIN = (48, 16, 200, 36)  # left, top, right, bottom
+
+
+class PptxEmitter:
+    """Renders slides into a themed presentation; overflow continues on (cont.) slides"""
+
+    def __init__(self, settings, reproducible=False):
+        colors = settings.colors
+        self.colors = colors
+        self.reproducible = reproducible
+        self.prs = new_presentation(theme=(colors.PRIMARY_BLUE, colors.TEXT_DARK))
+        self.renderer = PrototypeRenderer(self.prs, colors)
+
+    def add(self, number, ir):
+        self.renderer.render(ir)
+
+    def finish(self):
+        split_overflowing(self.prs)
+        return deck_bytes(self.prs, reproducible=self.reproducible)
+
+
+class MarkdownEmitter:
+    """Writes slides in the markdown_deck.py source format, so the export compiles back
+
+    Charts have no markdown form and are left out; their slides carry the numbers as text.
+    """
+
+    def __init__(self, settings):
+        self.lines = [f"# {settings.title}", ""]
+
+    def add(self, number, ir):
+        lines = self.lines
+        lines.append(f"## Slide {number}: {ir.title}")
+        if ir.layout == TITLE_LAYOUT:
+            lines.append(f"**{ir.title}**")
+            lines.extend(f"*{line}*" for line in (ir.subtitle or '').splitlines() if line.strip())
+        for section in ir.sections:
+            if section.heading:
+                lines += ["", f"### {section.heading.rstrip(':')}"]
+            for item in section.items:
+                if isinstance(item, Bullet):
+                    # Small bullets are sub-items of the bullet above them
+                    indent = '  ' if item.level == SMALL_BULLET else ''
+                    marker = '-' if item.marker == '•' else item.marker
+                    lines.append(f"{indent}{marker} {item.text}")
+                elif isinstance(item, Text):
+                    text = item.text.strip()
+                    if text.startswith('• '):
+                        text = '- ' + text[2:]
+                    lines.append(f"*{text}*" if item.italic else text)
+                elif isinstance(item, (Listing, Diagram)):
+                    fence = '```mermaid' if isinstance(item, Diagram) and item.kind == MERMAID else '```'
+                    lines += [fence, _dedent_block(item.source if isinstance(item, Diagram) else item.text), '```']
+                elif isinstance(item, Table):
+                    lines += _markdown_table(item)
+        lines += ["", "---", ""]
+
+    def finish(self):
+        return '\n'.join(self.lines).rstrip('-\n') + '\n'
+
+
+def _markdown_table(table):
+    """Pipe table lines; markdown_deck.py compiles them back into a Table"""
+    def row(cells):
+        return '| ' + ' | '.join(str(cell).replace('|', '/') for cell in cells) + ' |'
+    return [row(table.header), row('-' * max(len(str(cell)), 3) for cell in table.header),
+            *(row(cells) for cells in table.rows)]
+
+
+def _dedent_block(text):
+    return textwrap.dedent(text).strip('\n')
+
+
+_HTML_STYLE = """
+body {{ margin: 0; font-family: Calibri, 'Segoe UI', Arial, sans-serif; background: #{background}; color: #{text}; }}
+.slide {{ box-sizing: border-box; width: 960px; min-height: 540px; margin: 24px auto; padding: 32px 48px;
+         background: #fff; box-shadow: 0 2px 8px rgba(0, 0, 0, .15); }}
+.js .slide {{ display: none; }}
+.js .slide.active {{ display: block; }}
+h1, h2 {{ color: #{primary}; }}
+h1 {{ font-size: 32pt; margin-top: 120px; text-align: center; }}
+.subtitle {{ font-size: 18pt; text-align: center; white-space: pre-line; }}
+h2 {{ font-size: 28pt; margin: 0 0 16px; }}
+h3 {{ font-size: 18pt; margin: 14px 0 6px; color: #{primary}; }}
+ul {{ list-style: none; margin: 0; padding-left: 24px; }}
+li {{ font-size: 16pt; margin: 4px 0; }}
+li.small {{ font-size: 14pt; }}
+.marker {{ display: inline-block; min-width: 1.4em; }}
+p {{ font-size: 18pt; margin: 6px 0; }}
+pre {{ font-family: 'Courier New', monospace; font-size: 11pt; background: #{background}; padding: 8px;
+       overflow-x: auto; }}
+table {{ border-collapse: collapse; margin: 8px 0; font-size: 12pt; }}
+th, td {{ border: 1px solid #{primary}55; padding: 3px 8px; text-align: left; }}
+th {{ background: #{primary}; color: #fff; }}
+tr:nth-child(even) td {{ background: #{primary}22; }}
+td:first-child {{ font-weight: bold; }}
+.counter {{ position: fixed; bottom: 8px; right: 16px; font-size: 10pt; color: #888; }}
+"""
+
+_HTML_SCRIPT = """
+document.body.classList.add('js');
+var slides = document.querySelectorAll('.slide'), counter = document.querySelector('.counter'), current = 0;
+function show(n) {
+  current = Math.max(0, Math.min(slides.length - 1, n));
+  slides.forEach(function (s, i) { s.classList.toggle('active', i === current); });
+  counter.textContent = (current + 1) + ' / ' + slides.length;
+  history.replaceState(null, '', '#' + slides[current].id);
+}
+document.addEventListener('keydown', function (e) {
+  if (['ArrowRight', 'PageDown', ' '].indexOf(e.key) >= 0) show(current + 1);
+  if (['ArrowLeft', 'PageUp'].indexOf(e.key) >= 0) show(current - 1);
+});
+document.addEventListener('click', function () { show(current + 1); });
+var start = Array.prototype.findIndex.call(slides, function (s) { return '#' + s.id === location.hash; });
+show(start < 0 ? 0 : start);
+"""
+
+
+def _axis_top(chart):
+    """Upper end of the y axis: 100% for fractions, else the data maximum rounded up to a 1-2-5 step"""
+    peak = max((y for _, _, values in chart.series for y in values if y == y), default=0)
+    if chart.y_format.endswith('%') and peak <= 1:
+        return 1
+    step = 10 ** math.floor(math.log10(peak / 4)) if peak > 0 else 1
+    step *= next((m for m in (1, 2, 5, 10) if peak <= 4 * step * m), 10)
+    return 4 * step
+
+
+def _svg_chart(chart, colors):
+    """Inline SVG chart: lines, or bars for COLUMN charts, against the shared x values or categories"""
+    e = html.escape
+    width, height = CHART_SIZE
+    left, top, right, bottom = CHART_MARGIN
+    numeric = chart.kind == XY
+    # XY charts place points by value, the others by category index; bars and points sit mid-slot
+    xs = chart.x if numeric else [i + 0.5 for i in range(len(chart.x))]
+    x0, x1 = (chart.x[0], chart.x[-1]) if numeric else (0, len(chart.x))
+    y1 = _axis_top(chart)
+    percent = chart.y_format.endswith('%')
+
+    def px(x):
+        return left + (x - x0) / ((x1 - x0) or 1) * width
+
+    def py(y):
+        return top + (1 - y / y1) * height
+
+    parts = [f'<svg class="chart" width="{left + width + right}" height="{top + height + bottom}" '
+             f'font-size="12" role="img">']
+    for tick in range(5):
+        y, value = top + height - tick * height / 4, tick * y1 / 4
+        parts.append(f'<line x1="{left}" y1="{y:.1f}" x2="{left + width}" y2="{y:.1f}" stroke="#ddd"/>'
+                     f'<text x="{left - 6}" y="{y + 4:.1f}" text-anchor="end">'
+                     f'{f"{value:.0%}" if percent else f"{value:g}"}</text>')
+    if numeric:
+        ticks = [(x, f"{x:g}") for x in (x0, (x0 + x1) / 2, x1)]
+    else:
+        ticks = [(xs[i], str(chart.x[i])) for i in sorted({0, len(xs) // 2, len(xs) - 1})]
+    for x, label in ticks:
+        parts.append(f'<text x="{px(x):.1f}" y="{top + height + 16}" text-anchor="middle">{e(label)}</text>')
+    if chart.x_title:
+        parts.append(f'<text x="{left + width / 2}" y="{top + height + 32}" text-anchor="middle">'
+                     f'{e(chart.x_title)}</text>')
+    bar = width / max(len(xs), 1) * 0.8 / max(len(chart.series), 1)
+    for index, (name, color, values) in enumerate(chart.series):
+        stroke = f"#{getattr(colors, color)}"
+        if chart.kind == COLUMN:
+            offset = (index - len(chart.series) / 2) * bar
+            parts.extend(f'<rect x="{px(x) + offset:.1f}" y="{py(y):.1f}" width="{bar:.1f}" '
+                         f'height="{top + height - py(y):.1f}" fill="{stroke}"/>'
+                         for x, y in zip(xs, values) if y == y)
+        else:
+            points = ' '.join(f"{px(x):.1f},{py(y):.1f}" for x, y in zip(xs, values) if y == y)
+            parts.append(f'<polyline fill="none" stroke="{stroke}" stroke-width="2.5" points="{points}"/>')
+        parts.append(f'<text x="{left + width + 12}" y="{top + 14 + index * 20}" fill="{stroke}">{e(name)}</text>')
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+class HtmlEmitter:
+    """Static, dependency-free HTML slideshow (arrow keys or click to advance)"""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.sections = []
+
+    def _color(self, name, default='inherit'):
+        return f"#{getattr(self.settings.colors, name)}" if name else default
+
+    def add(self, number, ir):
+        e = html.escape
+        parts = [f'<section class="slide" id="slide-{number}">']
+        if ir.layout == TITLE_LAYOUT:
+            parts.append(f"<h1>{e(ir.title)}</h1>")
+            if ir.subtitle:
+                parts.append(f'<p class="subtitle">{e(ir.subtitle)}</p>')
+        else:
+            parts.append(f"<h2>{e(ir.title)}</h2>")
+        for section in ir.sections:
+            if section.heading:
+                parts.append(f'<h3 style="color: {self._color(section.color)}">{e(section.heading)}</h3>')
+            in_list = False
+            for item in section.items:
+                if isinstance(item, Bullet) != in_list:
+                    parts.append('<ul>' if not in_list else '</ul>')
+                    in_list = not in_list
+                if isinstance(item, Bullet):
+                    small = ' class="small"' if item.level == SMALL_BULLET else ''
+                    parts.append(f'<li{small}><span class="marker">{e(item.marker)}</span>{e(item.text)}</li>')
+                elif isinstance(item, Text):
+                    style = [f"color: {self._color(item.color)}"]
+                    if item.size:
+                        style.append(f"font-size: {item.size}pt")
+                    if item.italic:
+                        style.append("font-style: italic")
+                    if item.bold is not None:
+                        style.append(f"font-weight: {'bold' if item.bold else 'normal'}")
+                    parts.append(f'<p style="{"; ".join(style)}">{e(item.text.strip())}</p>')
+                elif isinstance(item, Listing):
+                    parts.append(f"<pre>{e(_dedent_block(item.text))}</pre>")
+                elif isinstance(item, Diagram):
+                    # Mermaid sources render in place when the page includes mermaid.js
+                    css = ' class="mermaid"' if item.kind == MERMAID else ' class="diagram"'
+                    parts.append(f"<pre{css}>{e(_dedent_block(item.source))}</pre>")
+                elif isinstance(item, Chart):
+                    parts.append(_svg_chart(item, self.settings.colors))
+                elif isinstance(item, Table):
+                    parts.append('<table><tr>' + ''.join(f'<th>{e(str(cell))}</th>' for cell in item.header) + '</tr>'
+                                 + ''.join('<tr>' + ''.join(f'<td>{e(str(cell))}</td>' for cell in row) + '</tr>'
+                                           for row in item.rows) + '</table>')
+            if in_list:
+                parts.append('</ul>')
+        parts.append('</section>')
+        self.sections.append('\n'.join(parts))
+
+    def finish(self):
+        colors = self.settings.colors
+        style = _HTML_STYLE.format(background=colors.BACKGROUND_GRAY, text=colors.TEXT_DARK,
+                                   primary=colors.PRIMARY_BLUE)
+        page = [
+            '<!DOCTYPE html>',
+            '<html lang="en">',
+            '<head>',
+            '<meta charset="utf-8">',
+            f'<title>{html.escape(self.settings.title)}</title>',
+            f'<style>{style}</style>',
+            '</head>',
+            '<body>',
+            *self.sections,
+            '<div class="counter"></div>',
+            f'<script>{_HTML_SCRIPT}</script>',
+            '</body>',
+            '</html>',
+        ]
+        return '\n'.join(page) + '\n'
+
+
+def export(slides, settings, formats=FORMATS, reproducible=False):
+    """Render IR slides to every requested format in one pass; returns {format: bytes}"""
+    emitters = {}
+    for fmt in formats:
+        if fmt == 'pptx':
+            emitters[fmt] = PptxEmitter(settings, reproducible)
+        elif fmt == 'md':
+            emitters[fmt] = MarkdownEmitter(settings)
+        elif fmt == 'html':
+            emitters[fmt] = HtmlEmitter(settings)
+        else:
+            raise ValueError(f"Unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    for number, ir in enumerate(slides, 1):
+        for emitter in emitters.values():
+            emitter.add(number, ir)
+    results = {}
+    for fmt, emitter in emitters.items():
+        output = emitter.finish()
+        results[fmt] = output.encode('utf-8') if isinstance(output, str) else output
+    return results
+
+
+def main():
+    from create_presentation import deck_ir, deck_settings, load_manifest
+
+    parser = argparse.ArgumentParser(description="Export the deck as PPTX, Markdown and HTML from one build")
+    parser.add_argument('-o', '--output', default='ISO_15118_vs_OCPP_1.6_Presentation',
+                        help="output path without extension; each format adds its own")
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=list(FORMATS))
+    parser.add_argument('--variant', metavar='NAME',
+                        help="export a named variant from --manifest instead of the default deck")
+    parser.add_argument('--manifest', default='variants.json',
+                        help="batch manifest holding the variant")
+    parser.add_argument('--reproducible', action='store_true',
+                        help="byte-identical .pptx for identical inputs")
+    args = parser.parse_args()
+
+    variant = None
+    if args.variant:
+        variants = {v['name']: v for v in load_manifest(args.manifest)['variants']}
+        if args.variant not in variants:
+            raise ValueError(f"no variant {args.variant!r} in {args.manifest}")
+        variant = variants[args.variant]
+    settings = deck_settings(variant)
+    outputs = export(deck_ir(settings), settings, args.formats, args.reproducible)
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    for fmt, data in outputs.items():
+        path = f"{args.output}.{fmt}"
+        with open(path, 'wb') as f:
+            f.write(data)
+        print(f"✅ {fmt:<4} {len(data) / 1024:8.1f} KiB  {path}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except (OSError, ValueError) as e:
+        print(f"❌ Error exporting deck: {e}")
+        sys.exit(1)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Protocol Feature Matrix
+Structured comparison of OCPP 1.6, OCPP 2.0.1, ISO 15118-2 and ISO 15118-20,
+feature by feature, and the comparison-table slides built from it
+
+OCPP runs between the charging station and its backend, ISO 15118 between the
+EV and the charging station, so some rows do not apply to one side (n/a).
+✓ marks a supported feature and — one the protocol does not offer.
+"""
+
+import argparse
+import re
+import sys
+
+from slide_ir import Section, Slide, Table
+from text_fit import CONTINUED
+
+PROTOCOLS = ('OCPP 1.6', 'OCPP 2.0.1', 'ISO 15118-2', 'ISO 15118-20')
+YES, NO, NOT_APPLICABLE = '✓', '—', 'n/a'
+
+# (group, ((feature, values in PROTOCOLS order), ...))
+FEATURES = (
+    ("Communication", (
+        ("Communication link", ("Station ↔ backend", "Station ↔ backend", "EV ↔ station", "EV ↔ station")),
+        ("Transport", ("WebSocket or SOAP", "WebSocket", "HomePlug Green PHY", "HomePlug GP, Wi-Fi")),
+        ("Message encoding", ("JSON or XML", "JSON", "EXI", "EXI")),
+        ("Session setup", ("BootNotification", "BootNotification", "SDP, app handshake", "SDP, app handshake")),
+        # As on the Introduction slide's timeline
+        ("Published", ("2015", "2020", "2015", "2022")),
+    )),
+    ("Authorization & Security", (
+        ("Authorization", ("RFID, app, remote", "RFID, app, eMAID", "EIM or PnC", "EIM or PnC")),
+        ("Plug & Charge", (NO, "Backend side", YES, YES)),
+        ("Transport security", ("Security extension", "TLS, profiles 1-3", "TLS 1.2 (PnC)", "TLS 1.3, mandatory")),
+        ("Station identity", ("Basic auth (ext.)", "Client certificate", "SECC certificate", "SECC certificate")),
+        ("Contract certificates", (NO, "Install, update", "Install, update", "Install, update")),
+        ("Contracts per EV", (NOT_APPLICABLE, NOT_APPLICABLE, "One", "Several")),
+        ("Certificate revocation", (NO, "OCSP", "OCSP", "OCSP")),
+        ("Message signatures", (NO, NO, "XML signatures", "XML signatures")),
+        ("Signed meter values", (NO, YES, YES, YES)),
+        ("Security event log", ("Security extension", YES, NO, NO)),
+    )),
+    ("Charging Session", (
+        ("Session start", ("Remote or local", "Remote or local", "EV plugs in", "EV plugs in")),
+        ("Session messages", ("Start/StopTransaction", "TransactionEvent", "PowerDelivery", "PowerDelivery")),
+        ("AC charging", (YES, YES, YES, YES)),
+        ("DC charging", (YES, YES, YES, YES)),
+        ("Wireless power transfer", (NO, NO, NO, YES)),
+        ("Automated connection", (NO, NO, NO, YES)),
+        ("State of charge", ("DC meter values", YES, "DC only", YES)),
+        ("Departure time", (NO, "From ISO 15118", YES, YES)),
+        ("Energy request", (NO, "From ISO 15118", YES, "Target and minimum")),
+        ("Meter values", ("MeterValues", "MeterValues", "MeterInfo", "MeterInfo")),
+    )),
+    ("Smart Charging", (
+        ("Charging profiles", ("SetChargingProfile", "SetChargingProfile", "SAScheduleList", "ScheduleExchange")),
+        ("Schedule source", ("Backend", "Backend, EMS, EV", "Station", "Station")),
+        ("EV charging needs", (NO, "From ISO 15118", YES, YES)),
+        ("EV counter-proposal", (NO, "From ISO 15118", "Charging profile", "Power profile")),
+        ("Control modes", ("Scheduled", "Scheduled", "Scheduled", "Scheduled, dynamic")),
+        ("Tariffs to the EV", (NO, "Relayed to ISO 15118", "SalesTariff", "Absolute prices")),
+        ("Schedule renegotiation", ("Profile update", "Profile update", YES, YES)),
+        ("Composite schedule", (YES, YES, NOT_APPLICABLE, NOT_APPLICABLE)),
+        ("External limits", (NO, "NotifyChargingLimit", NO, NO)),
+    )),
+    ("Vehicle-to-Grid", (
+        ("Bidirectional power", (NO, NO, NO, YES)),
+        ("AC discharging", (NO, NO, NO, YES)),
+        ("DC discharging", (NO, NO, NO, YES)),
+        ("Discharge limits", (NO, NO, NO, YES)),
+        ("Dynamic grid control", (NO, NO, NO, "Dynamic mode")),
+        ("Minimum SoC protection", (NO, NO, NO, YES)),
+    )),
+    ("Operations", (
+        ("Firmware update", ("UpdateFirmware", "Signed firmware", NOT_APPLICABLE, NOT_APPLICABLE)),
+        ("Diagnostics upload", ("GetDiagnostics", "GetLog", NO, NO)),
+        ("Configuration", ("Key/value", "Device model", NOT_APPLICABLE, NOT_APPLICABLE)),
+        ("Offline authorization", ("Local list, cache", "Local list, cache", "Contract certificate",
+                                   "Contract certificate")),
+        ("Status reporting", ("StatusNotification", "StatusNotification", "EVSE status", "EVSE status")),
+        ("Driver messages", (NO, "SetDisplayMessage", NO, NO)),
+        ("Value-added services", ("DataTransfer", "DataTransfer", "Service discovery", "Service discovery")),
+        ("Reservations", ("ReserveNow", "ReserveNow", NO, NO)),
+    )),
+)
+
+# Rows of the Key Differences slide, OCPP 1.6 against both ISO 15118 generations
+KEY_DIFFERENCES = ("Communication link", "Authorization", "Plug & Charge", "Transport security",
+                   "State of charge", "Bidirectional power")
+KEY_PROTOCOLS = ('OCPP 1.6', 'ISO 15118-2', 'ISO 15118-20')
+# Feature column weight against one protocol column
+FEATURE_WIDTH = 1.6
+ROWS_PER_SLIDE = 10
+
+
+def feature_rows(names=None, protocols=PROTOCOLS, groups=None):
+    """(group, feature, values) for the given features (all by default), values in protocols order"""
+    columns = [PROTOCOLS.index(protocol) for protocol in protocols]
+    rows = [(group, feature, tuple(values[i] for i in columns))
+            for group, features in FEATURES if groups is None or group in groups
+            for feature, values in features if names is None or feature in names]
+    if names is not None:
+        missing = set(names) - {feature for _, feature, _ in rows}
+        if missing:
+            raise ValueError(f"unknown features: {', '.join(sorted(missing))}")
+        rows.sort(key=lambda row: names.index(row[1]))
+    return rows
+
+
+def comparison_table(rows, protocols=PROTOCOLS, size=12):
+    """Table IR of feature_rows() output"""
+    return Table(('Feature',) + tuple(protocols), tuple((feature,) + values for _, feature, values in rows),
+                 (FEATURE_WIDTH,) + (1,) * len(protocols), size)
+
+
+def feature_matrix_slides(settings=None, protocols=PROTOCOLS):
+    """Slides 12a-12f: one comparison table per feature group, continued past ROWS_PER_SLIDE rows"""
+    slides = []
+    for group, _ in FEATURES:
+        rows = feature_rows(protocols=protocols, groups=(group,))
+        slug = re.sub(r'\W+', '_', group.lower())
+        for page, start in enumerate(range(0, len(rows), ROWS_PER_SLIDE)):
+            chunk = rows[start:start + ROWS_PER_SLIDE]
+            slides.append(Slide(f"Feature Matrix: {group}" + (CONTINUED if page else ''), (
+                Section(f"{len(chunk)} Features Compared:", items=(comparison_table(chunk, protocols),)),
+            ), name=f"feature_matrix_{slug}" + (f"_{page + 1}" if page else '')))
+    return tuple(slides)
+
+
+def matrix_text(rows, protocols=PROTOCOLS):
+    """Aligned plain-text matrix of feature_rows() output"""
+    table = [('Feature',) + tuple(protocols)] + [(feature,) + values for _, feature, values in rows]
+    widths = [max(len(row[i]) for row in table) for i in range(len(table[0]))]
+    return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip() for row in table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the OCPP vs ISO 15118 feature matrix")
+    parser.add_argument('--protocols', nargs='+', choices=PROTOCOLS, default=list(PROTOCOLS),
+                        help="columns to compare, in order")
+    parser.add_argument('--group', action='append', choices=[group for group, _ in FEATURES],
+                        help="only these feature groups (repeatable)")
+    args = parser.parse_args()
+    rows = feature_rows(protocols=args.protocols, groups=args.group)
+    print(f"📊 {len(rows)} features across {', '.join(args.protocols)}")
+    print(matrix_text(rows, args.protocols))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ValueError as e:
+        print(f"❌ Error building feature matrix: {e}")
+        sys.exit(1)
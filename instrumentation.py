@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Build Instrumentation
+Records wall time, Python allocations and slide XML size per build phase and
+per slide, as a JSON report and through an optional per-record hook
+"""
+
+import json
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from importlib import metadata
+
+from lxml import etree
+
+REPORT_VERSION = 1
+
+
+class NullProfiler:
+    """Profiler stand-in that records nothing (the default for normal builds)"""
+
+    def phase(self, name):
+        return nullcontext()
+
+    def slide(self, prs, name):
+        return nullcontext()
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class BuildProfiler:
+    """Collects timing and memory records for one deck build
+
+    hook, when given, is called with each record dict as soon as it completes.
+    With memory=True allocations are traced with tracemalloc, which slows the
+    build down; timings are still comparable between runs with the same setting.
+    tracemalloc only sees Python objects, not the libxml2 trees behind slides,
+    which is what xml_bytes is for.
+    """
+
+    def __init__(self, hook=None, memory=True):
+        self.hook = hook
+        self.memory = memory
+        self.phases = []
+        self.slides = []
+        self._started_tracing = False
+        self._frames = []
+
+    def __enter__(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(self, *exc):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    @contextmanager
+    def _measure(self, record):
+        tracing = self.memory and tracemalloc.is_tracing()
+        if tracing:
+            # Nested measurements reset the peak, so each one hands its peak up,
+            # and saves the enclosing one's peak so far before resetting it
+            if self._frames:
+                self._frames[-1]['peak'] = max(self._frames[-1]['peak'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            frame = {'before': tracemalloc.get_traced_memory()[0], 'peak': 0}
+            self._frames.append(frame)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            if tracing:
+                self._frames.pop()
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, frame['peak'])
+                record['allocated_bytes'] = current - frame['before']
+                record['peak_bytes'] = peak - frame['before']
+                if self._frames:
+                    self._frames[-1]['peak'] = max(self._frames[-1]['peak'], peak)
+
+    def _emit(self, records, record):
+        records.append(record)
+        if self.hook is not None:
+            self.hook(record)
+
+    @contextmanager
+    def phase(self, name):
+        """Measure one build phase (template, build, save, ...)"""
+        record = {'kind': 'phase', 'name': name}
+        with self._measure(record):
+            yield record
+        self._emit(self.phases, record)
+
+    @contextmanager
+    def slide(self, prs, name):
+        """Measure one slide builder; records the XML size of the slides it added"""
+        first = len(prs.slides)
+        record = {'kind': 'slide', 'name': name, 'index': first + 1}
+        with self._measure(record):
+            yield record
+        # Serialized outside the timed region so the size probe does not skew timings
+        added = list(prs.slides)[first:]
+        record['slides_added'] = len(added)
+        record['xml_bytes'] = sum(len(etree.tostring(s.element)) for s in added)
+        self._emit(self.slides, record)
+
+    def report(self):
+        """Structured report of everything recorded so far"""
+        try:
+            pptx_version = metadata.version('python-pptx')
+        except metadata.PackageNotFoundError:
+            pptx_version = None
+        return {
+            'version': REPORT_VERSION,
+            'environment': {'python': platform.python_version(), 'python_pptx': pptx_version,
+                            'memory_traced': self.memory},
+            'total_seconds': sum(p['seconds'] for p in self.phases),
+            'phases': self.phases,
+            'slides': self.slides,
+        }
+
+    def write(self, path):
+        """Write the report as JSON"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+            f.write('\n')
+
+
+def builder_name(build_slide):
+    """Short slide name from a builder function (add_title_slide -> title)"""
+    name = build_slide.__name__
+    if name.startswith('add_'):
+        name = name[4:]
+    if name.endswith('_slide'):
+        name = name[:-6]
+    return name
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Markdown-to-Deck Compiler
+Compiles the "## Slide N:" sections of ISO_15118_Presentation.md into a deck and,
+on rebuild, regenerates only the slides whose source section changed
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import re
+from dataclasses import dataclass, field
+
+from pptx import Presentation
+
+from create_presentation import PRIMARY_BLUE, TEXT_DARK, deck_settings
+from deck_io import save_deck
+from deck_theme import DIAGRAM, SMALL_BULLET, apply_theme
+from slide_ir import (TITLE_LAYOUT, Bullet, Listing, Section, Slide, Table, Text, forget_slide_partnames,
+                      render_slide as render_ir)
+from template_cache import new_presentation
+
+# Bump whenever render_slide() output changes so stale manifests force a rebuild
+RENDERER_VERSION = 3
+# First valid p:sldId id; a fresh build numbers slides up from here
+FIRST_SLIDE_ID = 256
+
+SLIDE_HEADER = re.compile(r'^## Slide (\d+):\s*(.+?)\s*$')
+SECTION_END = re.compile(r'^## ')
+EMPHASIS = re.compile(r'\*\*(.+?)\*\*|\*(.+?)\*')
+
+
+@dataclass
+class MarkdownSlide:
+    """One "## Slide N:" section of the markdown source"""
+    number: int
+    title: str
+    source: str
+    blocks: list = field(default_factory=list)
+
+    @property
+    def digest(self):
+        """Hash of the section source, used to detect changed slides"""
+        return hashlib.sha256(f"{RENDERER_VERSION}\n{self.source}".encode('utf-8')).hexdigest()
+
+    @property
+    def is_title_slide(self):
+        """Slides made only of plain text lines use the title layout"""
+        return bool(self.blocks) and all(kind == 'text' for kind, _ in self.blocks)
+
+
+def strip_emphasis(text):
+    """Remove **bold** and *italic* markers from a line"""
+    return EMPHASIS.sub(lambda m: m.group(1) or m.group(2), text).strip()
+
+
+def _parse_blocks(lines):
+    """Turn the body lines of one slide section into (kind, value) blocks"""
+    blocks = []
+    code = None
+    table = None
+
+    for line in lines:
+        stripped = line.strip()
+
+        # Fenced code blocks are kept verbatim
+        if stripped.startswith('```'):
+            if code is None:
+                code = []
+            else:
+                blocks.append(('code', '\n'.join(code)))
+                code = None
+            continue
+        if code is not None:
+            code.append(line.rstrip())
+            continue
+
+        # Tables: first row is the header, the |---| separator row is dropped
+        if stripped.startswith('|'):
+            cells = [strip_emphasis(cell) for cell in stripped.strip('|').split('|')]
+            if all(set(cell) <= set('-: ') for cell in cells):
+                continue
+            if table is None:
+                table = []
+                blocks.append(('table', table))
+            table.append(cells)
+            continue
+        table = None
+
+        if not stripped or stripped == '---':
+            continue
+        # Indented bullets are sub-items, set in the smaller bullet style
+        bullet = 'small_bullet' if line[:1] in ' \t' else 'bullet'
+        if stripped.startswith('### '):
+            blocks.append(('heading', strip_emphasis(stripped[4:])))
+        elif stripped.startswith('- '):
+            blocks.append((bullet, ('•', strip_emphasis(stripped[2:]))))
+        else:
+            # Emoji-led lines (✅, ❌, 🔧 ...) are bullets with their own marker
+            marker, _, rest = stripped.partition(' ')
+            if rest and not any(ch.isalnum() or ch in '*[("' for ch in marker):
+                blocks.append((bullet, (marker, strip_emphasis(rest))))
+            else:
+                blocks.append(('text', strip_emphasis(stripped)))
+
+    if code is not None:
+        blocks.append(('code', '\n'.join(code)))
+    return blocks
+
+
+def parse_markdown_slides(text):
+    """Parse markdown source into a list of MarkdownSlide objects"""
+    slides = []
+    current = None
+    body = []
+
+    def finish():
+        # The header line is hashed with the body so retitling a slide rebuilds it
+        if current is not None:
+            current.source = '\n'.join(body).strip('\n')
+            current.blocks = _parse_blocks(body[1:])
+            slides.append(current)
+
+    for line in text.splitlines():
+        header = SLIDE_HEADER.match(line)
+        if header:
+            finish()
+            current = MarkdownSlide(int(header.group(1)), strip_emphasis(header.group(2)), '')
+            body = [line]
+        elif SECTION_END.match(line):
+            # Any other level-2 section (e.g. design notes) ends the slide list
+            finish()
+            current = None
+            body = []
+        elif current is not None:
+            body.append(line)
+    finish()
+    return slides
+
+
+def slide_ir(md_slide):
+    """The slide IR of one markdown slide"""
+    if md_slide.is_title_slide:
+        texts = [value for _, value in md_slide.blocks]
+        return Slide(texts[0], layout=TITLE_LAYOUT, subtitle='\n'.join(texts[1:]),
+                     title_size=32, subtitle_size=18, name=f"slide_{md_slide.number}")
+
+    sections = [(None, None, [])]  # (heading, color, items)
+    for kind, value in md_slide.blocks:
+        if kind == 'heading':
+            # The first heading keeps the theme color, later ones are highlighted
+            color = 'SECONDARY_GREEN' if any(heading for heading, _, _ in sections) else None
+            sections.append((f"{value}:", color, []))
+            continue
+        items = sections[-1][2]
+        if kind == 'bullet':
+            marker, text = value
+            items.append(Bullet(text, marker))
+        elif kind == 'small_bullet':
+            marker, text = value
+            items.append(Bullet(text, marker, SMALL_BULLET))
+        elif kind == 'code':
+            items.append(Listing(value, DIAGRAM))
+        elif kind == 'table':
+            header = tuple(value[0])
+            items.append(Table(header, tuple(tuple(row[:len(header)]) for row in value[1:])))
+        else:
+            items.append(Text(value, size=16, color='TEXT_DARK', bold=False))
+    sections = tuple(Section(heading, color, tuple(items)) for heading, color, items in sections
+                     if heading or items)
+    return Slide(md_slide.title, sections, name=f"slide_{md_slide.number}")
+
+
+def render_slide(prs, md_slide):
+    """Add one rendered markdown slide to the end of the presentation"""
+    return render_ir(prs, slide_ir(md_slide), deck_settings().colors)
+
+
+def _move_slide(prs, old_index, new_index):
+    """Move the slide at old_index so it sits at new_index"""
+    sld_id_lst = prs.slides._sldIdLst
+    sld_id = sld_id_lst[old_index]
+    sld_id_lst.remove(sld_id)
+    sld_id_lst.insert(new_index, sld_id)
+
+
+def _drop_slide(prs, index):
+    """Remove the slide at index; its part is no longer written on save"""
+    sld_id_lst = prs.slides._sldIdLst
+    sld_id = sld_id_lst[index]
+    prs.part.drop_rel(sld_id.rId)
+    sld_id_lst.remove(sld_id)
+    forget_slide_partnames(prs)
+
+
+def _renumber_slide_parts(prs):
+    """Number slide partnames, relationship IDs and slide IDs in deck order after splicing
+
+    A fresh build gives slides the lowest free rIds and IDs from 256 up, in
+    order; doing the same here keeps an incrementally updated deck
+    byte-identical to a --force rebuild.
+    """
+    sld_ids = list(prs.slides._sldIdLst)
+    prs.part.rename_slide_parts([sld_id.rId for sld_id in sld_ids])
+    forget_slide_partnames(prs)
+    rels = prs.part.rels._rels
+    slide_rels = [rels.pop(sld_id.rId) for sld_id in sld_ids]
+    free = (rId for rId in (f"rId{n}" for n in itertools.count(1)) if rId not in rels)
+    for index, (sld_id, rel, rId) in enumerate(zip(sld_ids, slide_rels, free)):
+        rel._rId = rId
+        rels[rId] = rel
+        sld_id.rId = rId
+        sld_id.id = FIRST_SLIDE_ID + index
+
+
+def splice_slide(prs, index, md_slide):
+    """Replace the slide at index with a freshly rendered one"""
+    render_slide(prs, md_slide)
+    _move_slide(prs, len(prs.slides) - 1, index)
+    _drop_slide(prs, index + 1)
+    _renumber_slide_parts(prs)
+
+
+def manifest_path_for(output_path):
+    """Sidecar file recording the source hash of every slide in a built deck"""
+    return output_path + '.manifest.json'
+
+
+def _load_manifest(output_path):
+    try:
+        with open(manifest_path_for(output_path), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def compile_deck(source_path, output_path, force=False, reproducible=False):
+    """Compile the markdown source, rebuilding only changed slides
+
+    Returns the list of slide numbers that were (re)rendered.
+    """
+    with open(source_path, encoding='utf-8') as f:
+        md_slides = parse_markdown_slides(f.read())
+    digests = [md_slide.digest for md_slide in md_slides]
+
+    manifest = None if force else _load_manifest(output_path)
+    prs = None
+    if manifest is not None and os.path.exists(output_path):
+        if manifest.get('slides') == digests:
+            return []
+        prs = Presentation(output_path)
+        # A deck edited or rebuilt outside the compiler cannot be trusted
+        if len(prs.slides) != len(manifest.get('slides', [])):
+            prs = None
+    if prs is None:
+        prs = new_presentation(theme=(PRIMARY_BLUE, TEXT_DARK))
+        old_digests = []
+    else:
+        old_digests = manifest['slides']
+        # Idempotent, and brings decks built by an older renderer up to date
+        apply_theme(prs, PRIMARY_BLUE, TEXT_DARK)
+
+    rebuilt = update_slides(prs, md_slides, old_digests)
+    save_deck(prs, output_path, reproducible=reproducible)
+    write_manifest(source_path, output_path, digests)
+    return rebuilt
+
+
+def update_slides(prs, md_slides, old_digests):
+    """Re-render the slides whose digest changed, append new ones and drop removed ones
+
+    Returns the list of slide numbers that were (re)rendered.
+    """
+    rebuilt = []
+    for index, md_slide in enumerate(md_slides):
+        if index < len(old_digests):
+            if old_digests[index] != md_slide.digest:
+                splice_slide(prs, index, md_slide)
+                rebuilt.append(md_slide.number)
+        else:
+            render_slide(prs, md_slide)
+            rebuilt.append(md_slide.number)
+    while len(prs.slides) > len(md_slides):
+        _drop_slide(prs, len(prs.slides) - 1)
+    _renumber_slide_parts(prs)
+    return rebuilt
+
+
+def write_manifest(source_path, output_path, digests):
+    with open(manifest_path_for(output_path), 'w', encoding='utf-8') as f:
+        json.dump({'renderer': RENDERER_VERSION, 'source': os.path.basename(source_path),
+                   'slides': digests}, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile ISO_15118_Presentation.md into a PowerPoint deck")
+    parser.add_argument('source', nargs='?', default='ISO_15118_Presentation.md',
+                        help="markdown source with '## Slide N:' sections")
+    parser.add_argument('-o', '--output', default='ISO_15118_Presentation.pptx',
+                        help="deck to create or incrementally update")
+    parser.add_argument('--force', action='store_true',
+                        help="ignore the manifest and rebuild every slide")
+    parser.add_argument('--reproducible', action='store_true',
+                        help="write byte-identical output for identical inputs")
+    parser.add_argument('--watch', action='store_true',
+                        help="stay running and recompile changed slides whenever the source changes")
+    args = parser.parse_args()
+
+    if args.watch:
+        from deck_watch import watch_markdown
+        print(f"👀 Watching {args.source}; Ctrl-C to stop")
+        try:
+            watch_markdown(args.source, args.output, reproducible=args.reproducible)
+        except KeyboardInterrupt:
+            print("✅ Stopped watching")
+        return
+
+    rebuilt = compile_deck(args.source, args.output, force=args.force, reproducible=args.reproducible)
+    if rebuilt:
+        print(f"✅ Rebuilt {len(rebuilt)} slide(s) {rebuilt}: {args.output}")
+    else:
+        print(f"✅ {args.output} is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+"""
+OCPP 1.6 Log Summaries
+Streams OCPP-J message logs in constant memory, aggregates them block by block
+with NumPy and turns the result into data-driven summary slides
+
+Each line holds one frame, [2, id, action, payload], [3, id, payload] or
+[4, id, code, description, details], after a timestamp and optionally the
+charge point id and a direction marker:
+
+    2024-05-01T10:00:00.123Z CP0042 -> [2,"19223201","Heartbeat",{}]
+
+JSON Lines records {"timestamp": ..., "station": ..., "message": [...]} work
+too. Files ending in .gz are decompressed on the fly.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+import warnings
+from collections import Counter
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from deck_theme import SMALL_BULLET
+from slide_ir import Bullet, Listing, Section, Slide, Text
+
+CALL, CALLRESULT, CALLERROR = 2, 3, 4
+# Log text reduced per vectorized pass; whole lines only
+BLOCK_BYTES = 8 * 1024 * 1024
+# Calls awaiting a result; unanswered ones are forgotten oldest first
+MAX_PENDING = 100000
+
+AUTH_METHODS = ('RFID', 'Remote start (app)', 'Plug & Charge (ISO 15118)', 'Other')
+# ISO 15118 certificate handling over OCPP 1.6 DataTransfer (OCA application note)
+PNC_VENDOR_ID = 'org.openchargealliance.iso15118pnc'
+# 4, 7 and 10 byte card UIDs as hex
+RFID_TAG = re.compile(r'^(?:[0-9A-Fa-f]{8}|[0-9A-Fa-f]{14}|[0-9A-Fa-f]{20})$')
+ENERGY_BINS_KWH = (0, 5, 10, 20, 40, 60, 80, np.inf)
+DIRECTIONS = {'IN', 'OUT', 'RX', 'TX', 'SEND', 'SENT', 'RECV', 'RECEIVED'}
+BAR_WIDTH = 28
+
+# One frame per line: (timestamp, prefix, kind, message id, action or error code, rest).
+# Payloads stay undecoded; only the actions feeding the session statistics are parsed
+_LINE = re.compile(
+    r'^[ \t]*\[?(\d{4}-\d\d-\d\d[T ]\d\d:\d\d(?::\d\d(?:\.\d+)?)?(?:Z|[+-]\d\d:\d\d)?)\]?'
+    r'([^\n]*?)\[\s*([234])\s*,\s*"([^"\n]*)"\s*(?:,\s*"(\w*)")?([^\n]*)$',
+    re.MULTILINE)
+_CONTENT_LINE = re.compile(r'^[^\S\n]*\S', re.MULTILINE)
+_PARSED_ACTIONS = ('StartTransaction', 'StopTransaction', 'StatusNotification', 'RemoteStartTransaction',
+                   'DataTransfer')
+_NAT = np.iinfo(np.int64).min
+# Column ranges of the fields in "YYYY-MM-DDTHH:MM:SS.fff" and their valid values
+_STAMP_FIELDS = ((0, 4, 0, 9999), (5, 7, 1, 12), (8, 10, 1, 31), (11, 13, 0, 23), (14, 16, 0, 59),
+                 (17, 19, 0, 60), (20, 23, 0, 999))
+
+
+@dataclass
+class LogSummary:
+    """What a set of OCPP-J logs adds up to; plain data, JSON-serializable"""
+    first: str
+    last: str
+    stations: int
+    messages: int
+    calls: int
+    results: int
+    errors: int
+    skipped_lines: int
+    actions: dict            # action -> calls, busiest first
+    busiest_stations: dict   # station -> messages, top 5
+    hourly_messages: list    # 24 counts by UTC hour of day
+    peak_per_minute: int
+    median_per_minute: float
+    sessions: int
+    completed_sessions: int
+    auth_methods: dict
+    energy_kwh: float
+    energy_histogram: dict   # "0-5 kWh" -> completed sessions
+    statuses: dict           # StatusNotification status -> count
+    error_codes: dict        # StatusNotification errorCode or CALLERROR code -> count
+
+
+def _station(prefix):
+    """Charge point id from the text between timestamp and frame ("CP0042 ->")"""
+    for token in prefix.replace('[', ' ').replace(']', ' ').split():
+        if any(c.isalnum() for c in token) and token.upper() not in DIRECTIONS:
+            return token
+    return ''
+
+
+def _payload(rest):
+    """Decode the payload from the text after a frame's id (and action): ',{...}]'"""
+    return json.loads(rest.strip()[1:-1])
+
+
+def _fixed_width_stamps(stamps):
+    """Milliseconds since the epoch for uniform "YYYY-MM-DD[T ]HH:MM:SS[.fff][Z]" stamps, or None
+
+    The common case is parsed as a 2-D digit array without touching the
+    strings one by one.
+    """
+    width = len(stamps[0])
+    if width not in (19, 20, 23, 24) or set(map(len, stamps)) != {width}:
+        return None
+    try:
+        raw = np.frombuffer(''.join(stamps).encode('ascii'), np.uint8).reshape(-1, width)
+    except UnicodeEncodeError:
+        return None
+    separators = [(4, '-'), (7, '-'), (13, ':'), (16, ':')] + [(19, '.')] * (width >= 23)
+    if width in (20, 24):
+        separators.append((width - 1, 'Z'))
+    if any((raw[:, col] != ord(char)).any() for col, char in separators):
+        return None
+    digits = raw.astype(np.int64) - ord('0')
+    fields = []
+    for start, end, low, high in _STAMP_FIELDS[:7 if width >= 23 else 6]:
+        if ((digits[:, start:end] < 0) | (digits[:, start:end] > 9)).any():
+            return None
+        value = digits[:, start:end] @ (10 ** np.arange(end - start - 1, -1, -1))
+        if ((value < low) | (value > high)).any():
+            return None
+        fields.append(value)
+    year, month, day, hour, minute, second = fields[:6]
+    # Days since 1970-01-01 from the civil date (proleptic Gregorian)
+    y = year - (month <= 2)
+    doy = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    days = (y // 400) * 146097 + (y % 400) * 365 + (y % 400) // 4 - (y % 400) // 100 + doy - 719468
+    ms = (((days * 24 + hour) * 60 + minute) * 60 + second) * 1000
+    return ms + fields[6] if width >= 23 else ms
+
+
+def _counted(counter, key):
+    counter[key] = counter.get(key, 0) + 1
+
+
+def _add(total, counts):
+    """total + counts, growing total to counts' length"""
+    if len(counts) > len(total):
+        total = np.concatenate([total, np.zeros(len(counts) - len(total), np.int64)])
+    total[:len(counts)] += counts
+    return total
+
+
+def _median_with_zeros(counts, zeros):
+    """Median of counts plus that many zeros, without materializing the zeros"""
+    n = len(counts) + zeros
+    if not n:
+        return 0.0
+    ordered = np.sort(counts)
+
+    def nth(i):
+        return 0 if i < zeros else int(ordered[i - zeros])
+    return (nth((n - 1) // 2) + nth(n // 2)) / 2
+
+
+def _interned(values, table):
+    """Codes for values from a growing {value: code} table"""
+    codes = list(map(table.get, values))
+    if None in codes:
+        for value in set(values).difference(table):
+            table[value] = len(table)
+        codes = list(map(table.get, values))
+    return np.array(codes, dtype=np.int32)
+
+
+class LogSummarizer:
+    """Accumulates OCPP-J frames; feed it text (from any number of files), then summary()
+
+    Each block of lines is matched in one regex pass and reduced with NumPy.
+    State kept across blocks is bounded by the number of charge points,
+    in-flight calls and open transactions, not by the size of the logs.
+    """
+
+    def __init__(self):
+        self._actions, self._prefixes, self._stations = {}, {}, {}
+        self._station_of_prefix = np.zeros(0, np.int32)
+        self._action_counts = np.zeros(0, np.int64)
+        self._station_counts = np.zeros(0, np.int64)
+        self._kind_counts = np.zeros(CALLERROR + 1, np.int64)
+        self._hourly = np.zeros(24, np.int64)
+        self._per_minute = Counter()  # minute since the epoch -> messages; active minutes only
+        self._first = self._last = None
+        self._skipped = 0
+
+        self._pending = {}   # (station, message id) -> meterStart of a StartTransaction call
+        self._open = {}      # (station, transaction id) -> meterStart
+        self._remote = {}    # station -> idTag of the last RemoteStartTransaction
+        self._pnc = set()    # stations with a Plug & Charge authorization in progress
+        self._energy_wh = 0.0
+        self._energy_histogram = np.zeros(len(ENERGY_BINS_KWH) - 1, np.int64)
+        self._sessions = self._completed = 0
+        self._auth = dict.fromkeys(AUTH_METHODS, 0)
+        self._statuses, self._error_codes = {}, {}
+
+    def feed_text(self, text):
+        """Account for a block of whole log lines"""
+        rows = _LINE.findall(text)
+        lines = text.count('\n') + (not text.endswith('\n'))
+        if lines > len(rows):
+            # Blank lines are not log lines, so neither they nor an empty block count as skipped
+            lines = len(_CONTENT_LINE.findall(text))
+        self._skipped += lines - len(rows)
+        if rows:
+            self._reduce(rows)
+
+    def feed_records(self, lines):
+        """Account for JSON Lines records {"timestamp", "station", "message": frame}"""
+        converted = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                frame = record.get('message', record.get('frame'))
+                if isinstance(frame, str):
+                    frame = json.loads(frame)
+                station = record.get('station') or record.get('chargeBoxId') or ''
+                converted.append(f"{record.get('timestamp') or record.get('time')} {station} "
+                                 f"{json.dumps(frame, separators=(',', ':'))}\n")
+            except (ValueError, TypeError, AttributeError):
+                self._skipped += 1
+        self.feed_text(''.join(converted))
+
+    def _stamps(self, stamps):
+        """Milliseconds since the epoch (UTC); unparseable stamps become _NAT"""
+        ms = _fixed_width_stamps(stamps)
+        if ms is not None:
+            return ms
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')  # NumPy warns while converting UTC offsets
+            try:
+                return np.array(stamps, dtype='datetime64[ms]').astype(np.int64)
+            except ValueError:
+                parsed = []
+                for stamp in stamps:
+                    try:
+                        parsed.append(np.datetime64(stamp, 'ms'))
+                    except ValueError:
+                        parsed.append(np.datetime64('NaT'))
+                return np.array(parsed, dtype='datetime64[ms]').astype(np.int64)
+
+    def _reduce(self, rows):
+        stamps, prefixes, kinds, message_ids, names, _ = zip(*rows)
+        stamps = self._stamps(stamps)
+        kinds = np.frombuffer(''.join(kinds).encode('ascii'), np.uint8) - ord('0')
+        actions = _interned(names, self._actions)
+        prefix_codes = _interned(prefixes, self._prefixes)
+        if len(self._prefixes) > len(self._station_of_prefix):
+            new = list(self._prefixes)[len(self._station_of_prefix):]
+            codes = [self._stations.setdefault(_station(prefix), len(self._stations)) for prefix in new]
+            self._station_of_prefix = np.concatenate([self._station_of_prefix, np.array(codes, np.int32)])
+        stations = self._station_of_prefix[prefix_codes]
+
+        valid = stamps != _NAT
+        if not valid.all():
+            self._skipped += int((~valid).sum())
+        calls = kinds == CALL
+        self._kind_counts += np.bincount(kinds[valid], minlength=CALLERROR + 1)
+        self._action_counts = _add(self._action_counts, np.bincount(actions[calls & valid]))
+        self._station_counts = _add(self._station_counts, np.bincount(stations[valid]))
+        self._aggregate_time(stamps[valid])
+
+        # Rows that move session state, visited in log order
+        parsed = [self._actions[name] for name in _PARSED_ACTIONS if name in self._actions]
+        starts = calls & (actions == self._actions.get('StartTransaction', -1))
+        awaited = {message_id for _, message_id in self._pending}
+        awaited.update(message_ids[i] for i in np.flatnonzero(starts))
+        interesting = (calls & np.isin(actions, parsed)) | (kinds == CALLERROR)
+        if awaited:
+            interesting[[i for i in np.flatnonzero(kinds == CALLRESULT).tolist() if message_ids[i] in awaited]] = True
+        names_by_code = list(self._actions)
+        energies = []
+        for i in np.flatnonzero(interesting & valid):
+            _, prefix, kind, message_id, name, rest = rows[i]
+            station = _station(prefix)
+            try:
+                if kind == '2':
+                    energy = self._call(station, message_id, names_by_code[actions[i]], _payload(rest))
+                    if energy is not None:
+                        energies.append(energy)
+                elif kind == '3':
+                    meter_start = self._pending.pop((station, message_id), None)
+                    transaction = _payload(rest).get('transactionId') if meter_start is not None else None
+                    if transaction is not None:
+                        self._open[(station, transaction)] = meter_start
+                else:
+                    _counted(self._error_codes, name or 'GenericError')
+            except (ValueError, TypeError, KeyError, IndexError, AttributeError):
+                pass  # a malformed payload still counts as a message
+        if energies:
+            energies = np.asarray(energies, dtype=np.float64)
+            self._energy_wh += energies.sum()
+            self._energy_histogram += np.histogram(energies / 1000, ENERGY_BINS_KWH)[0]
+            self._completed += len(energies)
+
+    def _aggregate_time(self, stamps):
+        if not len(stamps):
+            return
+        self._hourly += np.bincount((stamps // 3600000) % 24, minlength=24)
+        lo, hi = int(stamps.min()), int(stamps.max())
+        self._first = lo if self._first is None else min(self._first, lo)
+        self._last = hi if self._last is None else max(self._last, hi)
+        # Sparse: a clock-less charger stamping 1970 must not allocate every minute since then
+        minutes, counts = np.unique(stamps // 60000, return_counts=True)
+        self._per_minute.update(dict(zip(minutes.tolist(), counts.tolist())))
+
+    def _call(self, station, message_id, action, payload):
+        """Session bookkeeping for one call; returns the Wh of a completed session"""
+        if action == 'StartTransaction':
+            id_tag = payload.get('idTag', '')
+            if station in self._pnc:
+                self._pnc.discard(station)
+                method = 'Plug & Charge (ISO 15118)'
+            elif self._remote.get(station) == id_tag:
+                del self._remote[station]
+                method = 'Remote start (app)'
+            elif RFID_TAG.match(id_tag):
+                method = 'RFID'
+            else:
+                method = 'Other'
+            self._auth[method] += 1
+            self._sessions += 1
+            self._pending[(station, message_id)] = payload.get('meterStart', 0)
+            if len(self._pending) > MAX_PENDING:
+                del self._pending[next(iter(self._pending))]
+        elif action == 'StopTransaction':
+            meter_start = self._open.pop((station, payload.get('transactionId')), None)
+            if meter_start is not None:
+                return max(payload.get('meterStop', meter_start) - meter_start, 0)
+        elif action == 'StatusNotification':
+            _counted(self._statuses, payload.get('status', 'Unknown'))
+            error = payload.get('errorCode', 'NoError')
+            if error != 'NoError':
+                _counted(self._error_codes, error)
+        elif action == 'RemoteStartTransaction':
+            self._remote[station] = payload.get('idTag')
+        elif action == 'DataTransfer':
+            if payload.get('vendorId') == PNC_VENDOR_ID and payload.get('messageId') == 'Authorize':
+                self._pnc.add(station)
+        return None
+
+    def summary(self):
+        """The aggregates so far as a LogSummary"""
+        actions = {name: int(self._action_counts[i]) for name, i in self._actions.items()
+                   if i < len(self._action_counts) and self._action_counts[i]}
+        stations = {name: int(self._station_counts[i]) for name, i in self._stations.items()
+                    if i < len(self._station_counts) and self._station_counts[i]}
+        per_minute = np.fromiter(self._per_minute.values(), np.int64, len(self._per_minute))
+        # Minutes between the first and last message without any count as zero
+        idle = (self._last // 60000 - self._first // 60000 + 1 - len(per_minute)) if len(per_minute) else 0
+
+        def iso(ms):
+            return str(np.datetime64(ms, 'ms').astype('datetime64[s]')) if ms is not None else None
+
+        def by_count(counts, top=None):
+            return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top])
+
+        bins = ENERGY_BINS_KWH
+        labels = [f"{lo:g}-{hi:g} kWh" if hi != np.inf else f"{lo:g}+ kWh" for lo, hi in zip(bins, bins[1:])]
+        return LogSummary(
+            first=iso(self._first),
+            last=iso(self._last),
+            stations=len(stations),
+            messages=int(self._kind_counts.sum()),
+            calls=int(self._kind_counts[CALL]),
+            results=int(self._kind_counts[CALLRESULT]),
+            errors=int(self._kind_counts[CALLERROR]),
+            skipped_lines=self._skipped,
+            actions=by_count(actions),
+            busiest_stations=by_count({name or '(unknown)': n for name, n in stations.items()}, 5),
+            hourly_messages=[int(n) for n in self._hourly],
+            peak_per_minute=int(per_minute.max()) if len(per_minute) else 0,
+            median_per_minute=float(_median_with_zeros(per_minute, idle)),
+            sessions=self._sessions,
+            completed_sessions=self._completed,
+            auth_methods=dict(self._auth),
+            energy_kwh=round(self._energy_wh / 1000, 3),
+            energy_histogram={label: int(n) for label, n in zip(labels, self._energy_histogram)},
+            statuses=by_count(self._statuses),
+            error_codes=by_count(self._error_codes),
+        )
+
+
+def _open_log(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+
+def read_blocks(path, size=BLOCK_BYTES):
+    """Decoded blocks of whole lines from a log file, decompressing .gz"""
+    with _open_log(path) as f:
+        tail = b''
+        while True:
+            data = f.read(size)
+            if not data:
+                break
+            data = tail + data
+            cut = data.rfind(b'\n') + 1
+            if not cut:
+                tail = data
+                continue
+            tail = data[cut:]
+            yield data[:cut].decode('utf-8', errors='replace')
+        if tail:
+            yield tail.decode('utf-8', errors='replace')
+
+
+def summarize_logs(paths, block_bytes=BLOCK_BYTES):
+    """Stream every log file through one LogSummarizer"""
+    summarizer = LogSummarizer()
+    for path in paths:
+        for block in read_blocks(path, block_bytes):
+            if block.lstrip().startswith('{'):
+                summarizer.feed_records(block.splitlines())
+            else:
+                summarizer.feed_text(block)
+    return summarizer.summary()
+
+
+@lru_cache(maxsize=8)
+def _cached_summary(stamps):
+    return summarize_logs([path for path, _, _ in stamps])
+
+
+def cached_summary(paths):
+    """summarize_logs(), reused while the files keep their size and modification time"""
+    stamps = []
+    for path in paths:
+        st = os.stat(path)
+        stamps.append((os.path.abspath(path), st.st_size, st.st_mtime_ns))
+    return _cached_summary(tuple(stamps))
+
+
+def _bars(counts, width=BAR_WIDTH):
+    """Monospaced bar chart lines for {label: count}"""
+    top = max(counts.values(), default=0) or 1
+    label_width = max((len(label) for label in counts), default=0)
+    return '\n'.join(f"{label:>{label_width}} {'█' * round(width * n / top):<{width}} {n:,}"
+                     for label, n in counts.items())
+
+
+def _share(n, total):
+    return f"{n:,} ({n / total:.0%})" if total else f"{n:,}"
+
+
+def log_summary_slides(summary):
+    """Summary slides (slide IR) for a LogSummary"""
+    s = summary
+    if not s.messages:
+        return (Slide("OCPP 1.6 Log Summary", (
+            Section("No OCPP-J frames found", items=(Text(f"{s.skipped_lines:,} lines skipped", italic=True),)),
+        ), name='ocpp_log_summary'),)
+
+    average = s.energy_kwh / s.completed_sessions if s.completed_sessions else 0
+    overview = Slide("OCPP 1.6 Log Summary", (
+        Section("Observed Traffic:", items=tuple(Bullet(text) for text in (
+            f"{s.first} to {s.last} UTC",
+            f"{s.stations:,} charge points, {s.messages:,} OCPP-J messages",
+            f"{s.calls:,} calls, {s.results:,} results, {s.errors:,} errors",
+        ))),
+        Section("Charging Sessions:", 'SECONDARY_GREEN', tuple(Bullet(text, '✅') for text in (
+            f"{s.sessions:,} sessions started, {s.completed_sessions:,} completed",
+            f"{s.energy_kwh:,.1f} kWh delivered",
+            f"{average:.1f} kWh per completed session",
+        ))),
+    ), name='ocpp_log_summary')
+
+    auth = Slide("Authorization in the Field", (
+        Section("How Sessions Were Authorized:", items=tuple(
+            Bullet(f"{method}: {_share(n, s.sessions)}") for method, n in s.auth_methods.items())),
+        Section("Energy per Completed Session:", 'SECONDARY_GREEN', (Listing(_bars(s.energy_histogram)),)),
+        Section(items=(Text("Plug & Charge is counted from ISO 15118 DataTransfer authorizations "
+                            f"({PNC_VENDOR_ID})", size=12, italic=True),)),
+    ), name='ocpp_log_auth')
+
+    # Three-hour bars keep the chart and the load figures on one slide
+    hours = {f"{hour:02d}-{hour + 3:02d}h": sum(s.hourly_messages[hour:hour + 3]) for hour in range(0, 24, 3)}
+    top_actions = list(s.actions.items())[:3]
+    rate = Slide("OCPP Message Rate", (
+        Section("Messages by Time of Day (UTC):", items=(Listing(_bars(hours)),)),
+        Section("Load:", 'ACCENT_ORANGE', (
+            Bullet(f"Peak {s.peak_per_minute:,} messages/min, median {s.median_per_minute:g}/min"),
+            *(Bullet(f"{action}: {n:,}", level=SMALL_BULLET) for action, n in top_actions),
+        )),
+    ), name='ocpp_log_rate')
+
+    statuses = Slide("Connector Status Updates", (
+        Section("StatusNotification:", items=tuple(
+            Bullet(f"{status}: {n:,}") for status, n in s.statuses.items()) or (Bullet("none logged"),)),
+        Section("Errors:", 'ACCENT_ORANGE', tuple(
+            Bullet(f"{code}: {n:,}", '❌') for code, n in list(s.error_codes.items())[:6])
+            or (Bullet("none logged", '✅'),)),
+    ), name='ocpp_log_status')
+    return overview, auth, rate, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize OCPP 1.6 (OCPP-J) message logs")
+    parser.add_argument('logs', nargs='+', help="log files, optionally .gz")
+    parser.add_argument('--json', metavar='PATH', help="also write the summary as JSON ('-' for stdout)")
+    args = parser.parse_args()
+
+    summary = summarize_logs(args.logs)
+    if args.json == '-':
+        json.dump(asdict(summary), sys.stdout, indent=2)
+        print()
+        return
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(asdict(summary), f, indent=2)
+            f.write('\n')
+    print(f"📊 {summary.messages:,} messages from {summary.stations:,} charge points, "
+          f"{summary.first} to {summary.last}")
+    print(f"   {summary.sessions:,} sessions, {summary.energy_kwh:,.1f} kWh, "
+          f"peak {summary.peak_per_minute:,} msg/min, {summary.skipped_lines:,} lines skipped")
+    for method, n in summary.auth_methods.items():
+        print(f"   {method:<26} {n:,}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except (OSError, ValueError) as e:
+        print(f"❌ Error summarizing logs: {e}")
+        sys.exit(1)
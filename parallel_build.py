@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Parallel Deck Builder
+Renders slide IR to standalone slide XML parts across worker processes and
+assembles them into one package with the streaming writer, which numbers the
+slide parts and slide IDs and writes the presentation part and content types
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+from pptx.dml.color import RGBColor
+
+from slide_ir import render_deck
+from streaming_writer import StreamingDeckWriter, slide_fragment
+from template_cache import new_presentation
+from text_fit import split_overflowing
+
+# Chunks per worker: enough to balance uneven slides, few enough to amortize pickling
+CHUNKS_PER_WORKER = 4
+
+
+def _hex_colors(colors):
+    """RGBColor does not pickle; workers get the palette as hex strings"""
+    return {name: str(value) for name, value in vars(colors).items()}
+
+
+def _rgb_colors(colors):
+    return SimpleNamespace(**{name: RGBColor.from_string(value) for name, value in colors.items()})
+
+
+def _theme(colors, template):
+    return template, (colors.PRIMARY_BLUE, colors.TEXT_DARK)
+
+
+def _warm_worker(template, colors):
+    """Parse and theme the template once per worker (process pool initializer)"""
+    new_presentation(*_theme(_rgb_colors(colors), template))
+
+
+def render_fragments(slides, colors, template=None):
+    """Render IR slides on a scratch deck and return their (xml, relationships) fragments
+
+    Text that overflows is split onto "(cont.)" slides here, so one IR slide
+    may give several fragments. Runs in worker processes; colors are hex strings.
+    """
+    colors = _rgb_colors(colors)
+    prs = new_presentation(*_theme(colors, template))
+    render_deck(prs, slides, colors)
+    split_overflowing(prs)
+    return [slide_fragment(slide) for slide in prs.slides]
+
+
+def _chunks(slides, jobs, chunk_size=None):
+    """Contiguous runs of slides, so fragments come back in deck order"""
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(slides) // (jobs * CHUNKS_PER_WORKER)))
+    return [slides[i:i + chunk_size] for i in range(0, len(slides), chunk_size)]
+
+
+def build_parallel(slides, colors, target, jobs=None, chunk_size=None, template=None, reproducible=False):
+    """Render slides across worker processes and write the merged deck to target
+
+    target is anything open_output() accepts. Returns the number of slides
+    written, including continuation slides.
+    """
+    slides = tuple(slides)
+    jobs = jobs or os.cpu_count() or 1
+    palette = _hex_colors(colors)
+    chunks = _chunks(slides, jobs, chunk_size)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks) or 1), initializer=_warm_worker,
+                             initargs=(template, palette)) as pool:
+        with StreamingDeckWriter(target, *_theme(colors, template), reproducible=reproducible) as writer:
+            # map() yields in submission order, so merging overlaps rendering
+            for fragments in pool.map(render_fragments, chunks, [palette] * len(chunks),
+                                      [template] * len(chunks)):
+                for xml, relationships in fragments:
+                    writer.add_slide_xml(xml, relationships)
+            return writer.slide_count
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Slide Intermediate Representation
+Compact, immutable records describing slide content (Slide -> Section -> Bullet,
+Text, Listing, Diagram, Chart, Table) and the renderer that turns them into
+python-pptx slides. IR is plain data: cheap to hash, pickle and ship to worker
+processes
+"""
+
+import copy
+import hashlib
+import pickle
+import weakref
+from dataclasses import dataclass, replace
+from functools import lru_cache
+
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.oxml.xmlchemy import OxmlElement
+from pptx.parts.slide import SlidePart
+from pptx.text.text import _Paragraph
+from pptx.util import Inches, Pt
+
+from ascii_diagrams import box_diagram, draw_box_diagram
+from chart_parts import AREA, COLUMN, LINE, XY, add_chart
+from deck_theme import BULLET, LISTING
+from diagrams import SequenceDiagram, draw_diagram, draw_sequence, parse_diagram
+from table_parts import add_table
+from text_fit import level_styles, paragraph_height
+
+TITLE_LAYOUT = 0
+CONTENT_LAYOUT = 1
+
+MERMAID = 'mermaid'
+BOX = 'box'
+
+BOX_DIAGRAM_ROW = Inches(0.3)
+BOX_DIAGRAM_MAX_HEIGHT = Inches(2.6)
+CHART_HEIGHT = Inches(2.5)
+# Slide partnames in use per presentation part, see free_slide_partname()
+_slide_partnames = weakref.WeakKeyDictionary()
+
+# Colors are theme color names (SECONDARY_GREEN, ...) resolved at render time,
+# so one IR renders in every variant's palette
+
+
+@dataclass(frozen=True, slots=True)
+class Bullet:
+    """One bullet paragraph; the marker is part of the text, not the theme"""
+    text: str
+    marker: str = '•'
+    level: int = BULLET
+
+
+@dataclass(frozen=True, slots=True)
+class Text:
+    """A plain paragraph at the heading level with explicit run overrides"""
+    text: str
+    size: int = None
+    color: str = None
+    bold: bool = None
+    italic: bool = None
+
+
+@dataclass(frozen=True, slots=True)
+class Listing:
+    """Monospaced text block (LISTING or DIAGRAM level)"""
+    text: str
+    level: int = LISTING
+
+
+@dataclass(frozen=True, slots=True)
+class Diagram:
+    """A diagram drawn as native shapes: Mermaid flowchart or box-drawing source"""
+    kind: str
+    source: str
+
+
+@dataclass(frozen=True, slots=True)
+class Chart:
+    """A native chart (LINE, COLUMN, AREA or XY): x values or categories shared by
+    every series of (name, color, y values); height in inches, CHART_HEIGHT if unset"""
+    x: tuple
+    series: tuple
+    x_title: str = None
+    y_title: str = None
+    y_format: str = '0%'
+    kind: str = XY
+    height: float = None
+
+
+@dataclass(frozen=True, slots=True)
+class Table:
+    """A native table in the deck's table style: a header row over rows of cells,
+    first column bold; widths are relative column weights, equal if unset"""
+    header: tuple
+    rows: tuple
+    widths: tuple = None
+    size: int = 12
+
+
+@dataclass(frozen=True, slots=True)
+class Section:
+    """An optional heading paragraph followed by its items"""
+    heading: str = None
+    color: str = None
+    items: tuple = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Slide:
+    """One slide: a title layout (title/subtitle) or a content layout (sections)"""
+    title: str
+    sections: tuple = ()
+    layout: int = CONTENT_LAYOUT
+    subtitle: str = None
+    title_size: int = None
+    subtitle_size: int = None
+    name: str = None  # short name for profiling and selection
+
+
+def serialize(slides):
+    """Pickled IR, suitable for worker processes and caches"""
+    return pickle.dumps(slides, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def digest(slides):
+    """SHA-256 of the serialized IR; equal content gives equal digests"""
+    return hashlib.sha256(serialize(slides)).hexdigest()
+
+
+@lru_cache(maxsize=64)
+def _mermaid_graph(source):
+    return parse_diagram(source)
+
+
+def _add_mermaid(prs, slide, content, source, colors):
+    """Shrink the content placeholder to its heading and draw a Mermaid diagram below it"""
+    left, top, width = content.left, content.top, content.width
+    content.left, content.top, content.width, content.height = left, top, width, Inches(0.6)
+    diagram_top = top + Inches(0.7)
+    diagram = _mermaid_graph(source)
+    draw = draw_sequence if isinstance(diagram, SequenceDiagram) else draw_diagram
+    draw(slide, diagram, left, diagram_top, width, prs.slide_height - diagram_top - Inches(0.3),
+         fill=colors.LIGHT_BLUE, line=colors.PRIMARY_BLUE, text=colors.TEXT_DARK)
+
+
+def _add_box_diagram(slide, content, source, colors):
+    """Draw a box-drawing diagram as shapes under the placeholder's heading and reserve its height"""
+    diagram = box_diagram(source)
+    height = min(BOX_DIAGRAM_ROW * diagram.rows, BOX_DIAGRAM_MAX_HEIGHT)
+    draw_box_diagram(slide, diagram, content.left, content.top + Inches(0.5), content.width, height,
+                     fill=colors.LIGHT_BLUE, line=colors.PRIMARY_BLUE, text=colors.TEXT_DARK)
+    # An empty paragraph spaced to the diagram's height keeps the text below it
+    p = content.text_frame.add_paragraph()
+    p.space_before = height - Inches(0.1)
+
+
+def _add_chart(slide, content, item, colors):
+    """Draw a Chart under the placeholder's heading and reserve its height"""
+    height = Inches(item.height) if item.height else CHART_HEIGHT
+    series = [(name, getattr(colors, color), values) for name, color, values in item.series]
+    add_chart(slide, item.kind, item.x, series, content.left, content.top + Inches(0.5), content.width, height,
+              item.x_title, item.y_title, item.y_format)
+    p = content.text_frame.add_paragraph()
+    p.space_before = height - Inches(0.1)
+
+
+def _add_table(prs, slide, content, item):
+    """Draw a Table below the paragraphs placed so far and reserve its height"""
+    text = content.text_frame
+    width = content.width - text.margin_left - text.margin_right
+    styles = level_styles(prs)
+    used = sum(paragraph_height(p._p, width, styles, first=n == 0) for n, p in enumerate(text.paragraphs))
+    top = content.top + text.margin_top + Pt(used) + Inches(0.1)
+    _, height = add_table(slide, item.header, item.rows, content.left + text.margin_left, top, width,
+                          item.widths, item.size)
+    p = text.add_paragraph()
+    p.space_before = height - Inches(0.1)
+
+
+def _paragraph_text(item):
+    if isinstance(item, Section):
+        return item.heading
+    if isinstance(item, Bullet):
+        return f"{item.marker} {item.text}"
+    return item.text
+
+
+def _fill_paragraph(p, item, colors):
+    """Set the style and text of one paragraph from a Section heading, Bullet, Text or Listing"""
+    # Style first: a:pPr added after a leading line break would land behind the a:br
+    if isinstance(item, Section):
+        if item.color:
+            p.font.color.rgb = getattr(colors, item.color)
+    elif isinstance(item, Text):
+        if item.bold is not None:
+            p.font.bold = item.bold
+        if item.size:
+            p.font.size = Pt(item.size)
+        if item.color:
+            p.font.color.rgb = getattr(colors, item.color)
+        if item.italic is not None:
+            p.font.italic = item.italic
+    else:
+        p.level = item.level
+    p.text = _paragraph_text(item)
+
+
+def free_slide_partname(prs):
+    """Reserve the first unused slide partname from slide{count + 1}.xml up
+
+    python-pptx names a new slide slide{count + 1}.xml without checking, which
+    collides in a loaded or spliced deck with gaps in its numbering. The names
+    in use are rescanned when their number differs from the slide count, which
+    catches slides added elsewhere; code that drops or renames slide parts
+    calls forget_slide_partnames(), since an add and a drop leave the count as is.
+    """
+    sld_id_lst = prs.slides._sldIdLst
+    names = _slide_partnames.get(prs.part)
+    if names is None or len(names) != len(sld_id_lst):
+        rels = prs.part.rels
+        names = _slide_partnames[prs.part] = {rels[sld_id.rId].target_part.partname for sld_id in sld_id_lst}
+    number = len(sld_id_lst) + 1
+    while f"/ppt/slides/slide{number}.xml" in names:
+        number += 1
+    partname = PackURI(f"/ppt/slides/slide{number}.xml")
+    names.add(partname)
+    return partname
+
+
+def forget_slide_partnames(prs):
+    """Make free_slide_partname() rescan prs after slides were dropped or renamed"""
+    _slide_partnames.pop(prs.part, None)
+
+
+def add_slide(prs, layout):
+    """prs.slides.add_slide() on a layout index, under a partname no other slide uses"""
+    partname = free_slide_partname(prs)
+    slide = prs.slides.add_slide(prs.slide_layouts[layout])
+    slide.part.partname = partname
+    return slide
+
+
+def _render_title_slide(prs, ir):
+    slide = add_slide(prs, ir.layout)
+    title = slide.shapes.title
+    subtitle = slide.placeholders[1]
+    title.text = ir.title
+    subtitle.text = ir.subtitle or ''
+    if ir.title_size:
+        title.text_frame.paragraphs[0].font.size = Pt(ir.title_size)
+    if ir.subtitle_size:
+        subtitle.text_frame.paragraphs[0].font.size = Pt(ir.subtitle_size)
+    return slide
+
+
+def render_slide(prs, ir, colors):
+    """Append the slide described by ir; colors is the variant's theme namespace"""
+    if ir.layout == TITLE_LAYOUT:
+        return _render_title_slide(prs, ir)
+
+    slide = add_slide(prs, ir.layout)
+    slide.shapes.title.text = ir.title
+    content = slide.placeholders[1]
+    content_text = content.text_frame
+    paragraphs = iter([content_text.paragraphs[0]])
+
+    def next_paragraph():
+        return next(paragraphs, None) or content_text.add_paragraph()
+
+    for section in ir.sections:
+        if section.heading is not None:
+            _fill_paragraph(next_paragraph(), section, colors)
+        for item in section.items:
+            if isinstance(item, (Bullet, Text, Listing)):
+                _fill_paragraph(next_paragraph(), item, colors)
+            elif isinstance(item, Diagram):
+                if item.kind == MERMAID:
+                    _add_mermaid(prs, slide, content, item.source, colors)
+                elif item.kind == BOX:
+                    _add_box_diagram(slide, content, item.source, colors)
+                else:
+                    raise ValueError(f"unknown diagram kind {item.kind!r}")
+            elif isinstance(item, Chart):
+                _add_chart(slide, content, item, colors)
+            elif isinstance(item, Table):
+                _add_table(prs, slide, content, item)
+            else:
+                raise TypeError(f"unsupported slide item {type(item).__name__}")
+    return slide
+
+
+class PrototypeRenderer:
+    """Renders IR like render_slide(), stamping text slides out of prototype XML
+
+    The first slide of each layout is built through python-pptx and kept as a
+    prototype, as is one paragraph per distinct style (heading color, bullet
+    level, run overrides). Later slides are deep copies of the prototype with
+    copied paragraphs and substituted text, skipping placeholder cloning,
+    relationship scans and per-attribute setters. Slides with diagrams,
+    charts or tables and title slides go through render_slide(). Output is identical to
+    render_slide(); use one renderer per batch of slides appended to prs.
+    """
+
+    def __init__(self, prs, colors):
+        self.prs = prs
+        self.colors = colors
+        self._slides = {}      # layout index -> (slide element, layout part, title and content positions)
+        self._paragraphs = {}  # text-blanked item -> styled, empty a:p
+        sld_ids = self.prs.slides._sldIdLst
+        self._next_id = max((int(sld_id.id) for sld_id in sld_ids), default=255) + 1
+
+    def render(self, ir):
+        """Append the slide described by ir and return it"""
+        if ir.layout == TITLE_LAYOUT or any(isinstance(item, (Diagram, Chart, Table))
+                                            for section in ir.sections for item in section.items):
+            slide = render_slide(self.prs, ir, self.colors)
+            self._next_id = max(self._next_id, int(self.prs.slides._sldIdLst[-1].id) + 1)
+            return slide
+
+        slide, title, body = self._stamp(ir.layout)
+        title.clear_content()
+        for line in ir.title.split('\n'):
+            title.add_p().append_text(line)
+        paragraphs = [self._paragraph(item)
+                      for section in ir.sections
+                      for item in ((section,) if section.heading is not None else ()) + section.items]
+        if paragraphs:
+            body.clear_content()
+            for p in paragraphs:
+                body.append(p)
+        return slide
+
+    def _stamp(self, layout):
+        """A new slide on layout with (title, content) txBody elements to fill"""
+        prototype = self._slides.get(layout)
+        if prototype is None:
+            slide = add_slide(self.prs, layout)
+            self._next_id = max(self._next_id, int(self.prs.slides._sldIdLst[-1].id) + 1)
+            tree = slide._element.cSld.spTree
+            indices = [tree.index(shape._element) for shape in (slide.shapes.title, slide.placeholders[1])]
+            self._slides[layout] = (copy.deepcopy(slide._element), slide.part.part_related_by(RT.SLIDE_LAYOUT),
+                                    indices)
+            return slide, *(tree[i].txBody for i in indices)
+
+        element, layout_part, indices = prototype
+        prs_part = self.prs.part
+        sld_id_lst = self.prs.slides._sldIdLst
+        partname = free_slide_partname(self.prs)
+        slide_part = SlidePart(partname, CT.PML_SLIDE, prs_part.package, copy.deepcopy(element))
+        slide_part.relate_to(layout_part, RT.SLIDE_LAYOUT)
+        # A new part cannot already be related, so skip relate_to()'s search
+        rid = prs_part.rels._add_relationship(RT.SLIDE, slide_part)
+        sld_id_lst._add_sldId(id=self._next_id, rId=rid)
+        self._next_id += 1
+        tree = slide_part._element.cSld.spTree
+        return slide_part.slide, *(tree[i].txBody for i in indices)
+
+    def _paragraph(self, item):
+        """A copy of the item's styled paragraph prototype holding its text"""
+        key = replace(item, heading='', items=()) if isinstance(item, Section) else replace(item, text='')
+        prototype = self._paragraphs.get(key)
+        if prototype is None:
+            prototype = self._paragraphs[key] = _styled_paragraph(key, self.colors)
+        p = copy.deepcopy(prototype)
+        p.append_text(_paragraph_text(item))
+        return p
+
+
+def _styled_paragraph(item, colors):
+    """An a:p carrying item's paragraph and run properties but no text"""
+    p = _Paragraph(OxmlElement('a:p'), None)
+    _fill_paragraph(p, item, colors)
+    p.clear()
+    return p._element
+
+
+def render_deck(prs, slides, colors):
+    """Append every slide of an IR deck"""
+    renderer = PrototypeRenderer(prs, colors)
+    for ir in slides:
+        renderer.render(ir)
+    return prs
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Smart Charging Load Model
+Aggregate load of an overnight EV fleet at 15-minute resolution, charging at
+full power on arrival versus following ISO 15118 charge schedules that spread
+each vehicle's energy over its stay, vectorized with NumPy
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+
+FLEET = 200
+SEED = 15118
+SLOT_MINUTES = 15
+# The profile runs noon to noon, so overnight stays do not wrap around midnight
+DAY_START = 12
+CHARGER_KW = 11.0
+ARRIVAL_H = (18.5, 1.5)       # mean and standard deviation, hour of day
+DEPARTURE_H = (7.5, 1.0)
+ENERGY_KWH = (12.0, 25.0)     # median and p90 per stay
+# z-score of the 90th percentile of a standard normal
+_Z90 = 1.2815515655446004
+
+
+@dataclass
+class LoadProfile:
+    """Fleet load in kW per slot, both ways of charging the same energy"""
+    vehicles: int
+    labels: list             # "HH:MM" slot starts
+    unmanaged_kw: np.ndarray
+    scheduled_kw: np.ndarray
+
+    @property
+    def peak_reduction(self):
+        return 1 - self.scheduled_kw.max() / self.unmanaged_kw.max()
+
+
+def _slot_energy(start, end, power, edges):
+    """kWh each slot receives from constant power over [start, end) hours, summed over vehicles"""
+    # Energy delivered by each edge, as a (vehicles x edges) ramp; slot energy is its difference
+    delivered = power[:, None] * np.clip(edges[None, :] - start[:, None], 0, (end - start)[:, None])
+    return np.diff(delivered.sum(axis=0))
+
+
+def load_profile(vehicles=FLEET, seed=SEED, charger_kw=CHARGER_KW):
+    """Simulate one night of a fleet charging unmanaged and to ISO 15118 schedules"""
+    rng = np.random.default_rng(seed)
+    slots = 24 * 60 // SLOT_MINUTES
+    edges = np.linspace(0, 24, slots + 1)
+    arrival = np.clip(rng.normal(*ARRIVAL_H, vehicles), DAY_START, 23.75) - DAY_START
+    departure = np.clip(rng.normal(*DEPARTURE_H, vehicles) + 24 - DAY_START, arrival + 1, 24)
+    median, p90 = ENERGY_KWH
+    energy = rng.lognormal(np.log(median), np.log(p90 / median) / _Z90, vehicles)
+    energy = np.minimum(energy, charger_kw * (departure - arrival))
+    full = np.full(vehicles, charger_kw)
+    slot_hours = SLOT_MINUTES / 60
+    unmanaged = _slot_energy(arrival, arrival + energy / charger_kw, full, edges) / slot_hours
+    scheduled = _slot_energy(arrival, departure, energy / (departure - arrival), edges) / slot_hours
+    labels = [f"{(DAY_START + int(h)) % 24:02d}:{round(h % 1 * 60):02d}" for h in edges[:-1]]
+    return LoadProfile(vehicles, labels, unmanaged, scheduled)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fleet load over a day, unmanaged vs ISO 15118 schedules")
+    parser.add_argument('--vehicles', type=int, default=FLEET)
+    parser.add_argument('--charger-kw', type=float, default=CHARGER_KW)
+    args = parser.parse_args()
+    if args.vehicles < 1 or args.charger_kw <= 0:
+        raise ValueError("--vehicles and --charger-kw must be positive")
+    profile = load_profile(args.vehicles, charger_kw=args.charger_kw)
+    print(f"📊 {profile.vehicles} EVs: peak {profile.unmanaged_kw.max():.0f} kW unmanaged, "
+          f"{profile.scheduled_kw.max():.0f} kW scheduled ({profile.peak_reduction:.0%} lower)")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ValueError as e:
+        print(f"❌ Error modelling fleet load: {e}")
+        sys.exit(1)
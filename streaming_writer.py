@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Streaming Deck Writer
+Writes very large decks slide by slide: each finished slide part goes straight
+into the zip and is released, so memory stays bounded by one slide instead of
+the whole deck
+"""
+
+import contextlib
+import hashlib
+import io
+import posixpath
+import time
+import zipfile
+
+from lxml import etree
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+
+from deck_io import (CONTENT_TYPES, _part_order, _zip_date_time, canonicalize_package, normalize_xml, open_output,
+                     stamp_core_properties)
+from template_cache import new_presentation
+
+PRESENTATION = 'ppt/presentation.xml'
+PRESENTATION_RELS = 'ppt/_rels/presentation.xml.rels'
+SLIDE_DIR = 'ppt/slides'
+FIRST_SLIDE_ID = 256
+RELS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+CT_NS = 'http://schemas.openxmlformats.org/package/2006/content-types'
+
+# p:presentation children that precede p:sldIdLst
+_BEFORE_SLIDE_LIST = ('p:sldMasterIdLst', 'p:notesMasterIdLst', 'p:handoutMasterIdLst')
+
+
+def _rels_path(name):
+    directory, base = posixpath.split(name)
+    return posixpath.join(directory, '_rels', base + '.rels')
+
+
+def _rels_xml(relationships):
+    """Serialize (rId, reltype, target, external) tuples as a .rels part"""
+    root = etree.Element(f'{{{RELS_NS}}}Relationships', nsmap={None: RELS_NS})
+    for rid, reltype, target, external in relationships:
+        rel = etree.SubElement(root, f'{{{RELS_NS}}}Relationship', Id=rid, Type=reltype, Target=target)
+        if external:
+            rel.set('TargetMode', 'External')
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+
+def _inline_part(part):
+    """(content type, part name, blob, relationships) of a slide's own part and the parts below it"""
+    relationships = []
+    for rel in part.rels.values():
+        if rel.is_external:
+            relationships.append((rel.rId, rel.reltype, rel.target_ref, True))
+        else:
+            relationships.append((rel.rId, rel.reltype, _inline_part(rel.target_part), False))
+    return part.content_type, str(part.partname), part.blob, tuple(relationships)
+
+
+def slide_fragment(slide):
+    """A rendered slide as picklable (xml, relationships) for StreamingDeckWriter.add_slide_xml()
+
+    Relationships are (rId, reltype, target, external) tuples; layout targets
+    stay relative references and the slide's own parts (pictures, charts and
+    their workbooks) travel inline as (content type, part name, blob,
+    relationships).
+    """
+    relationships = []
+    for rel in slide.part.rels.values():
+        if rel.is_external or rel.reltype == RT.SLIDE_LAYOUT:
+            relationships.append((rel.rId, rel.reltype, rel.target_ref, rel.is_external))
+        elif rel.reltype == RT.NOTES_SLIDE:
+            raise ValueError("streamed slides cannot have notes")
+        else:
+            relationships.append((rel.rId, rel.reltype, _inline_part(rel.target_part), False))
+    return slide.part.blob, relationships
+
+
+class StreamingDeckWriter:
+    """Build a deck one slide at a time without keeping finished slides in memory
+
+    Slides are created on a scratch presentation from the template cache, so the
+    usual python-pptx API works on the slide returned by add_slide(); it is
+    written out when the next slide is added or the writer is closed. Slides may
+    carry pictures, charts and other parts of their own (deduplicated by
+    content), but not notes.
+    """
+
+    def __init__(self, target, template=None, theme=None, reproducible=False):
+        self.reproducible = reproducible
+        self._date_time = _zip_date_time() if reproducible else time.localtime()[:6]
+        self._prs = new_presentation(template, theme)
+        if len(self._prs.slides):
+            raise ValueError("streaming templates must not contain slides")
+        if reproducible:
+            stamp_core_properties(self._prs)
+
+        self._exit_stack = contextlib.ExitStack()
+        stream = self._exit_stack.enter_context(open_output(target))
+        self._zip = self._exit_stack.enter_context(zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED))
+        self._slide = None
+        self._slide_count = 0
+        self._names = set()
+        self._extra_parts = {}  # (content type, sha1) -> part name
+        self._extra_types = {}  # part name -> content type
+        self._closed = False
+        self._write_template()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._exit_stack.close()
+        return False
+
+    @property
+    def slide_layouts(self):
+        return self._prs.slide_layouts
+
+    @property
+    def slide_count(self):
+        """Slides added so far, including the one still being built"""
+        return self._slide_count + (self._slide is not None)
+
+    def _write(self, name, blob):
+        if self.reproducible and name.endswith('.xlsx'):
+            blob = canonicalize_package(blob, embedded=True)
+        elif self.reproducible and (name.endswith('.xml') or name.endswith('.rels')):
+            blob = normalize_xml(name, blob)
+        info = zipfile.ZipInfo(name, date_time=self._date_time)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.create_system = 0
+        info.external_attr = 0o644 << 16
+        self._zip.writestr(info, blob, compresslevel=6)
+        self._names.add(name)
+
+    def _write_template(self):
+        """Copy every template part except the ones close() completes"""
+        buffer = io.BytesIO()
+        self._prs.save(buffer)
+        deferred = (CONTENT_TYPES, PRESENTATION, PRESENTATION_RELS)
+        with zipfile.ZipFile(buffer) as template:
+            self._deferred = {name: template.read(name) for name in deferred}
+            for name in sorted(template.namelist(), key=_part_order):
+                if name not in self._deferred:
+                    self._write(name, template.read(name))
+        self._names.update(deferred)
+
+    def add_slide(self, layout):
+        """Finish the current slide and start a new one on layout (object or index)"""
+        if self._closed:
+            raise ValueError("writer is closed")
+        self._flush_slide()
+        if isinstance(layout, int):
+            layout = self._prs.slide_layouts[layout]
+        self._slide = self._prs.slides.add_slide(layout)
+        return self._slide
+
+    def _extra_part_name(self, content_type, partname, blob, relationships=()):
+        """Write a slide's picture/media/chart part and the parts below it once; returns its name"""
+        # Parts below first, so equal parts with equal children share one name
+        children = [(rid, reltype, target if external else self._extra_part_name(*target), external)
+                    for rid, reltype, target, external in relationships]
+        key = (content_type, hashlib.sha1(blob).hexdigest(), tuple(children))
+        name = self._extra_parts.get(key)
+        if name is None:
+            # The scratch package reuses part names once a slide is dropped
+            name = partname.lstrip('/')
+            stem, ext = posixpath.splitext(name)
+            stem = stem.rstrip('0123456789')
+            n = 1
+            while name in self._names:
+                n += 1
+                name = f"{stem}{n}{ext}"
+            self._write(name, blob)
+            if children:
+                directory = posixpath.dirname(name)
+                self._write(_rels_path(name), _rels_xml(
+                    (rid, reltype, target if external else posixpath.relpath(target, directory), external)
+                    for rid, reltype, target, external in children))
+            self._extra_parts[key] = name
+            self._extra_types[name] = content_type
+        return name
+
+    def add_slide_xml(self, xml, relationships):
+        """Append a slide rendered elsewhere, as returned by slide_fragment()
+
+        The slide must have been rendered on the same template, so its layout
+        relationships resolve against this package.
+        """
+        if self._closed:
+            raise ValueError("writer is closed")
+        self._flush_slide()
+        self._write_slide(xml, relationships)
+
+    def _write_slide(self, xml, relationships):
+        self._slide_count += 1
+        name = f"{SLIDE_DIR}/slide{self._slide_count}.xml"
+        resolved = []
+        for rid, reltype, target, external in relationships:
+            if isinstance(target, tuple):
+                target = posixpath.relpath(self._extra_part_name(*target), SLIDE_DIR)
+            elif not external and posixpath.normpath(posixpath.join(SLIDE_DIR, target)) not in self._names:
+                raise ValueError(f"slide {self._slide_count} refers to {target}, which the template lacks")
+            resolved.append((rid, reltype, target, external))
+        self._write(name, xml)
+        self._write(_rels_path(name), _rels_xml(resolved))
+
+    def _flush_slide(self):
+        slide = self._slide
+        if slide is None:
+            return
+        self._write_slide(*slide_fragment(slide))
+
+        # Drop the slide from the scratch deck so its tree can be freed
+        sld_id_lst = self._prs.slides._sldIdLst
+        sld_id = sld_id_lst[0]
+        self._prs.part.drop_rel(sld_id.rId)
+        sld_id_lst.remove(sld_id)
+        self._slide = None
+
+    def _presentation_xml(self, rids):
+        root = etree.fromstring(self._deferred[PRESENTATION])
+        old = root.find(qn('p:sldIdLst'))
+        if old is not None:
+            root.remove(old)
+        sld_id_lst = root.makeelement(qn('p:sldIdLst'), {})
+        for i, rid in enumerate(rids):
+            etree.SubElement(sld_id_lst, qn('p:sldId'), {'id': str(FIRST_SLIDE_ID + i), qn('r:id'): rid})
+        anchor = [root.find(qn(tag)) for tag in _BEFORE_SLIDE_LIST]
+        anchor = [e for e in anchor if e is not None][-1]
+        anchor.addnext(sld_id_lst)
+        return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+    def _presentation_rels(self):
+        root = etree.fromstring(self._deferred[PRESENTATION_RELS])
+        used = [int(rel.get('Id')[3:]) for rel in root if rel.get('Id', '').startswith('rId')
+                and rel.get('Id')[3:].isdigit()]
+        first = max(used, default=0) + 1
+        rids = []
+        for n in range(1, self._slide_count + 1):
+            rid = f"rId{first + n - 1}"
+            etree.SubElement(root, f'{{{RELS_NS}}}Relationship',
+                             Id=rid, Type=RT.SLIDE, Target=f"slides/slide{n}.xml")
+            rids.append(rid)
+        return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True), rids
+
+    def _content_types(self):
+        root = etree.fromstring(self._deferred[CONTENT_TYPES])
+        defaults = {e.get('Extension').lower() for e in root.findall(f'{{{CT_NS}}}Default')}
+        for n in range(1, self._slide_count + 1):
+            etree.SubElement(root, f'{{{CT_NS}}}Override',
+                             PartName=f"/{SLIDE_DIR}/slide{n}.xml", ContentType=CT.PML_SLIDE)
+        for name, content_type in self._extra_types.items():
+            ext = posixpath.splitext(name)[1].lstrip('.').lower()
+            if content_type.startswith('image/') and ext not in ('xml', 'rels'):
+                if ext not in defaults:
+                    etree.SubElement(root, f'{{{CT_NS}}}Default', Extension=ext, ContentType=content_type)
+                    defaults.add(ext)
+            else:
+                etree.SubElement(root, f'{{{CT_NS}}}Override', PartName='/' + name, ContentType=content_type)
+        return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+    def close(self):
+        """Write the last slide, presentation.xml, its rels and the content types"""
+        if self._closed:
+            return
+        self._flush_slide()
+        rels, rids = self._presentation_rels()
+        self._write(PRESENTATION_RELS, rels)
+        self._write(PRESENTATION, self._presentation_xml(rids))
+        self._write(CONTENT_TYPES, self._content_types())
+        self._closed = True
+        self._exit_stack.close()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Native Table Parts
+Adds tables as one generated a:tbl per table instead of python-pptx's
+add_table() followed by per-cell setters: cells carry only their text and font
+size, fills, borders and bold header/first column come from the deck's shared
+table style, and row heights are measured up front so the slide can reserve them
+"""
+
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.util import Emu, Pt
+
+from deck_theme import TABLE_STYLE_ID
+from text_fit import LINE_HEIGHT, line_count
+
+# PowerPoint's default cell insets
+CELL_MARGIN_X = Emu(91440)
+CELL_MARGIN_Y = Emu(45720)
+
+_FRAME_XML = (
+    '<p:graphicFrame {nsdecls}>'
+    '<p:nvGraphicFramePr><p:cNvPr id="{shape_id}" name="{name}"/>'
+    '<p:cNvGraphicFramePr><a:graphicFrameLocks noGrp="1"/></p:cNvGraphicFramePr><p:nvPr/></p:nvGraphicFramePr>'
+    '<p:xfrm><a:off x="{left}" y="{top}"/><a:ext cx="{width}" cy="{height}"/></p:xfrm>'
+    '<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/table">'
+    '<a:tbl><a:tblPr firstRow="1" firstCol="1" bandRow="1"><a:tableStyleId>{style_id}</a:tableStyleId></a:tblPr>'
+    '<a:tblGrid>{grid}</a:tblGrid>{rows}</a:tbl></a:graphicData></a:graphic></p:graphicFrame>'
+)
+
+
+@lru_cache(maxsize=16)
+def _cell_xml(size):
+    """(cell with text, empty cell) templates at a font size; the style supplies everything else"""
+    rpr = f'lang="en-US" sz="{int(size * 100)}"'
+    return (f'<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p><a:r><a:rPr {rpr}/><a:t>{{}}</a:t></a:r></a:p>'
+            f'</a:txBody><a:tcPr/></a:tc>',
+            f'<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p><a:endParaRPr {rpr}/></a:p></a:txBody><a:tcPr/></a:tc>')
+
+
+def column_widths(width, count, weights=None):
+    """EMU width per column, splitting width by weights (equal when None); the last column takes the rounding"""
+    weights = weights or (1,) * count
+    widths = [int(width * weight / sum(weights)) for weight in weights]
+    widths[-1] += width - sum(widths)
+    return widths
+
+
+def row_heights(header, rows, widths, size):
+    """EMU height per row, header first, from the wrapped line count of its tallest cell"""
+    inner = [Emu(w - 2 * CELL_MARGIN_X).pt for w in widths]
+    pitch = size * LINE_HEIGHT
+    heights = []
+    for index, row in enumerate((header, *rows)):
+        # Header row and first column are bold in the table style
+        lines = max(line_count(str(text), w, size, bold=index == 0 or column == 0) if text != '' else 1
+                    for column, (text, w) in enumerate(zip(row, inner)))
+        heights.append(Pt(lines * pitch) + 2 * CELL_MARGIN_Y)
+    return heights
+
+
+def table_element(shape_id, header, rows, left, top, widths, heights, size):
+    """p:graphicFrame of a styled table, generated as one string"""
+    cell, empty = _cell_xml(size)
+    grid = ''.join(f'<a:gridCol w="{w}"/>' for w in widths)
+    body = ''.join(
+        f'<a:tr h="{h}">' + ''.join(cell.format(escape(str(text))) if text != '' else empty for text in row) + '</a:tr>'
+        for row, h in zip((header, *rows), heights)
+    )
+    return parse_xml(_FRAME_XML.format(
+        nsdecls=nsdecls('a', 'p'), shape_id=shape_id, name=f"Table {shape_id - 1}", left=left, top=top,
+        width=sum(widths), height=sum(heights), style_id=TABLE_STYLE_ID, grid=grid, rows=body))
+
+
+def add_table(slide, header, rows, left, top, width, weights=None, size=12):
+    """Add a table of rows under header to slide; returns (graphic frame shape, height in EMU)
+
+    Rows shorter than the header are padded with empty cells.
+    """
+    header = tuple(header)
+    rows = [tuple(row) + ('',) * (len(header) - len(row)) for row in rows]
+    widths = column_widths(width, len(header), weights)
+    heights = row_heights(header, rows, widths, size)
+    shapes = slide.shapes
+    element = table_element(shapes._next_shape_id, header, rows, left, top, widths, heights, size)
+    shapes._spTree.insert_element_before(element, 'p:extLst')
+    return shapes._shape_factory(element), sum(heights)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Template Cache
+Parses a template package once per process and hands out deep copies of it,
+so batch jobs do not re-read and re-parse the template for every deck
+"""
+
+import copy
+import os
+import threading
+
+from pptx import Presentation
+
+from deck_theme import apply_theme
+
+
+class TemplateCache:
+    """In-process cache of parsed (and optionally themed) template presentations"""
+
+    def __init__(self):
+        self._prototypes = {}
+        self._lock = threading.Lock()
+
+    def _prototype(self, template, theme):
+        key = (os.path.abspath(template) if template else None, theme)
+        prototype = self._prototypes.get(key)
+        if prototype is None:
+            with self._lock:
+                prototype = self._prototypes.get(key)
+                if prototype is None:
+                    prototype = Presentation(template)
+                    if theme is not None:
+                        apply_theme(prototype, *theme)
+                    self._prototypes[key] = prototype
+        return prototype
+
+    def presentation(self, template=None, theme=None):
+        """Return a fresh, independent presentation built from the cached template
+
+        template is a .pptx path (None for the python-pptx default) and theme an
+        optional (primary_color, text_color) pair passed to apply_theme().
+        """
+        return copy.deepcopy(self._prototype(template, theme))
+
+    def clear(self):
+        """Forget every cached template"""
+        with self._lock:
+            self._prototypes.clear()
+
+
+_default_cache = TemplateCache()
+
+
+def new_presentation(template=None, theme=None):
+    """Fresh presentation from the process-wide template cache"""
+    return _default_cache.presentation(template, theme)
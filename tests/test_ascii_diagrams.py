@@ -0,0 +1,55 @@
+import pytest
+from pptx import Presentation
+from pptx.shapes.connector import Connector
+from pptx.util import Inches
+
+from ascii_diagrams import box_diagram, box_diagram_blocks, draw_box_diagram, parse_box_diagram
+
+DIAGRAM = """
+┌─────────────┐    OCPP 1.6    ┌──────────────┐
+│  Charging   │   WebSocket    │   Central    │
+│  Station    │ ◄────────────► │   System     │
+│ • Meter     │                │ • Billing    │
+│   values    │                └──────────────┘
+└─────────────┘
+       │
+       ▼
+┌─────────────┐
+│  EV         │
+└─────────────┘
+  Vehicle side
+"""
+
+
+def test_boxes_arrows_and_labels():
+    diagram = parse_box_diagram(DIAGRAM)
+    station, central, ev = diagram.boxes
+    assert (station.title, station.bullets) == ("Charging Station", ["• Meter values"])
+    assert (central.title, central.bullets) == ("Central System", ["• Billing"])
+    assert (ev.top, ev.bottom) == (8, 10)
+
+    link, down = diagram.arrows
+    assert (link.source, link.target, link.label) == (0, 1, "OCPP 1.6 WebSocket")
+    assert link.arrow and link.arrow_start and not link.vertical
+    assert (down.source, down.target, down.vertical, down.arrow_start) == (0, 2, True, False)
+    assert [label.text for label in diagram.labels] == ["Vehicle side"]
+
+
+def test_unclosed_box_is_an_error():
+    with pytest.raises(ValueError, match="row 1, column 1 is never closed"):
+        parse_box_diagram("┌──┐\n│ A│\n")
+
+
+def test_blocks_and_cache():
+    markdown = f"## Architecture:\n```\n{DIAGRAM}```\n\n## Code\n```\nprint()\n```\n"
+    assert box_diagram_blocks(markdown) == {'Architecture': DIAGRAM}
+    assert box_diagram(DIAGRAM) is box_diagram(DIAGRAM)
+
+
+def test_draws_native_shapes():
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    shapes = draw_box_diagram(slide, parse_box_diagram(DIAGRAM), Inches(1), Inches(1), Inches(8), Inches(5))
+    assert len(shapes) == 3
+    assert sum(isinstance(shape, Connector) for shape in slide.shapes) == 2
+    assert any(shape.has_text_frame and shape.text_frame.text == "Vehicle side" for shape in slide.shapes)
@@ -0,0 +1,56 @@
+import json
+import subprocess
+import sys
+
+import pytest
+from pptx import Presentation
+
+from create_presentation import PACKAGE_DIR, build_variants, load_manifest
+
+
+def manifest(tmp_path, variants, output_dir='decks'):
+    path = tmp_path / 'variants.json'
+    path.write_text(json.dumps({'output_dir': output_dir, 'variants': variants}), encoding='utf-8')
+    return str(path)
+
+
+def titles(path):
+    return [slide.shapes.title.text for slide in Presentation(path).slides]
+
+
+def test_variants_build_in_manifest_order(tmp_path):
+    path = manifest(tmp_path, [
+        {'name': 'grid', 'title': 'Grid Operators', 'audience': 'grid'},
+        {'name': 'broken', 'output': 'missing/broken.pptx'},
+        {'name': 'vendors', 'audience': ['vendors'], 'colors': {'PRIMARY_BLUE': '#AA0000'}},
+    ])
+    results = build_variants(path, jobs=2, reproducible=True)
+    assert [name for name, _, _, _ in results] == ['grid', 'broken', 'vendors']
+    (_, grid, _, grid_error), (_, _, _, broken_error), (_, vendors, _, vendors_error) = results
+    assert grid_error is None and vendors_error is None and broken_error is not None
+    assert grid == str(tmp_path / 'decks' / 'grid.pptx')
+    grid_titles, vendor_titles = titles(grid), titles(vendors)
+    assert grid_titles[0] == 'Grid Operators'
+    # Each deck keeps only its own audience's advantages slide
+    assert len(grid_titles) == len(vendor_titles) and grid_titles[1:] != vendor_titles[1:]
+
+
+@pytest.mark.parametrize('variants, message', [
+    ([], "every variant needs a 'name'"),
+    ([{'title': 'No name'}], "every variant needs a 'name'"),
+    ([{'name': 'a'}, {'name': 'a'}], "must be unique"),
+    ([{'name': 'a', 'audience': 'martians'}], "Unknown audience"),
+    ([{'name': 'a', 'colors': {'PRIMARY_BLUE': 1}}], "must be a hex string"),
+])
+def test_bad_manifests_fail_before_building(tmp_path, variants, message):
+    with pytest.raises(ValueError, match=message):
+        load_manifest(manifest(tmp_path, variants))
+
+
+def test_batch_command(tmp_path):
+    path = manifest(tmp_path, [{'name': 'users', 'audience': 'users'}], output_dir='.')
+    done = subprocess.run([sys.executable, 'create_presentation.py', '--batch', path, '-j', '1'],
+                          cwd=PACKAGE_DIR, capture_output=True, text=True)
+    assert done.returncode == 0, done.stdout + done.stderr
+    assert "✅ Built 1/1 variants" in done.stdout
+    assert (tmp_path / 'users.pptx').exists()
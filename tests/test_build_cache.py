@@ -0,0 +1,50 @@
+import io
+import os
+
+from build_cache import BuildCache, cache_key
+
+
+def age(cache, key, seconds):
+    """Backdate an entry's last use"""
+    path = cache._path(key)
+    stamp = os.stat(path).st_mtime - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_cache_key_depends_on_every_part():
+    assert cache_key('a', b'b', {'x': 1, 'y': 2}) == cache_key('a', b'b', {'y': 2, 'x': 1})
+    assert cache_key('ab', 'c') != cache_key('a', 'bc')
+
+
+def test_miss_then_hit(tmp_path):
+    cache = BuildCache(str(tmp_path / 'cache'))
+    assert cache.get('k') is None
+    assert not cache.fetch('k', str(tmp_path / 'out.pptx'))
+    cache.put_bytes('k', b'deck')
+    buffer = io.BytesIO()
+    assert cache.fetch('k', buffer) and buffer.getvalue() == b'deck'
+    assert cache.fetch('k', str(tmp_path / 'out.pptx'))
+    assert (tmp_path / 'out.pptx').read_bytes() == b'deck'
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = BuildCache(str(tmp_path), max_bytes=250)
+    for key, seconds in (('old', 30), ('used', 20), ('new', 10)):
+        cache.put_bytes(key, b'x' * 100)
+        age(cache, key, seconds)
+    # 300 bytes were over the limit when 'new' went in, so 'old' is already gone
+    assert cache.get('old') is None
+    cache.get('used')  # a hit refreshes recency
+    age(cache, 'new', 5)
+    cache.put_bytes('newest', b'x' * 100)
+    assert cache.get('new') is None
+    assert cache.get('used') is not None and cache.get('newest') is not None
+    assert sum(size for _, size, _ in cache.entries()) <= 250
+
+
+def test_clear_leaves_other_files(tmp_path):
+    cache = BuildCache(str(tmp_path))
+    cache.put_bytes('k', b'deck')
+    (tmp_path / 'notes.txt').write_text('keep')
+    cache.clear()
+    assert cache.entries() == [] and (tmp_path / 'notes.txt').exists()
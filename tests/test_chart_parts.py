@@ -0,0 +1,42 @@
+import io
+import math
+import zipfile
+
+from lxml import etree
+
+from chart_parts import SHEET, column_letter, workbook_blob
+
+MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+
+def sheet_cells(blob):
+    """{cell reference: text} of the generated worksheet"""
+    with zipfile.ZipFile(io.BytesIO(blob)) as workbook:
+        root = etree.fromstring(workbook.read(SHEET))
+    return {c.get('r'): ''.join(c.itertext()) for c in root.iter(f'{MAIN}c')}
+
+
+def test_column_letter():
+    assert [column_letter(i) for i in (0, 1, 25, 26, 27, 701, 702)] == ['A', 'B', 'Z', 'AA', 'AB', 'ZZ', 'AAA']
+
+
+def test_numeric_workbook_with_gaps():
+    cells = sheet_cells(workbook_blob([0, 15, 30], ['7 kW AC', '50 kW DC'], [[0, 10.5, 21], [0, 75, math.nan]]))
+    assert cells['B1'] == '7 kW AC' and cells['C1'] == '50 kW DC'
+    assert [cells[f'A{n}'] for n in (2, 3, 4)] == ['0.0', '15.0', '30.0']
+    assert cells['B3'] == '10.5' and cells['C3'] == '75.0'
+    assert 'C4' not in cells  # NaN is left empty, which charts draw as a gap
+
+
+def test_category_workbook_escapes_text():
+    cells = sheet_cells(workbook_blob(['R&D', '<2025'], ['Share'], [[0.25, 0.75]]))
+    assert cells['A2'] == 'R&D' and cells['A3'] == '<2025' and cells['B3'] == '0.75'
+
+
+def test_workbook_bytes_are_reproducible():
+    args = ([2024, 2025], ['Adoption'], [[0.1, 0.2]])
+    blob = workbook_blob(*args)
+    assert blob == workbook_blob(*args)
+    with zipfile.ZipFile(io.BytesIO(blob)) as workbook:
+        assert workbook.testzip() is None
+        assert {info.date_time for info in workbook.infolist()} == {(1980, 1, 1, 0, 0, 0)}
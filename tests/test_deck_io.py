@@ -0,0 +1,67 @@
+import io
+import zipfile
+
+import pytest
+
+from create_presentation import build_presentation, render_parallel, render_variant
+from deck_io import ZIP_EPOCH, canonicalize_package, deck_bytes, save_deck
+
+
+def parts(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as package:
+        return {name: package.read(name) for name in package.namelist()}
+
+
+@pytest.fixture(scope='module')
+def deck():
+    return render_variant(reproducible=True)
+
+
+def test_reproducible_builds_are_byte_identical(deck, monkeypatch):
+    assert render_variant(reproducible=True) == deck
+    # Also when the wall clock would otherwise leak into core.xml
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1700000000')
+    stamped = render_variant(reproducible=True)
+    assert stamped == render_variant(reproducible=True) != deck
+
+
+def test_canonical_package_layout(deck):
+    with zipfile.ZipFile(io.BytesIO(deck)) as package:
+        names = package.namelist()
+        assert names[:2] == ['[Content_Types].xml', '_rels/.rels']
+        assert {info.date_time for info in package.infolist()} == {ZIP_EPOCH}
+    assert canonicalize_package(deck) == deck
+
+
+def test_canonicalizing_keeps_every_part(deck):
+    plain = deck_bytes(build_presentation())
+    assert set(parts(plain)) == set(parts(deck))
+    assert canonicalize_package(plain) == canonicalize_package(canonicalize_package(plain))
+
+
+def test_parallel_build_matches_sequential(deck):
+    from pptx import Presentation
+
+    def content(data):
+        prs = Presentation(io.BytesIO(data))
+        return [[(shape.shape_type, shape.name, shape.has_text_frame and shape.text_frame.text)
+                 for shape in slide.shapes] for slide in prs.slides]
+
+    parallel = render_parallel(reproducible=True, jobs=2)
+    assert content(parallel) == content(deck)
+    assert render_parallel(reproducible=True, jobs=2) == parallel
+
+
+def test_failed_save_keeps_the_previous_file(tmp_path):
+    target = tmp_path / 'deck.pptx'
+    target.write_bytes(b'previous deck')
+
+    class Broken:
+        def save(self, file):
+            file.write(b'partial')
+            raise RuntimeError('render failed')
+
+    with pytest.raises(RuntimeError):
+        save_deck(Broken(), str(target))
+    assert target.read_bytes() == b'previous deck'
+    assert list(tmp_path.iterdir()) == [target]
@@ -0,0 +1,81 @@
+import asyncio
+from http import HTTPStatus
+
+import pytest
+
+from deck_server import DEFAULT_FILENAME, DeckRenderer, DeckServer, HTTPError, _read_request, content_disposition
+
+
+def test_plain_name():
+    assert content_disposition('Site Deck') == 'attachment; filename="Site Deck.pptx"'
+
+
+def test_header_injection_is_stripped():
+    header = content_disposition('deck"\r\nSet-Cookie: a=b;')
+    assert '\r' not in header and '\n' not in header
+    assert header == 'attachment; filename="deckSet-Cookie: a=b.pptx"'
+
+
+def test_non_latin_names_get_an_encoded_filename():
+    header = content_disposition('Präsentation ⚡')
+    header.encode('latin-1')
+    assert header == ("attachment; filename=\"Pr_sentation _.pptx\"; "
+                      "filename*=UTF-8''Pr%C3%A4sentation%20%E2%9A%A1.pptx")
+
+
+def test_empty_name_falls_back():
+    assert content_disposition(' \t') == f'attachment; filename="{DEFAULT_FILENAME}.pptx"'
+
+
+def test_previews_are_cached_coalesced_and_bounded():
+    async def run(renderer):
+        spec = {'name': 'Preview', 'audience': ['grid']}
+        (first, how), (second, shared) = await asyncio.gather(renderer.preview(spec), renderer.preview(spec))
+        assert {how, shared} == {'miss', 'coalesced'} and first == second
+        assert b'<html' in first.lower()
+        assert await renderer.preview(spec) == (first, 'hit')
+        renderer.max_pending = 0
+        with pytest.raises(HTTPError) as e:
+            await renderer.preview({'name': 'Other'})
+        assert e.value.status == HTTPStatus.SERVICE_UNAVAILABLE
+        # A preview is not served from, or as, the deck of the same spec
+        renderer.max_pending = 1
+        assert (await renderer.render(spec))[1] == 'miss'
+
+    renderer = DeckRenderer(workers=1)
+    try:
+        asyncio.run(run(renderer))
+    finally:
+        renderer.close()
+    assert renderer.stats == {'hits': 1, 'coalesced': 1, 'builds': 2, 'rejected': 1, 'previews': 4}
+
+
+def read(raw):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await _read_request(reader)
+    return asyncio.run(run())
+
+
+def test_request_body_is_read():
+    request = read(b'POST /render HTTP/1.1\r\nContent-Length: 2\r\n\r\n{}')
+    assert request == ('POST', '/render', 'HTTP/1.1', {'content-length': '2'}, b'{}')
+
+
+@pytest.mark.parametrize('length', [b'abc', b'-5', b'1e3', b'\xd9\xa3'])
+def test_bad_content_length_is_a_bad_request(length):
+    with pytest.raises(HTTPError) as e:
+        read(b'POST /render HTTP/1.1\r\nContent-Length: ' + length + b'\r\n\r\n{}')
+    assert e.value.status == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.parametrize('spec', [
+    b'{"colors": "red"}', b'{"colors": {"PRIMARY_BLUE": 7}}', b'{"audience": 3}', b'{"audience": [["grid"]]}',
+    b'{"site": [1]}', b'{"title": {"a": 1}}', b'{"contact": "x@example.com", "v2g_sessions": [1]}',
+])
+def test_malformed_specs_are_bad_requests(spec):
+    with pytest.raises(HTTPError) as e:
+        asyncio.run(DeckServer(renderer=None)._dispatch('POST', '/render', spec))
+    assert e.value.status == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,46 @@
+import io
+
+from create_presentation import deck_settings
+from deck_io import save_deck
+from deck_watch import IncrementalDeck
+from slide_ir import Bullet, Section, Slide
+
+COLORS = deck_settings().colors
+
+
+def slide(title, bullets=2):
+    return Slide(title, (Section("Points:", items=tuple(Bullet(f"{title} point {n}") for n in range(bullets))),))
+
+
+def saved(deck):
+    buffer = io.BytesIO()
+    save_deck(deck.prs, buffer, reproducible=True)
+    return buffer.getvalue()
+
+
+def fresh(slides):
+    deck = IncrementalDeck(COLORS)
+    deck.update(slides)
+    return deck
+
+
+def test_updates_match_a_fresh_build():
+    # "Long" overflows onto a "(cont.)" slide; "Appendix (cont.)" only looks like one
+    slides = [slide("Intro"), slide("Long", 20), slide("Appendix (cont.)"), slide("Outro")]
+    deck = IncrementalDeck(COLORS)
+    assert deck.update(slides) == [1, 2, 3, 4]
+    assert deck.sizes == [1, 2, 1, 1]
+
+    intro, long, appendix, outro = slides
+    edits = (
+        ([intro, slide("Long", 21), appendix, outro], [2]),
+        ([slide("Intro", 3), long, appendix, outro, slide("New")], [1, 2, 5]),
+        ([slide("Intro", 3), long, appendix], []),
+        ([slide("Intro", 3), long, slide("Appendix (cont.)", 3)], [3]),
+        ([slide("Intro", 3)], []),
+    )
+    for edited, rebuilt in edits:
+        assert deck.update(edited) == rebuilt
+        expected = fresh(edited)
+        assert deck.sizes == expected.sizes
+        assert saved(deck) == saved(expected)
@@ -0,0 +1,74 @@
+import pytest
+
+from diagrams import Note, layout_graph, parse_diagram, parse_mermaid, parse_sequence
+
+FLOW = """\
+graph LR
+    EV[Electric Vehicle] -->|ISO 15118| EVSE{Charging Station}
+    EVSE -.-> CSMS((Backend))  %% OCPP
+    CSMS == Tariffs ==> EVSE
+    style EV fill:#00CC66,stroke:#333,stroke-width:2px
+"""
+
+
+def test_flowchart_nodes_edges_and_styles():
+    graph = parse_mermaid(FLOW)
+    assert graph.direction == 'LR'
+    assert list(graph.nodes) == ['EV', 'EVSE', 'CSMS']
+    assert graph.nodes['EV'].label == 'Electric Vehicle'
+    assert graph.nodes['EVSE'].shape == 'diamond' and graph.nodes['CSMS'].shape == 'circle'
+    assert graph.nodes['EV'].fill == '00CC66'
+    assert graph.nodes['EV'].stroke == '333333' and graph.nodes['EV'].stroke_width == 1.5  # 2px in points
+    first, dashed, thick = graph.edges
+    assert (first.source, first.target, first.label) == ('EV', 'EVSE', 'ISO 15118')
+    assert dashed.dashed and dashed.label is None
+    assert thick.thick and thick.label == 'Tariffs'
+
+
+@pytest.mark.parametrize('source, message', [
+    ("", "empty Mermaid diagram"),
+    ("pie\n", "Mermaid line 1"),
+    ("graph TD\nsubgraph One\n", "'subgraph' is not in the supported Mermaid subset"),
+    ("graph TD\nstyle A fill:#fff\n", "style for unknown node 'A'"),
+])
+def test_flowchart_errors(source, message):
+    with pytest.raises(ValueError, match=message):
+        parse_mermaid(source)
+
+
+def test_sequence_messages_notes_and_loops():
+    diagram = parse_diagram("""\
+sequenceDiagram
+    participant EV as Vehicle
+    EV->>EVSE: SessionSetupReq
+    EVSE-->>EV: SessionSetupRes
+    loop Charging
+        EV->>EVSE: CurrentDemandReq
+        Note over EV,EVSE: every 250 ms
+    end
+""")
+    assert diagram.participants == {'EV': 'Vehicle', 'EVSE': 'EVSE'}
+    assert [step.label for step in diagram.steps[:3]] == ['SessionSetupReq', 'SessionSetupRes', 'CurrentDemandReq']
+    assert diagram.steps[1].dashed
+    assert isinstance(diagram.steps[3], Note)
+    (loop,) = diagram.loops
+    assert (loop.label, loop.first, loop.end) == ('Charging', 2, 4)
+
+
+def test_sequence_unclosed_loop():
+    with pytest.raises(ValueError, match="never closed"):
+        parse_sequence("sequenceDiagram\nloop Poll\nA->>B: Req\n")
+
+
+def test_layout_ranks_follow_the_flow():
+    layout = layout_graph(parse_mermaid("graph TD\nA --> B\nA --> C\nB --> D\nC --> D\nA --> D\n"))
+    assert layout.ranks == {'A': 0, 'B': 1, 'C': 1, 'D': 2}
+    assert layout.rank_count == 3 and layout.breadth == 3  # B, C and the long edge's dummy node
+    assert sorted(layout.positions[n] for n in 'BC') != [0, 0]
+    assert len(layout.routes[4]) == 3  # A -> D passes through rank 1
+
+
+def test_layout_reverses_cycles():
+    layout = layout_graph(parse_mermaid("graph TD\nA --> B\nB --> C\nC --> A\n"))
+    assert layout.reversed_edges == {2}
+    assert layout.routes[2][0][0] == layout.ranks['C'] and layout.routes[2][-1][0] == layout.ranks['A']
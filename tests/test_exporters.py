@@ -0,0 +1,84 @@
+import io
+
+from pptx import Presentation
+
+from create_presentation import deck_settings
+from deck_theme import SMALL_BULLET
+from exporters import export
+from markdown_deck import parse_markdown_slides, slide_ir
+from slide_ir import LINE, TITLE_LAYOUT, Bullet, Chart, Listing, Section, Slide, Table
+
+SETTINGS = deck_settings({'title': 'Deck <Test>'})
+POINTS = (Bullet("Plug & Charge"), Bullet("Contract certificate", level=SMALL_BULLET),
+          Bullet("TLS <1.2>", level=SMALL_BULLET), Bullet("Smart charging", '✅'),
+          Bullet("Schedules", '🔧', SMALL_BULLET))
+SLIDES = (
+    Slide("ISO 15118", layout=TITLE_LAYOUT, subtitle="Next Generation\nEV Charging"),
+    Slide("Features", (Section("Key Points:", items=POINTS),
+                       Section("Compared:", 'SECONDARY_GREEN', (Table(('Feature', 'OCPP 1.6'), (('V2G', 'No'),)),)))),
+    Slide("Adoption", (Section("Share:", items=(
+        Chart((2024, 2025), (('PnC', 'PRIMARY_BLUE', (0.1, 0.2)),), kind=LINE), Listing("EV ──► EVSE"))),)),
+)
+
+
+def test_markdown_export():
+    md = export(SLIDES, SETTINGS, formats=('md',))['md'].decode('utf-8')
+    assert md == """\
+# Deck <Test>
+
+## Slide 1: ISO 15118
+**ISO 15118**
+*Next Generation*
+*EV Charging*
+
+---
+
+## Slide 2: Features
+
+### Key Points
+- Plug & Charge
+  - Contract certificate
+  - TLS <1.2>
+✅ Smart charging
+  🔧 Schedules
+
+### Compared
+| Feature | OCPP 1.6 |
+| ------- | -------- |
+| V2G | No |
+
+---
+
+## Slide 3: Adoption
+
+### Share
+```
+EV ──► EVSE
+```
+"""
+
+
+def test_markdown_export_compiles_back_with_nested_bullets():
+    md = export(SLIDES, SETTINGS, formats=('md',))['md'].decode('utf-8')
+    title, features, adoption = parse_markdown_slides(md)
+    assert title.is_title_slide
+    assert slide_ir(features).sections[0].items == POINTS
+    assert slide_ir(features).sections[1].items == SLIDES[1].sections[1].items
+
+
+def test_html_export():
+    page = export(SLIDES, SETTINGS, formats=('html',))['html'].decode('utf-8')
+    assert page.count('<section class="slide"') == 3
+    assert '<title>Deck &lt;Test&gt;</title>' in page
+    assert '<li class="small"><span class="marker">•</span>TLS &lt;1.2&gt;</li>' in page
+    assert '<li><span class="marker">✅</span>Smart charging</li>' in page
+    assert '<th>Feature</th>' in page and '<td>V2G</td>' in page
+    assert '<svg' in page and '<pre>EV ──► EVSE</pre>' in page
+
+
+def test_one_pass_renders_every_format():
+    results = export(SLIDES, SETTINGS, reproducible=True)
+    assert set(results) == {'pptx', 'md', 'html'}
+    prs = Presentation(io.BytesIO(results['pptx']))
+    assert [slide.shapes.title.text for slide in prs.slides] == ["ISO 15118", "Features", "Adoption"]
+    assert export(SLIDES, SETTINGS, formats=('pptx',), reproducible=True)['pptx'] == results['pptx']
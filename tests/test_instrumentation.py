@@ -0,0 +1,51 @@
+import json
+
+from create_presentation import build_presentation, title_slide
+from instrumentation import BuildProfiler, builder_name
+
+MB = 1 << 20
+
+
+def test_nested_measurements_keep_the_enclosing_peak():
+    with BuildProfiler() as profiler:
+        with profiler.phase('build'):
+            spike = bytearray(8 * MB)
+            del spike
+            with profiler.phase('slide'):
+                small = bytearray(MB)
+                del small
+    slide, build = profiler.phases
+    assert (slide['name'], build['name']) == ('slide', 'build')
+    assert slide['peak_bytes'] < 2 * MB
+    # The 8 MB spike came and went before the nested phase reset the peak
+    assert build['peak_bytes'] >= 7 * MB
+
+
+def test_records_reach_the_hook_and_report():
+    seen = []
+    with BuildProfiler(hook=seen.append, memory=False) as profiler:
+        with profiler.phase('save'):
+            pass
+    assert seen == profiler.phases
+    assert 'peak_bytes' not in seen[0] and seen[0]['seconds'] >= 0
+    assert profiler.report()['phases'] == seen
+
+
+def test_build_records_every_phase_and_slide(tmp_path):
+    with BuildProfiler() as profiler:
+        prs = build_presentation(profiler=profiler, selection="1-3")
+    assert [p['name'] for p in profiler.phases] == ['template', 'ir', 'build', 'fit']
+    assert [s['name'] for s in profiler.slides] == ['title', 'agenda', 'introduction']
+    assert [s['index'] for s in profiler.slides] == [1, 2, 3]
+    assert sum(s['slides_added'] for s in profiler.slides) == len(prs.slides)
+    assert all(s['xml_bytes'] > 0 and 'peak_bytes' in s for s in profiler.slides)
+    path = tmp_path / 'profile.json'
+    profiler.write(str(path))
+    assert json.loads(path.read_text())['slides'] == profiler.slides
+
+
+def test_builder_name():
+    def add_summary_slide():
+        pass
+    assert builder_name(title_slide) == 'title'
+    assert builder_name(add_summary_slide) == 'summary'
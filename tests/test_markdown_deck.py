@@ -0,0 +1,75 @@
+from pptx import Presentation
+
+from markdown_deck import compile_deck, parse_markdown_slides
+
+SOURCE = """\
+# ISO 15118
+
+## Slide 1: Title
+**ISO 15118**
+The Next Generation of EV Charging
+
+## Slide 2: Overview
+### Key Points
+- **Plug & Charge**: automatic authentication
+- Vehicle-to-Grid
+
+## Slide 3: Comparison
+| Aspect | OCPP 1.6 | ISO 15118 |
+|--------|----------|-----------|
+| Link | Station ↔ backend | EV ↔ station |
+
+```
+EV ──► EVSE
+```
+
+## Design Notes
+- not a slide
+"""
+
+
+def titles(path):
+    return [slide.shapes.title.text for slide in Presentation(path).slides]
+
+
+def test_parse_slides_and_blocks():
+    title, overview, comparison = parse_markdown_slides(SOURCE)
+    assert title.is_title_slide
+    assert title.blocks == [('text', 'ISO 15118'), ('text', 'The Next Generation of EV Charging')]
+    assert overview.blocks[0] == ('heading', 'Key Points')
+    assert overview.blocks[1] == ('bullet', ('•', 'Plug & Charge: automatic authentication'))
+    assert [kind for kind, _ in comparison.blocks] == ['table', 'code']
+    assert comparison.blocks[0][1][1] == ['Link', 'Station ↔ backend', 'EV ↔ station']
+
+
+def test_digest_follows_the_source():
+    before = parse_markdown_slides(SOURCE)
+    after = parse_markdown_slides(SOURCE.replace("Vehicle-to-Grid", "V2G"))
+    assert [a.digest == b.digest for a, b in zip(before, after)] == [True, False, True]
+
+
+def test_incremental_rebuild(tmp_path):
+    source, output = tmp_path / 'deck.md', str(tmp_path / 'deck.pptx')
+    source.write_text(SOURCE, encoding='utf-8')
+    assert compile_deck(str(source), output) == [1, 2, 3]
+    assert compile_deck(str(source), output) == []
+
+    source.write_text(SOURCE.replace("## Slide 2: Overview", "## Slide 2: Summary"), encoding='utf-8')
+    assert compile_deck(str(source), output) == [2]
+    assert titles(output) == ['ISO 15118', 'Summary', 'Comparison']
+
+    source.write_text(SOURCE.split("## Slide 3")[0], encoding='utf-8')
+    assert compile_deck(str(source), output) == [2]
+    assert titles(output) == ['ISO 15118', 'Overview']
+
+
+def test_incremental_and_forced_builds_are_byte_identical(tmp_path):
+    source, incremental, forced = tmp_path / 'deck.md', str(tmp_path / 'inc.pptx'), str(tmp_path / 'full.pptx')
+    edits = (SOURCE, SOURCE.replace("Vehicle-to-Grid", "V2G").replace("Slide 1: Title", "Slide 1: Cover"),
+             SOURCE.replace("## Slide 2: Overview", "## Slide 2: Gone\n\n## Slide 3: Overview"), SOURCE)
+    for text in edits:
+        source.write_text(text, encoding='utf-8')
+        compile_deck(str(source), incremental, reproducible=True)
+        compile_deck(str(source), forced, force=True, reproducible=True)
+        with open(incremental, 'rb') as a, open(forced, 'rb') as b:
+            assert a.read() == b.read()
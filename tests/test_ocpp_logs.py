@@ -0,0 +1,65 @@
+import tracemalloc
+
+from ocpp_logs import LogSummarizer
+
+LOG = """\
+2024-05-01T10:00:00.000Z CP0001 -> [2,"1","RemoteStartTransaction",{"idTag":"app-user"}]
+2024-05-01T10:00:01.000Z CP0001 -> [2,"2","StartTransaction",{"connectorId":1,"idTag":"app-user","meterStart":1000}]
+2024-05-01T10:00:01.500Z CP0001 <- [3,"2",{"transactionId":7,"idTagInfo":{"status":"Accepted"}}]
+2024-05-01T10:00:30.000Z CP0002 -> [2,"3","StartTransaction",{"connectorId":1,"idTag":"04A1B2C3","meterStart":0}]
+2024-05-01T10:02:00.000Z CP0001 -> [2,"4","StopTransaction",{"transactionId":7,"meterStop":13000}]
+2024-05-01T10:03:00.000Z CP0002 -> [2,"5","StatusNotification",{"status":"Faulted","errorCode":"GroundFailure"}]
+not a frame
+"""
+
+
+def summarize(*blocks):
+    summarizer = LogSummarizer()
+    for block in blocks:
+        summarizer.feed_text(block)
+    return summarizer.summary()
+
+
+def test_sessions_and_authorization():
+    s = summarize(LOG)
+    assert s.messages == 6 and s.calls == 5 and s.results == 1
+    assert s.skipped_lines == 1
+    assert s.stations == 2
+    assert s.sessions == 2 and s.completed_sessions == 1
+    assert s.auth_methods['Remote start (app)'] == 1 and s.auth_methods['RFID'] == 1
+    assert s.energy_kwh == 12.0
+    assert s.error_codes == {'GroundFailure': 1}
+
+
+def test_blocks_give_the_same_summary_as_one_pass():
+    lines = LOG.splitlines(keepends=True)
+    assert summarize(''.join(lines[:3]), ''.join(lines[3:])) == summarize(LOG)
+
+
+def test_per_minute_rates_count_idle_minutes():
+    s = summarize(LOG)
+    # Minutes 10:00 to 10:03: 4, 0, 1, 1 messages
+    assert s.peak_per_minute == 4
+    assert s.median_per_minute == 1.0
+
+
+def test_out_of_range_timestamp_stays_small():
+    unset_clock = '1970-01-01T00:00:05Z CP0003 -> [2,"9","Heartbeat",{}]\n'
+    tracemalloc.start()
+    try:
+        s = summarize(LOG + unset_clock)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # A dense per-minute array since 1970 would take over 200 MB
+    assert peak < 10 * 1024 * 1024
+    assert s.first == '1970-01-01T00:00:05'
+    assert s.peak_per_minute == 4
+    assert s.median_per_minute == 0.0
+
+
+def test_empty_and_blank_blocks_skip_nothing():
+    lines = LOG.splitlines(keepends=True)
+    blocks = ('', ''.join(lines[:3]), ' \n', '\n\n', ''.join(lines[3:]), '   ')
+    assert summarize(*blocks) == summarize(LOG)
+    assert summarize('').skipped_lines == 0
@@ -0,0 +1,49 @@
+import pytest
+
+from create_presentation import build_presentation, select_slides
+from slide_ir import Slide
+
+SLIDES = tuple(Slide(title, name=name) for title, name in (
+    ("Title", 'title'), ("Agenda", 'agenda'), ("Advantages for Vendors", 'vendor_advantages'),
+    ("Advantages for Users", 'user_advantages'), ("Thank You!", 'thank_you')))
+
+
+def titles(slides):
+    return [ir.title for ir in slides]
+
+
+@pytest.mark.parametrize('spec, expected', [
+    ("2", ["Agenda"]),
+    ("2-3", ["Agenda", "Advantages for Vendors"]),
+    ("-2", ["Title", "Agenda"]),
+    ("4-", ["Advantages for Users", "Thank You!"]),
+    ("5,1", ["Title", "Thank You!"]),
+    ("advantages*", ["Advantages for Vendors", "Advantages for Users"]),
+    ("thank_*", ["Thank You!"]),  # builder names match too
+])
+def test_positions_ranges_and_globs(spec, expected):
+    assert titles(select_slides(SLIDES, spec)) == expected
+
+
+def test_duplicates_pick_a_slide_once():
+    assert titles(select_slides(SLIDES, "3, 2-3, Advantages*, 3")) == [
+        "Agenda", "Advantages for Vendors", "Advantages for Users"]
+
+
+@pytest.mark.parametrize('spec, message', [
+    ("6", "outside 1-5"),
+    ("0", "outside 1-5"),
+    ("4-2", "outside 1-5"),
+    ("Nothing*", "no slide title matches"),
+    (" , ", "is empty"),
+])
+def test_bad_selections(spec, message):
+    with pytest.raises(ValueError, match=message):
+        select_slides(SLIDES, spec)
+
+
+def test_numbers_count_source_slides_and_bring_continuations():
+    # Slide 4 of the source overflows onto a "(cont.)" slide that takes no number
+    prs = build_presentation(selection="4-5")
+    assert [slide.shapes.title.text for slide in prs.slides] == [
+        "OCPP 1.6 Overview", "OCPP 1.6 Overview (cont.)", "OCPP 1.6 System Architecture"]
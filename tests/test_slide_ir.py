@@ -0,0 +1,77 @@
+import io
+import zipfile
+
+from pptx import Presentation
+
+from create_presentation import deck_settings
+from markdown_deck import _drop_slide
+from slide_ir import LINE, Bullet, Chart, PrototypeRenderer, Section, Slide, Table, render_slide
+
+SLIDE = Slide("Plug & Charge", (Section("How It Works:", items=(Bullet("Contract certificate"), Bullet("TLS"))),))
+
+
+def content(prs):
+    return [(slide.shapes.title.text, [p.text for p in slide.placeholders[1].text_frame.paragraphs])
+            for slide in prs.slides]
+
+
+def test_stamped_slides_match_render_slide():
+    colors = deck_settings().colors
+    stamped, rendered = Presentation(), Presentation()
+    renderer = PrototypeRenderer(stamped, colors)
+    for n in range(3):
+        ir = Slide(f"{SLIDE.title} {n}", SLIDE.sections)
+        renderer.render(ir)
+        render_slide(rendered, ir, colors)
+    assert content(stamped) == content(rendered)
+    assert [s._element.xml for s in stamped.slides] == [s._element.xml for s in rendered.slides]
+
+
+def test_stamping_skips_partnames_in_use():
+    prs = Presentation()
+    for _ in range(3):
+        prs.slides.add_slide(prs.slide_layouts[1])
+    # Drop slide2.xml, leaving slide1.xml and slide3.xml
+    sld_id_lst = prs.slides._sldIdLst
+    prs.part.drop_rel(sld_id_lst[1].rId)
+    sld_id_lst.remove(sld_id_lst[1])
+
+    renderer = PrototypeRenderer(prs, deck_settings().colors)
+    for _ in range(3):
+        renderer.render(SLIDE)
+    partnames = [slide.part.partname for slide in prs.slides]
+    assert len(set(partnames)) == 5
+
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    with zipfile.ZipFile(buffer) as package:
+        names = package.namelist()
+    assert len(names) == len(set(names))
+    assert len(Presentation(io.BytesIO(buffer.getvalue())).slides) == 5
+
+
+def test_chart_and_table_slides_skip_partnames_in_use():
+    prs = Presentation()
+    renderer = PrototypeRenderer(prs, deck_settings().colors)
+    for _ in range(3):
+        renderer.render(SLIDE)
+    _drop_slide(prs, 1)
+    table = Slide("Matrix", (Section("Compared:", items=(Table(('Feature', 'OCPP 1.6'), (('V2G', '—'),)),)),))
+    chart = Slide("Adoption", (Section("Share:", items=(Chart((2024, 2025), (('PnC', 'PRIMARY_BLUE', (0.1, 0.2)),), kind=LINE),)),))
+    renderer.render(table)
+    renderer.render(chart)
+    partnames = [slide.part.partname for slide in prs.slides]
+    assert len(set(partnames)) == 4
+
+
+def test_add_and_drop_elsewhere_are_seen():
+    prs = Presentation()
+    renderer = PrototypeRenderer(prs, deck_settings().colors)
+    for _ in range(3):
+        renderer.render(SLIDE)
+    # python-pptx names this slide4.xml; dropping slide1.xml brings the count back to 3
+    prs.slides.add_slide(prs.slide_layouts[1])
+    _drop_slide(prs, 0)
+    renderer.render(SLIDE)
+    partnames = [slide.part.partname for slide in prs.slides]
+    assert len(set(partnames)) == 4
@@ -0,0 +1,75 @@
+import io
+import zipfile
+
+import pytest
+from PIL import Image
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.util import Inches
+
+from streaming_writer import StreamingDeckWriter, slide_fragment
+from template_cache import new_presentation
+
+
+def png():
+    buffer = io.BytesIO()
+    Image.new('RGB', (4, 4), 'blue').save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def write(target, count=3):
+    picture = png()
+    with StreamingDeckWriter(target, reproducible=True) as writer:
+        for n in range(count):
+            slide = writer.add_slide(5)
+            slide.shapes.title.text = f"Slide {n + 1}"
+            slide.shapes.add_picture(io.BytesIO(picture), Inches(1), Inches(2))
+            assert writer.slide_count == n + 1
+        chart_data = CategoryChartData()
+        chart_data.categories = ['OCPP 1.6', 'ISO 15118']
+        chart_data.add_series('Share', (0.6, 0.4))
+        slide = writer.add_slide(5)
+        slide.shapes.title.text = "Chart"
+        slide.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, Inches(1), Inches(2), Inches(6), Inches(4), chart_data)
+        # Slides rendered elsewhere on the same template are appended as they are
+        scratch = new_presentation()
+        rendered = scratch.slides.add_slide(scratch.slide_layouts[5])
+        rendered.shapes.title.text = "Rendered elsewhere"
+        writer.add_slide_xml(*slide_fragment(rendered))
+        # Finished slides are not kept in the scratch deck
+        assert len(writer._prs.slides) == 0
+
+
+def test_streamed_deck_opens_with_shared_parts():
+    buffer = io.BytesIO()
+    write(buffer)
+    prs = Presentation(io.BytesIO(buffer.getvalue()))
+    assert [slide.shapes.title.text for slide in prs.slides] == [
+        "Slide 1", "Slide 2", "Slide 3", "Chart", "Rendered elsewhere"]
+    assert prs.slides[3].shapes[1].has_chart
+    with zipfile.ZipFile(buffer) as package:
+        names = package.namelist()
+    assert len(names) == len(set(names))
+    # The same picture on three slides is stored once
+    assert len([name for name in names if name.startswith('ppt/media/')]) == 1
+
+
+def test_reproducible_output_is_byte_identical(tmp_path):
+    first, second = tmp_path / 'a.pptx', tmp_path / 'b.pptx'
+    write(str(first))
+    write(str(second))
+    assert first.read_bytes() == second.read_bytes()
+
+
+def test_closed_writer_and_slide_templates_are_rejected(tmp_path):
+    writer = StreamingDeckWriter(io.BytesIO())
+    writer.close()
+    with pytest.raises(ValueError, match="writer is closed"):
+        writer.add_slide(1)
+    template = tmp_path / 'template.pptx'
+    prs = Presentation()
+    prs.slides.add_slide(prs.slide_layouts[1])
+    prs.save(str(template))
+    with pytest.raises(ValueError, match="must not contain slides"):
+        StreamingDeckWriter(io.BytesIO(), template=str(template))
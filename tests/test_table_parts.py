@@ -0,0 +1,34 @@
+from pptx import Presentation
+from pptx.util import Inches
+
+from deck_theme import TABLE_STYLE_ID
+from table_parts import CELL_MARGIN_Y, add_table, column_widths, row_heights
+
+
+def test_column_widths_add_up():
+    assert column_widths(1000, 3) == [333, 333, 334]
+    widths = column_widths(9144000, 4, (1.6, 1, 1, 1))
+    assert sum(widths) == 9144000
+    assert widths[0] == int(9144000 * 1.6 / 4.6) and widths[1] == widths[2]
+
+
+def test_row_heights_grow_with_wrapped_text():
+    widths = column_widths(Inches(6), 2)
+    short, tall = row_heights(('Feature', 'Value'), [('A', 'B'), ('C', 'word ' * 40)], widths, 12)[1:]
+    assert short == row_heights(('Feature', 'Value'), [('A', '')], widths, 12)[1]
+    assert tall > 3 * short - 4 * CELL_MARGIN_Y
+    assert row_heights(('H',), [('x',)], widths[:1], 18)[1] > row_heights(('H',), [('x',)], widths[:1], 12)[1]
+
+
+def test_add_table_pads_rows_and_uses_the_deck_style():
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    shape, height = add_table(slide, ('Feature', 'OCPP 1.6', 'ISO 15118'), [('V2G', '—'), ('PnC', '—', '✓')],
+                              Inches(1), Inches(1), Inches(8), weights=(2, 1, 1))
+    table = shape.table
+    assert [[cell.text for cell in row.cells] for row in table.rows] == [
+        ['Feature', 'OCPP 1.6', 'ISO 15118'], ['V2G', '—', ''], ['PnC', '—', '✓']]
+    assert height == sum(row.height for row in table.rows) == shape.height
+    assert sum(column.width for column in table.columns) == Inches(8)
+    assert table._tbl.tblPr.find('{http://schemas.openxmlformats.org/drawingml/2006/main}tableStyleId').text == \
+        TABLE_STYLE_ID
@@ -0,0 +1,41 @@
+import io
+
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+
+from template_cache import TemplateCache
+
+THEME = (RGBColor(0x00, 0x66, 0xCC), RGBColor(0x33, 0x33, 0x33))
+
+
+def test_template_is_parsed_once_per_theme():
+    cache = TemplateCache()
+    first, second = cache.presentation(theme=THEME), cache.presentation(theme=THEME)
+    assert len(cache._prototypes) == 1
+    cache.presentation()
+    assert len(cache._prototypes) == 2
+    cache.clear()
+    assert not cache._prototypes
+    assert first is not second
+
+
+def test_copies_are_independent():
+    cache = TemplateCache()
+    prs = cache.presentation(theme=THEME)
+    prs.slides.add_slide(prs.slide_layouts[1]).shapes.title.text = "Only here"
+    assert len(cache.presentation(theme=THEME).slides) == 0
+
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    reopened = Presentation(io.BytesIO(buffer.getvalue()))
+    assert [slide.shapes.title.text for slide in reopened.slides] == ["Only here"]
+
+
+def test_template_paths_are_cached_by_absolute_path(tmp_path, monkeypatch):
+    template = tmp_path / 'template.pptx'
+    Presentation().save(str(template))
+    cache = TemplateCache()
+    cache.presentation(str(template))
+    monkeypatch.chdir(tmp_path)
+    cache.presentation('template.pptx')
+    assert list(cache._prototypes) == [(str(template), None)]
@@ -0,0 +1,50 @@
+from pptx import Presentation
+
+from text_fit import CONTINUED, check_fit, line_count, split_overflowing
+
+
+def bullet_slide(prs, title, lines):
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = title
+    body = slide.placeholders[1].text_frame
+    body.text = lines[0]
+    for line in lines[1:]:
+        body.add_paragraph().text = line
+    return slide
+
+
+def texts(slide):
+    return [p.text for p in slide.placeholders[1].text_frame.paragraphs]
+
+
+def test_line_count_wraps_by_width():
+    text = "Plug and Charge authenticates the vehicle with a contract certificate"
+    assert line_count(text, 2000, 18) == 1
+    assert line_count(text, 200, 18) > line_count(text, 400, 18) > 1
+    assert line_count('', 200, 18) == 1
+
+
+def test_fitting_slides_are_left_alone():
+    prs = Presentation()
+    bullet_slide(prs, "Short", ["One", "Two"])
+    assert check_fit(prs) == []
+    assert split_overflowing(prs) == [] and len(prs.slides) == 1
+
+
+def test_overflow_moves_onto_continuation_slides():
+    prs = Presentation()
+    lines = [f"Bullet number {n}" for n in range(40)]
+    bullet_slide(prs, "Long", lines)
+    bullet_slide(prs, "After", ["Stays last"])
+    (overflow,) = check_fit(prs)
+    assert overflow.title == "Long" and 0 < overflow.fits < 40
+
+    split_overflowing(prs)
+    assert check_fit(prs) == []
+    titles = [slide.shapes.title.text for slide in prs.slides]
+    assert titles[0] == "Long" and titles[-1] == "After"
+    assert all(title == "Long" + CONTINUED for title in titles[1:-1]) and len(titles) > 2
+    # Every paragraph kept, in order, and the slide parts renumbered to match
+    assert [text for slide in list(prs.slides)[:-1] for text in texts(slide)] == lines
+    assert [slide.part.partname for slide in prs.slides] == [f"/ppt/slides/slide{n}.xml"
+                                                              for n in range(1, len(titles) + 1)]
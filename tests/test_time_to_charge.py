@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from time_to_charge import WORKFLOWS, TimeToCharge, simulate, site_parameters, time_to_charge_slide
+
+SESSIONS = 20_000
+
+
+def test_fixed_seed_is_reproducible():
+    first, second = simulate(sessions=SESSIONS, seed=7), simulate(sessions=SESSIONS, seed=7)
+    for label in WORKFLOWS:
+        assert np.array_equal(first.workflows[label], second.workflows[label])
+    other = simulate(sessions=SESSIONS, seed=8)
+    assert not np.array_equal(first.workflows[WORKFLOWS[3]], other.workflows[WORKFLOWS[3]])
+
+
+def test_plug_and_charge_starts_sooner():
+    result = simulate(sessions=SESSIONS, seed=1)
+    assert len(result.workflows[WORKFLOWS[2]]) == len(result.workflows[WORKFLOWS[3]]) == SESSIONS
+    for label in WORKFLOWS:
+        p50, p90, p99 = result.percentiles(label)
+        assert 0 < p50 < p90 < p99
+    assert result.percentiles(WORKFLOWS[3]) < result.percentiles(WORKFLOWS[2])
+    assert result.percentiles(WORKFLOWS[0], (50,)) < result.percentiles(WORKFLOWS[1], (50,))
+
+
+def test_site_parameters_move_the_distribution():
+    slow = simulate({'backhaul_s': [5.0, 20.0]}, sessions=SESSIONS, seed=1)
+    fast = simulate(sessions=SESSIONS, seed=1)
+    assert slow.percentiles(WORKFLOWS[3], (50,))[0] > fast.percentiles(WORKFLOWS[3], (50,))[0] + 4
+    # Without PIN and app users the site mix is all RFID
+    rfid_only = simulate({'rfid_share': 1.0, 'app_share': 0.0}, sessions=SESSIONS, seed=1)
+    assert set(rfid_only.workflows) == {WORKFLOWS[0], WORKFLOWS[2], WORKFLOWS[3]}
+
+
+def test_percentiles_histogram_and_cdf():
+    values = np.arange(101, dtype=np.float32)
+    result = TimeToCharge(101, {}, {WORKFLOWS[3]: values})
+    assert result.percentiles(WORKFLOWS[3]) == [50.0, 90.0, 99.0]
+    names, shares = result.histogram([WORKFLOWS[3]], bin_seconds=25, bins=4)
+    assert names == ['0-25', '25-50', '50-75', '75+']
+    assert list(shares[WORKFLOWS[3]] * 101) == [25, 25, 25, 26]
+    x, fractions = result.cdf(points=5)
+    assert list(x) == [0, 30, 60, 90, 120]
+    assert np.all(np.diff(fractions[WORKFLOWS[3]]) >= 0) and fractions[WORKFLOWS[3]][-1] == 1
+
+
+@pytest.mark.parametrize('site, message', [
+    ({'warp_s': [1, 2]}, "Unknown site parameter"),
+    ({'tls_s': [2, 1]}, "median <= p90"),
+    ({'tls_s': 1}, r"\[median, p90\]"),
+    ({'rfid_share': 1.5}, "between 0 and 1"),
+    ({'rfid_share': 0.7, 'app_share': 0.5}, "more than 1"),
+    ([1], "must be an object"),
+])
+def test_bad_site_parameters(site, message):
+    with pytest.raises(ValueError, match=message):
+        site_parameters(site)
+
+
+def test_slide_lists_every_workflow():
+    slide = time_to_charge_slide(simulate(sessions=SESSIONS, seed=1))
+    chart = slide.sections[0].items[0]
+    assert [name for name, _, _ in chart.series] == list(WORKFLOWS)
+    assert "sooner at the median" in slide.sections[1].items[1].text
@@ -0,0 +1,90 @@
+import gzip
+
+from v2g_traces import SessionIndex, parse_trace
+
+NS = 'xmlns="urn:iso:15118:2:2013:MsgDef" xmlns:h="urn:iso:15118:2:2013:MsgHeader" ' \
+     'xmlns:b="urn:iso:15118:2:2013:MsgBody"'
+
+
+def message(time, session_id, body, connection='EVSE-1'):
+    return (f'<message time="{time}" connection="{connection}"><V2G_Message {NS}>'
+            f'<Header><h:SessionID>{session_id}</h:SessionID></Header><Body>{body}</Body>'
+            f'</V2G_Message></message>\n')
+
+
+def session(start, session_id, payment='Contract', stop=True, connection='EVSE-1'):
+    t = f'2024-05-01T10:{start:02d}'
+    records = [
+        message(f'{t}:00.000Z', '00', '<b:SessionSetupReq/>', connection),
+        message(f'{t}:00.100Z', session_id, '<b:SessionSetupRes><b:ResponseCode>OK_NewSessionEstablished'
+                                            '</b:ResponseCode></b:SessionSetupRes>', connection),
+        message(f'{t}:01.000Z', session_id, f'<b:PaymentServiceSelectionReq><b:SelectedPaymentOption>{payment}'
+                                            '</b:SelectedPaymentOption></b:PaymentServiceSelectionReq>', connection),
+        message(f'{t}:01.050Z', session_id, '<b:PaymentServiceSelectionRes><b:ResponseCode>OK</b:ResponseCode>'
+                                            '</b:PaymentServiceSelectionRes>', connection),
+    ]
+    for second in (2, 3, 4):
+        records.append(message(f'{t}:{second:02d}.000Z', session_id, '<b:CurrentDemandReq/>', connection))
+        records.append(message(f'{t}:{second:02d}.020Z', session_id,
+                               '<b:CurrentDemandRes><b:ResponseCode>OK</b:ResponseCode></b:CurrentDemandRes>',
+                               connection))
+    if stop:
+        records.append(message(f'{t}:05.000Z', session_id, '<b:SessionStopReq/>', connection))
+        records.append(message(f'{t}:05.010Z', session_id, '<b:SessionStopRes><b:ResponseCode>OK</b:ResponseCode>'
+                                                           '</b:SessionStopRes>', connection))
+    return ''.join(records)
+
+
+def write_trace(path, *sessions):
+    text = '<?xml version="1.0"?>\n<v2gTrace>\n' + ''.join(sessions) + '</v2gTrace>\n'
+    if str(path).endswith('.gz'):
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_sessions_and_collapsed_exchanges(tmp_path):
+    trace = write_trace(tmp_path / 'trace.xml', session(0, 'A1B2'), session(1, 'C3D4', 'ExternalPayment', stop=False))
+    first, second = parse_trace(trace)
+    assert (first.session_id, first.protocol, first.payment) == ('A1B2', 'ISO 15118-2', 'PnC')
+    assert first.complete and not first.failed and first.messages == 12
+    # SessionSetupReq arrives before the session ID and still belongs to the session
+    assert [e.name for e in first.exchanges] == ['SessionSetup', 'PaymentServiceSelection', 'CurrentDemand',
+                                                  'SessionStop']
+    loop = first.exchanges[2]
+    assert (loop.count, loop.start_ms, loop.end_ms, loop.latency_ms) == (3, 2000, 4020, 60)
+    assert first.setup_ms == 2000 and first.duration_ms == 5010
+    assert (second.session_id, second.payment, second.complete) == ('C3D4', 'EIM', False)
+
+
+def test_interleaved_connections_and_gzip(tmp_path):
+    a, b = session(0, 'AAAA', connection='EVSE-1'), session(0, 'BBBB', connection='EVSE-2')
+    # Alternate whole records of the two connections
+    lines = [line for pair in zip(a.splitlines(True), b.splitlines(True)) for line in pair]
+    trace = write_trace(tmp_path / 'trace.xml.gz', ''.join(lines))
+    sessions = {s.session_id: s for s in parse_trace(trace)}
+    assert set(sessions) == {'AAAA', 'BBBB'}
+    assert all(s.complete and s.messages == 12 for s in sessions.values())
+
+
+def test_truncated_capture_keeps_whole_records(tmp_path):
+    path = tmp_path / 'cut.xml'
+    text = '<v2gTrace>\n' + session(0, 'A1B2')
+    path.write_text(text[:-40], encoding='utf-8')
+    (cut,) = parse_trace(str(path))
+    assert cut.messages == 11 and not cut.complete
+
+
+def test_index_stats_and_representative(tmp_path):
+    trace = write_trace(tmp_path / 'trace.xml', session(0, 'A1B2'), session(1, 'C3D4'), session(2, 'E5F6', 'EIM'))
+    with SessionIndex(str(tmp_path / 'index.db')) as index:
+        assert index.add_trace(trace) == 3
+        assert index.add_trace(trace) is None  # unchanged traces are skipped
+        assert index.counts() == (1, 3)
+        parsed = {s.session_id: s for s in parse_trace(trace)}
+        assert index.session('c3d4').exchanges == parsed['C3D4'].exchanges
+        assert index.representative('ISO 15118-2', 'PnC').session_id in ('A1B2', 'C3D4')
+        assert [(protocol, payment, count) for protocol, payment, count, _, _ in index.stats()] == \
+            [('ISO 15118-2', 'PnC', 2), ('ISO 15118-2', 'EIM', 1)]
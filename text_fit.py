@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Text Fit Checker
+Measures every paragraph of a slide's content placeholder against its box with
+precomputed glyph-width tables (no rendering) and moves overflowing paragraphs
+onto "(cont.)" slides inserted right after the original
+"""
+
+import argparse
+import math
+import sys
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+
+from pptx.oxml.ns import qn
+from pptx.util import Emu
+
+from deck_theme import HEADING, MONOSPACE_FONT
+
+CONTINUED = " (cont.)"
+
+# Advance widths in 1/1000 em for printable ASCII (space .. ~)
+_CALIBRI_ASCII = (
+    226, 266, 401, 498, 507, 715, 682, 221, 303, 303, 498, 498, 250, 306, 252, 386,
+    507, 507, 507, 507, 507, 507, 507, 507, 507, 507, 268, 268, 498, 498, 498, 463,
+    894, 579, 544, 533, 615, 488, 459, 631, 623, 252, 319, 520, 420, 855, 646, 662,
+    517, 673, 543, 459, 487, 642, 567, 890, 519, 487, 468, 307, 386, 307, 498, 498,
+    291, 479, 525, 423, 525, 498, 305, 471, 525, 229, 239, 455, 229, 799, 525, 527,
+    525, 525, 349, 391, 335, 525, 452, 715, 433, 453, 395, 314, 460, 314, 498,
+)
+_CALIBRI_OTHER = {
+    '•': 350, '–': 498, '—': 905, '‘': 250, '’': 250, '“': 418, '”': 418, '…': 750,
+    '►': 720, '◄': 720, '▲': 720, '▼': 720, '→': 720, '←': 720, '↔': 720,
+    '€': 507, '°': 333, '±': 498, '×': 498, '≤': 498, '≥': 498, '✓': 720,
+}
+_CALIBRI_DEFAULT = 507   # average Latin glyph
+_WIDE = 1000             # emoji and East Asian wide glyphs
+BOLD_FACTOR = 1.04       # Calibri Bold runs about 4% wider
+LINE_HEIGHT = 1.2        # Calibri/Courier line pitch as a multiple of the font size
+
+
+def _calibri_width(char):
+    code = ord(char)
+    if 32 <= code <= 126:
+        return _CALIBRI_ASCII[code - 32]
+    if char in _CALIBRI_OTHER:
+        return _CALIBRI_OTHER[char]
+    if unicodedata.east_asian_width(char) in 'WF' or code >= 0x1F000:
+        return _WIDE
+    if unicodedata.combining(char) or code in (0xFE0F, 0x200D):
+        return 0
+    return _CALIBRI_DEFAULT
+
+
+def _monospace_width(char):
+    code = ord(char)
+    if unicodedata.east_asian_width(char) in 'WF' or code >= 0x1F000:
+        return _WIDE
+    if unicodedata.combining(char) or code in (0xFE0F, 0x200D):
+        return 0
+    return 600
+
+
+# Fonts measured from the tables; anything else falls back to Calibri
+FONT_METRICS = {
+    'Calibri': _calibri_width,
+    MONOSPACE_FONT: _monospace_width,
+    'Courier': _monospace_width,
+}
+
+
+@lru_cache(maxsize=65536)
+def word_width(word, font='Calibri'):
+    """Width of a word in 1/1000 em, cached across slides and builds"""
+    width_of = FONT_METRICS.get(font, _calibri_width)
+    return sum(width_of(char) for char in word)
+
+
+@lru_cache(maxsize=16384)
+def line_count(text, width_pt, size_pt, font='Calibri', bold=False):
+    """Lines a paragraph wraps to at the given width (greedy word wrap, like PowerPoint)"""
+    em = size_pt / 1000 * (BOLD_FACTOR if bold else 1)
+    space = word_width(' ', font) * em
+    lines = 0
+    for segment in text.split('\v'):  # a:br line breaks
+        lines += 1
+        x = 0
+        for word in segment.split(' '):
+            w = word_width(word, font) * em
+            if x and x + space + w > width_pt:
+                lines += 1
+                x = 0
+            elif x:
+                x += space
+            if w > width_pt:
+                # Unbreakable run longer than the line: PowerPoint breaks it mid-word
+                extra = math.ceil(w / width_pt) - 1
+                lines += extra
+                w -= extra * width_pt
+            x += w
+    return lines
+
+
+@dataclass
+class LevelStyle:
+    """Inherited paragraph properties of one content placeholder level"""
+    margin: int       # EMU from the box's left inset to the text
+    size: float       # pt
+    bold: bool
+    font: str
+    space_before: float  # fraction of a line
+
+
+_DEFAULT_LEVEL = LevelStyle(Emu(342900), 18.0, False, 'Calibri', 0.2)
+
+
+def level_styles(prs):
+    """{level: LevelStyle} read from the slide master's body text style"""
+    body_style = prs.slide_master.element.find(qn('p:txStyles')).find(qn('p:bodyStyle'))
+    styles = {}
+    for level in range(9):
+        lvl = body_style.find(qn(f'a:lvl{level + 1}pPr'))
+        if lvl is None:
+            styles[level] = _DEFAULT_LEVEL
+            continue
+        def_rpr = lvl.find(qn('a:defRPr'))
+        size = int(def_rpr.get('sz', '1800')) / 100 if def_rpr is not None else 18.0
+        bold = def_rpr is not None and def_rpr.get('b') == '1'
+        latin = def_rpr.find(qn('a:latin')) if def_rpr is not None else None
+        font = latin.get('typeface') if latin is not None else 'Calibri'
+        if font.startswith('+'):  # theme font reference (+mn-lt); the default theme uses Calibri
+            font = 'Calibri'
+        pct = lvl.find(qn('a:spcBef') + '/' + qn('a:spcPct'))
+        space_before = int(pct.get('val')) / 100000 if pct is not None else 0.0
+        styles[level] = LevelStyle(Emu(int(lvl.get('marL', '0'))), size, bold, font, space_before)
+    return styles
+
+
+_P = qn('a:p')
+_PPR = qn('a:pPr')
+_DEF_RPR = qn('a:defRPr')
+_RPR = qn('a:rPr')
+_LATIN = qn('a:latin')
+_SPC_BEF = qn('a:spcBef')
+_SPC_PTS = qn('a:spcPts')
+_TEXT_TAGS = {qn('a:t'): None, qn('a:br'): '\v'}
+_SP = qn('p:sp')
+_PH = '/'.join((qn('p:nvSpPr'), qn('p:nvPr'), qn('p:ph')))
+_TX_BODY = qn('p:txBody')
+_BODY_PR = qn('a:bodyPr')
+_EXT = '/'.join((qn('p:spPr'), qn('a:xfrm'), qn('a:ext')))
+_TITLES = ('title', 'ctrTitle')
+_BODIES = ('body', 'obj')
+
+
+def paragraph_text(p):
+    """Text of an a:p element, line breaks as vertical tabs (as python-pptx reports them)"""
+    return ''.join(e.text or '' if tag is None else tag
+                   for e in p.iter(*_TEXT_TAGS) for tag in [_TEXT_TAGS[e.tag]])
+
+
+def paragraph_level(p):
+    """Outline level of an a:p element"""
+    ppr = p.find(_PPR)
+    return int(ppr.get('lvl', '0')) if ppr is not None else 0
+
+
+def paragraph_height(p, width, styles, first=False):
+    """Height in points of one a:p element laid out at width (EMU) in its placeholder
+
+    Space before is not applied to the first paragraph of a text frame.
+    """
+    ppr = p.find(_PPR)
+    style = styles.get(paragraph_level(p), _DEFAULT_LEVEL)
+    size, bold, font = style.size, style.bold, style.font
+    # Explicit paragraph defaults and run properties override the inherited level
+    rprs = [ppr.find(_DEF_RPR)] if ppr is not None else []
+    rprs += p.iter(_RPR)
+    for rpr in rprs:
+        if rpr is None:
+            continue
+        if rpr.get('sz'):
+            size = int(rpr.get('sz')) / 100
+        if rpr.get('b'):
+            bold = rpr.get('b') == '1'
+        latin = rpr.find(_LATIN)
+        if latin is not None and not latin.get('typeface', '+').startswith('+'):
+            font = latin.get('typeface')
+
+    lines = line_count(paragraph_text(p), Emu(width - style.margin).pt, size, font, bold)
+    pitch = size * LINE_HEIGHT
+    if first:
+        return lines * pitch
+    space_before = style.space_before * pitch
+    spacing = ppr.find(_SPC_BEF) if ppr is not None else None
+    if spacing is not None and len(spacing):
+        value = int(spacing[0].get('val'))
+        space_before = value / 100 if spacing[0].tag == _SPC_PTS else value / 100000 * pitch
+    return space_before + lines * pitch
+
+
+@dataclass
+class Overflow:
+    """A content placeholder whose text does not fit its box"""
+    index: int          # slide index
+    title: str
+    height: float       # pt of text
+    available: float    # pt of box
+    fits: int           # paragraphs that fit
+
+
+class FitChecker:
+    """Measures content placeholders of one presentation
+
+    Level styles are read from the master once and placeholder boxes inherited
+    from a layout are resolved once per layout, so checking a slide only costs
+    walking its paragraphs.
+    """
+
+    def __init__(self, prs):
+        self.prs = prs
+        self.styles = level_styles(prs)
+        self._boxes = {}  # layout partname -> content (width, height)
+
+    @staticmethod
+    def placeholders(slide):
+        """(title, content) p:sp elements of a title-and-content slide, or None for either"""
+        title = content = None
+        for sp in slide.shapes._spTree.iterchildren(_SP):
+            ph = sp.find(_PH)
+            if ph is None:
+                continue
+            ph_type = ph.get('type', 'obj')
+            if ph_type in _TITLES:
+                title = sp
+            elif ph.get('idx') == '1' and ph_type in _BODIES and sp.find(_TX_BODY) is not None:
+                content = sp
+        return title, content
+
+    def text_box(self, slide, sp):
+        """(width, height) in EMU available to text inside a placeholder"""
+        ext = sp.find(_EXT)
+        if ext is not None:
+            width, height = int(ext.get('cx')), int(ext.get('cy'))
+        else:
+            key = slide.slide_layout.part.partname
+            box = self._boxes.get(key)
+            if box is None:
+                inherited = slide.slide_layout.placeholders.get(idx=1)
+                box = self._boxes[key] = (inherited.width, inherited.height)
+            width, height = box
+        body_pr = sp.find(_TX_BODY).find(_BODY_PR)
+        insets = [int(body_pr.get(name, default)) for name, default in
+                  (('lIns', 91440), ('rIns', 91440), ('tIns', 45720), ('bIns', 45720))]
+        return width - insets[0] - insets[1], height - insets[2] - insets[3]
+
+    def measure(self, slide, index):
+        """Overflow for a slide's content placeholder, or None when its text fits"""
+        title, sp = self.placeholders(slide)
+        if title is None or sp is None:
+            return None
+        width, height = self.text_box(slide, sp)
+        available = Emu(height).pt
+        used = 0.0
+        fits = None
+        for n, p in enumerate(sp.find(_TX_BODY).iterchildren(_P)):
+            used += paragraph_height(p, width, self.styles, first=n == 0)
+            if fits is None and used > available:
+                fits = n
+        if fits is None:
+            return None
+        title = ' '.join(paragraph_text(p) for p in title.find(_TX_BODY).iterchildren(_P))
+        return Overflow(index, title, used, available, fits)
+
+
+def check_fit(prs):
+    """Overflow for every slide whose content placeholder overflows"""
+    checker = FitChecker(prs)
+    overflows = []
+    for index, slide in enumerate(prs.slides):
+        overflow = checker.measure(slide, index)
+        if overflow is not None:
+            overflows.append(overflow)
+    return overflows
+
+
+def _split_point(paragraphs, fits):
+    """First paragraph to move, or None when the slide cannot be split"""
+    # Spacer paragraphs reserve room for shapes drawn on this slide; keep them here
+    spacers = [n for n, p in enumerate(paragraphs) if not paragraph_text(p).strip()]
+    first = max(spacers, default=0) + 1
+    # Move the whole heading group the overflow falls in, if something stays behind
+    split = fits
+    while split > first and paragraph_level(paragraphs[split]) != HEADING:
+        split -= 1
+    if split <= first and paragraph_level(paragraphs[split]) != HEADING:
+        split = fits
+    if split < first or split >= len(paragraphs):
+        return None
+    return split
+
+
+def _add_continuation(prs, slide, index):
+    """Insert an empty continuation of slide right after it"""
+    continuation = prs.slides.add_slide(slide.slide_layout)
+    title = slide.shapes.title.text
+    if not title.endswith(CONTINUED):
+        title += CONTINUED
+    continuation.shapes.title.text = title
+    sld_id_lst = prs.slides._sldIdLst
+    sld_id = sld_id_lst[-1]
+    sld_id_lst.remove(sld_id)
+    sld_id_lst.insert(index + 1, sld_id)
+    return continuation
+
+
+def split_overflowing(prs):
+    """Move overflowing paragraphs onto "(cont.)" slides
+
+    Returns the overflows found; those whose first paragraph alone does not fit
+    are left in place.
+    """
+    checker = FitChecker(prs)
+    overflows = []
+    split_any = False
+    index = 0
+    while index < len(prs.slides):
+        slide = prs.slides[index]
+        overflow = checker.measure(slide, index)
+        if overflow is not None:
+            overflows.append(overflow)
+            source = checker.placeholders(slide)[1].find(_TX_BODY)
+            paragraphs = list(source.iterchildren(_P))
+            split = _split_point(paragraphs, overflow.fits)
+            if split is not None:
+                target = checker.placeholders(_add_continuation(prs, slide, index))[1].find(_TX_BODY)
+                for p in list(target.iterchildren(_P)):
+                    target.remove(p)
+                for p in paragraphs[split:]:
+                    target.append(p)
+                split_any = True
+        index += 1
+    if split_any:
+        prs.part.rename_slide_parts([sld_id.rId for sld_id in prs.slides._sldIdLst])
+    return overflows
+
+
+def main():
+    from pptx import Presentation
+
+    parser = argparse.ArgumentParser(description="Report (and optionally split) slides whose text overflows")
+    parser.add_argument('deck', help=".pptx file to check")
+    parser.add_argument('--split', metavar='OUTPUT',
+                        help="write a copy with overflowing slides split into (cont.) slides")
+    args = parser.parse_args()
+
+    prs = Presentation(args.deck)
+    overflows = split_overflowing(prs) if args.split else check_fit(prs)
+    for o in overflows:
+        print(f"❌ Slide {o.index + 1} '{o.title}': {o.height:.0f}pt of text in a {o.available:.0f}pt box")
+    if args.split:
+        prs.save(args.split)
+        print(f"✅ Saved {len(prs.slides)} slides: {args.split}")
+    elif not overflows:
+        print(f"✅ All {len(prs.slides)} slides fit")
+    return 1 if overflows and not args.split else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Time-to-Charge Model
+Monte Carlo model of the time from arrival to energy transfer in the OCPP 1.6
+and ISO 15118 Plug-and-Charge workflows of workflow_diagrams.md, sampled with
+NumPy in vectorized batches of millions of sessions
+
+Each workflow step is a log-normal latency given by its median and 90th
+percentile in seconds, so site parameters read like measurements:
+{"backhaul_s": [0.8, 4.0]} models a station on a slow cellular link. Shares
+and probabilities are plain fractions. Steps after the start of charging
+(monitoring, billing, receipt) do not change the time to charge.
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from deck_theme import DIAGRAM
+from slide_ir import Chart, Listing, Section, Slide, Text
+
+SESSIONS = 2_000_000
+SEED = 15118
+PERCENTILES = (50, 90, 99)
+CDF_POINTS = 61
+# z-score of the 90th percentile of a standard normal
+_Z90 = 1.2815515655446004
+
+# (median, p90) in seconds, or a fraction; a variant's "site" overrides any of them
+SITE_DEFAULTS = {
+    # Both workflows
+    'arrival_s': (30.0, 75.0),       # step 1: park, reach the station, plug in
+    'startup_s': (6.0, 14.0),        # step 5: start transaction, close contactors, ramp up
+    'backhaul_s': (0.25, 0.9),       # station <-> central system round trip
+    'validation_s': (0.15, 0.6),     # central system authorizes an id tag or contract
+    # OCPP 1.6, step 2: manual authentication (PIN/card terminal takes the remaining share)
+    'rfid_share': 0.55,
+    'app_share': 0.35,
+    'rfid_s': (4.0, 12.0),           # find the card, hold it to the reader
+    'app_s': (35.0, 90.0),           # unlock the phone, open the app, scan the QR code
+    'pin_s': (20.0, 45.0),
+    'auth_retry': 0.08,              # an attempt is rejected and repeated
+    'local_auth': 0.2,               # RFID accepted from the local list, skipping steps 3-4
+    # ISO 15118 Plug & Charge, steps 2-3: automatic handshake and charge parameters
+    'slac_s': (2.5, 4.0),            # HomePlug Green PHY link setup
+    'tls_s': (0.6, 1.5),             # TLS handshake over PLC
+    'certificate_s': (0.4, 1.2),     # contract certificate chain and OCSP checks
+    'parameters_s': (0.3, 0.8),      # ChargeParameterDiscovery
+    'pnc_fallback': 0.04,            # Plug & Charge fails and the user authenticates manually
+    'fallback_s': (10.0, 30.0),      # until the station offers manual authentication
+}
+
+RFID, APP, PIN = range(3)
+WORKFLOWS = ('OCPP 1.6, RFID', 'OCPP 1.6, app', 'OCPP 1.6, site mix', 'ISO 15118 Plug & Charge')
+# Theme color per workflow in the CDF chart
+WORKFLOW_COLORS = ('ACCENT_ORANGE', 'TEXT_DARK', 'PRIMARY_BLUE', 'SECONDARY_GREEN')
+
+
+def site_parameters(overrides=None):
+    """SITE_DEFAULTS updated with overrides, validated; latencies become (median, p90) tuples"""
+    if overrides is not None and not isinstance(overrides, dict):
+        raise ValueError(f"site parameters must be an object of name: value, got {overrides!r}")
+    site = dict(SITE_DEFAULTS)
+    for name, value in (overrides or {}).items():
+        if name not in SITE_DEFAULTS:
+            raise ValueError(f"Unknown site parameter {name!r}; expected one of {', '.join(sorted(SITE_DEFAULTS))}")
+        if isinstance(SITE_DEFAULTS[name], tuple):
+            if not isinstance(value, (list, tuple)) or len(value) != 2:
+                raise ValueError(f"site parameter {name} needs [median, p90] in seconds, got {value!r}")
+            median, p90 = float(value[0]), float(value[1])
+            if not 0 < median <= p90:
+                raise ValueError(f"site parameter {name} needs 0 < median <= p90, got {value!r}")
+            site[name] = (median, p90)
+        else:
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 1:
+                raise ValueError(f"site parameter {name} must be a fraction between 0 and 1, got {value!r}")
+            site[name] = float(value)
+    if site['rfid_share'] + site['app_share'] > 1:
+        raise ValueError("site parameters rfid_share and app_share add up to more than 1")
+    if site['auth_retry'] == 1:
+        raise ValueError("site parameter auth_retry must be below 1")
+    return site
+
+
+def _lognormal(rng, spec, size):
+    """size float32 draws of the log-normal with the given (median, p90)"""
+    median, p90 = spec
+    z = rng.standard_normal(size, dtype=np.float32)
+    z *= np.float32(np.log(p90 / median) / _Z90)
+    z += np.float32(np.log(median))
+    return np.exp(z, out=z)
+
+
+def _by_method(rng, site, method):
+    """One manual authentication attempt per element of method"""
+    seconds = np.empty(len(method), dtype=np.float32)
+    for index, name in ((RFID, 'rfid_s'), (APP, 'app_s'), (PIN, 'pin_s')):
+        mask = method == index
+        seconds[mask] = _lognormal(rng, site[name], np.count_nonzero(mask))
+    return seconds
+
+
+def _manual_authorization(rng, site, n):
+    """OCPP 1.6 steps 2-4 for n sessions: (seconds, method)"""
+    u = rng.random(n, dtype=np.float32)
+    method = (u >= site['rfid_share']).astype(np.int8) + (u >= site['rfid_share'] + site['app_share'])
+    seconds = _by_method(rng, site, method)
+    # Rejected attempts are repeated; a few sessions need several, most none
+    retries = rng.geometric(1 - site['auth_retry'], n) - 1
+    session = np.repeat(np.arange(n), retries)
+    if len(session):
+        seconds += np.bincount(session, weights=_by_method(rng, site, method[session]),
+                               minlength=n).astype(np.float32)
+    # The id tag goes to the central system unless the local list knows it; app starts always do
+    backend = _lognormal(rng, site['backhaul_s'], n) + _lognormal(rng, site['validation_s'], n)
+    backend[(method == RFID) & (rng.random(n, dtype=np.float32) < site['local_auth'])] = 0
+    seconds += backend
+    return seconds, method
+
+
+def _plug_and_charge(rng, site, n):
+    """ISO 15118 steps 2-3 for n sessions, including fallbacks to manual authentication"""
+    seconds = _lognormal(rng, site['slac_s'], n)
+    for name in ('tls_s', 'certificate_s', 'backhaul_s', 'validation_s', 'parameters_s'):
+        seconds += _lognormal(rng, site[name], n)
+    failed = np.flatnonzero(rng.random(n, dtype=np.float32) < site['pnc_fallback'])
+    manual, _ = _manual_authorization(rng, site, len(failed))
+    seconds[failed] += _lognormal(rng, site['fallback_s'], len(failed)) + manual
+    return seconds
+
+
+@dataclass
+class TimeToCharge:
+    """Simulated seconds from arrival to energy transfer, sorted, per workflow"""
+    sessions: int
+    site: dict
+    workflows: dict   # WORKFLOWS label -> sorted float32 array
+
+    def percentiles(self, label, percentiles=PERCENTILES):
+        values = self.workflows[label]
+        return [float(values[round(p / 100 * (len(values) - 1))]) for p in percentiles]
+
+    def histogram(self, labels, bin_seconds=15, bins=16):
+        """(bin names, {label: share of sessions per bin}); the last bin is open-ended"""
+        edges = np.arange(bins) * bin_seconds
+        names = [f"{start}-{start + bin_seconds}" for start in edges[:-1]] + [f"{edges[-1]}+"]
+        shares = {}
+        for label in labels:
+            values = self.workflows[label]
+            counts = np.diff(np.searchsorted(values, edges, side='left'), append=len(values))
+            shares[label] = counts / len(values)
+        return names, shares
+
+    def cdf(self, points=CDF_POINTS):
+        """(seconds, {label: fraction charging by then}) up to the slowest 99th percentile"""
+        slowest = max(self.percentiles(label, (99,))[0] for label in self.workflows)
+        x = np.linspace(0, np.ceil(slowest / 30) * 30, points, dtype=np.float32)
+        return x, {label: np.searchsorted(values, x, side='right') / len(values)
+                   for label, values in self.workflows.items()}
+
+
+def simulate(site=None, sessions=SESSIONS, seed=SEED):
+    """Run both workflows for sessions simulated sessions each"""
+    site = site_parameters(site)
+    rng = np.random.default_rng(seed)
+    arrival = _lognormal(rng, site['arrival_s'], sessions)
+    manual, method = _manual_authorization(rng, site, sessions)
+    ocpp = arrival + manual + _lognormal(rng, site['startup_s'], sessions)
+    # Same arrivals and start-up for both, so the difference is the workflow alone
+    pnc = arrival + _plug_and_charge(rng, site, sessions) + _lognormal(rng, site['startup_s'], sessions)
+    workflows = {
+        WORKFLOWS[0]: np.sort(ocpp[method == RFID]),
+        WORKFLOWS[1]: np.sort(ocpp[method == APP]),
+        WORKFLOWS[2]: np.sort(ocpp),
+        WORKFLOWS[3]: np.sort(pnc),
+    }
+    return TimeToCharge(sessions, site, {label: values for label, values in workflows.items() if len(values)})
+
+
+@lru_cache(maxsize=8)
+def _cached(site_items, sessions, seed):
+    return simulate(dict(site_items), sessions, seed)
+
+
+def cached_simulation(site=None, sessions=SESSIONS, seed=SEED):
+    """simulate(), memoized per site for watch mode and repeated builds in one process"""
+    items = tuple(sorted(site_parameters(site).items()))
+    return _cached(items, sessions, seed)
+
+
+def _duration(seconds):
+    return f"{seconds:.0f} s" if seconds < 120 else f"{seconds / 60:.1f} min"
+
+
+def percentile_table(result):
+    """Fixed-width percentile rows, one per workflow"""
+    width = max(len(label) for label in result.workflows)
+    lines = [f"{'':<{width}}" + ''.join(f"{f'p{p}':>9}" for p in PERCENTILES)]
+    for label in result.workflows:
+        lines.append(f"{label:<{width}}" + ''.join(f"{_duration(v):>9}" for v in result.percentiles(label)))
+    return '\n'.join(lines)
+
+
+def time_to_charge_slide(result):
+    """Slide IR: CDF chart and percentile table of a TimeToCharge"""
+    x, fractions = result.cdf()
+    series = tuple((label, WORKFLOW_COLORS[WORKFLOWS.index(label)], tuple(round(float(y), 4) for y in fractions[label]))
+                   for label in result.workflows)
+    chart = Chart(tuple(round(float(v), 1) for v in x), series, x_title='Seconds from arrival',
+                  y_title='Sessions charging')
+    items = (Text(f"{result.sessions:,} simulated sessions per workflow; step latencies per site",
+                  size=12, color='TEXT_DARK', bold=False, italic=True),)
+    mix, pnc = WORKFLOWS[2], WORKFLOWS[3]
+    if mix in result.workflows and pnc in result.workflows:
+        (mix50, mix90), (pnc50, pnc90) = (result.percentiles(label, (50, 90)) for label in (mix, pnc))
+        items = (Text(f"Plug & Charge starts charging {_duration(mix50 - pnc50)} sooner at the median, "
+                      f"{_duration(mix90 - pnc90)} sooner at p90",
+                      size=14, color='SECONDARY_GREEN', bold=True),) + items
+    return Slide("Workflow Comparison: Time to Charge", (
+        Section("Share of Sessions Charging After Arrival:", items=(chart,)),
+        Section(items=(Listing(percentile_table(result), level=DIAGRAM),) + items),
+    ), name='time_to_charge')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate OCPP 1.6 vs ISO 15118 time to charge")
+    parser.add_argument('--site', metavar='JSON', help="site parameters overriding SITE_DEFAULTS")
+    parser.add_argument('--sessions', type=int, default=SESSIONS, help="simulated sessions per workflow")
+    parser.add_argument('--seed', type=int, default=SEED)
+    args = parser.parse_args()
+
+    overrides = {}
+    if args.site:
+        with open(args.site, encoding='utf-8') as f:
+            overrides = json.load(f)
+    start = time.perf_counter()
+    result = simulate(overrides, args.sessions, args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"📊 {args.sessions:,} sessions per workflow simulated in {elapsed:.2f}s")
+    print(percentile_table(result))
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except (OSError, ValueError) as e:
+        print(f"❌ Error simulating sessions: {e}")
+        sys.exit(1)
@@ -0,0 +1,629 @@
+#!/usr/bin/env python3
+"""
+ISO 15118 Session Traces
+Streams recorded V2G message traces (XML-decoded EXI), groups the messages
+into charging sessions, indexes them by session ID in SQLite and renders
+chosen sessions as native sequence-diagram and timing slides
+
+A trace is one XML document whose top-level elements are decoded messages,
+ISO 15118-2 / DIN 70121 V2G_Message, ISO 15118-20 message roots or
+supportedAppProtocolReq/Res, either bare or wrapped with a capture time:
+
+    <v2gTrace>
+      <message time="2024-05-01T10:00:00.123Z" connection="EVSE-1">
+        <V2G_Message xmlns="urn:iso:15118:2:2013:MsgDef">...</V2G_Message>
+      </message>
+    </v2gTrace>
+
+Without a time attribute the ISO 15118-20 header TimeStamp is used. The
+optional connection attribute separates interleaved EVSE connections in one
+file. Files ending in .gz are decompressed on the fly.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+
+from lxml import etree
+
+from slide_ir import MERMAID, Bullet, Diagram, Listing, Section, Slide, Text
+
+# Top-level elements that wrap one decoded message with capture metadata
+WRAPPERS = ('message', 'msg', 'frame', 'record')
+PROTOCOLS = (
+    (':15118:2:2013:', 'ISO 15118-2'),
+    (':15118:-20:', 'ISO 15118-20'),
+    ('din:70121', 'DIN 70121'),
+)
+_SELECTION_MESSAGES = ('PaymentServiceSelectionReq', 'AuthorizationReq')
+PAYMENTS = {'Contract': 'PnC', 'ExternalPayment': 'EIM', 'PnC': 'PnC', 'EIM': 'EIM'}
+PAYMENT_LABELS = {'PnC': 'Plug & Charge', 'EIM': 'External identification (EIM)', None: 'unknown authorization'}
+
+# Exchanges by phase of the session, in session order
+PHASES = (
+    ('Setup', ('SupportedAppProtocol', 'SessionSetup')),
+    ('Service selection', ('ServiceDiscovery', 'ServiceDetail', 'PaymentServiceSelection', 'ServiceSelection')),
+    ('Authorization', ('PaymentDetails', 'CertificateInstallation', 'CertificateUpdate', 'AuthorizationSetup',
+                       'Authorization', 'ContractAuthentication')),
+    ('Charge parameters', ('ChargeParameterDiscovery', 'DC_ChargeParameterDiscovery',
+                           'AC_ChargeParameterDiscovery', 'ScheduleExchange')),
+    ('Cable check & pre-charge', ('CableCheck', 'PreCharge', 'DC_CableCheck', 'DC_PreCharge')),
+    ('Charging', ('PowerDelivery', 'CurrentDemand', 'ChargingStatus', 'MeteringReceipt', 'DC_ChargeLoop',
+                  'AC_ChargeLoop', 'MeteringConfirmation')),
+    ('Shutdown', ('WeldingDetection', 'DC_WeldingDetection', 'SessionStop')),
+)
+_PHASE_OF = {name: phase for phase, names in PHASES for name in names}
+# The first of these marks the start of energy transfer
+CHARGE_LOOP = ('CurrentDemand', 'ChargingStatus', 'DC_ChargeLoop', 'AC_ChargeLoop')
+
+# Wrapped traces are parsed this many bytes of whole records at a time
+BLOCK_BYTES = 1024 * 1024
+INSERT_BATCH = 5000
+# Message rows per sequence-diagram slide
+SEQUENCE_ROWS = 16
+# Sessions shown when none are picked: the most common protocol/authorization groups
+DEFAULT_SESSIONS = 2
+BAR_WIDTH = 28
+
+# The document element: the first start tag that is not a declaration or comment
+_START_TAG = re.compile(rb'<([A-Za-z_][^\s/>]*)[^>]*?(/?)>')
+_ISO_UTC = re.compile(r'(\d{4}-\d\d-\d\d)[T ](\d\d:\d\d:\d\d)(?:\.(\d+))?Z?$')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS traces (
+    path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sessions INTEGER
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT NOT NULL, trace TEXT NOT NULL, protocol TEXT, payment TEXT,
+    start_ms INTEGER, duration_ms INTEGER, setup_ms INTEGER, messages INTEGER,
+    complete INTEGER, failed INTEGER, exchanges TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_by_id ON sessions (session_id);
+CREATE INDEX IF NOT EXISTS sessions_by_trace ON sessions (trace);
+CREATE INDEX IF NOT EXISTS sessions_by_setup ON sessions (complete, protocol, payment, setup_ms);
+"""
+_COLUMNS = ('session_id, trace, protocol, payment, start_ms, duration_ms, setup_ms, messages, complete, failed, '
+            'exchanges')
+
+
+@dataclass(frozen=True)
+class Exchange:
+    """A request/response pair, or a run of repeats (polling loops) collapsed into one"""
+    name: str
+    start_ms: int    # offset of the first request from the session start
+    end_ms: int      # offset of the last message of the run
+    count: int       # requests in the run
+    latency_ms: int  # request-to-response time summed over the run
+    code: str = None  # last response code, a failure code if any response failed
+
+    @property
+    def phase(self):
+        return _PHASE_OF.get(self.name, 'Other')
+
+
+@dataclass(frozen=True)
+class TraceSession:
+    session_id: str
+    protocol: str
+    payment: str
+    start_ms: int
+    duration_ms: int
+    setup_ms: int    # time to the first charge loop message, None if charging never started
+    messages: int
+    complete: bool   # ended with SessionStop
+    failed: bool     # some response carried a FAILED code
+    exchanges: tuple
+    trace: str = None
+
+
+# A trace repeats a few hundred distinct tags millions of times
+_local_names = {}
+_protocols = {}
+
+
+def _local(tag):
+    local = _local_names.get(tag)
+    if local is None:
+        # Comments and processing instructions have a function as their tag
+        local = _local_names[tag] = tag.rpartition('}')[2] if isinstance(tag, str) else ''
+    return local
+
+
+def _protocol(tag):
+    if tag not in _protocols:
+        _protocols[tag] = next((protocol for marker, protocol in PROTOCOLS if marker in tag), None)
+    return _protocols[tag]
+
+
+@lru_cache(maxsize=4096)
+def _second_ms(prefix):
+    return int(datetime.fromisoformat(f"{prefix}+00:00").timestamp()) * 1000
+
+
+def _stamp_ms(value):
+    """Milliseconds since the epoch for an ISO 8601 time (UTC unless offset) or epoch seconds"""
+    if len(value) == 24 and value[19] == '.' and value[23] == 'Z':
+        return _second_ms(value[:19]) + int(value[20:23])  # the usual capture format
+    value = value.strip()
+    match = _ISO_UTC.match(value)
+    if match:
+        day, clock, fraction = match.groups()
+        return _second_ms(f"{day}T{clock}") + int((fraction or '0')[:3].ljust(3, '0'))
+    try:
+        return round(float(value) * 1000)
+    except ValueError:
+        pass
+    stamp = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=timezone.utc)
+    return round(stamp.timestamp() * 1000)
+
+
+def _decode(message):
+    """(name, protocol, session id, response code, header time, payment) of one decoded message"""
+    header = fields = None
+    if _local(message.tag) == 'V2G_Message':
+        for child in message:
+            local = _local(child.tag)
+            if local == 'Header':
+                header = child
+            elif local == 'Body' and len(child):
+                fields = child[0]
+        if fields is None:
+            return None
+    else:
+        fields = message
+    name = _local(fields.tag)
+    session_id = stamp = code = payment = None
+    # Header and ResponseCode lead the message; only selections need a full scan
+    for child in fields if name in _SELECTION_MESSAGES else fields[:2]:
+        local = _local(child.tag)
+        if local == 'Header':
+            header = child
+        elif local == 'ResponseCode':
+            code = (child.text or '').strip()
+        elif local in ('SelectedPaymentOption', 'SelectedAuthorizationService'):
+            payment = PAYMENTS.get((child.text or '').strip())
+    if header is not None:
+        for child in header:
+            local = _local(child.tag)
+            if local == 'SessionID':
+                session_id = (child.text or '').strip().upper()
+            elif local == 'TimeStamp' and child.text:
+                stamp = int(child.text) * 1000
+    return name, _protocol(message.tag), session_id, code, stamp, payment
+
+
+class _SessionBuilder:
+    """Accumulates one session's messages as collapsed exchanges"""
+
+    __slots__ = ('session_id', 'protocol', 'payment', 'start', 'last', 'messages', 'exchanges', 'open_request',
+                 'complete', 'failed')
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.protocol = self.payment = self.start = self.last = self.open_request = None
+        self.messages = 0
+        self.exchanges = []  # [name, start, end, count, latency, code]
+        self.complete = self.failed = False
+
+    def add(self, name, protocol, t, code, payment):
+        if self.start is None:
+            self.start = t
+        self.last = t
+        self.messages += 1
+        self.protocol = self.protocol or protocol
+        self.payment = payment or self.payment
+        offset = t - self.start
+        kind = name[-3:]
+        base = name[:-3] if kind in ('Req', 'Res') else name
+        base = base[:1].upper() + base[1:]
+        last = self.exchanges[-1] if self.exchanges else None
+        if kind == 'Req':
+            if last is not None and last[0] == base and self.open_request is None:
+                last[3] += 1  # the EV repeats the request while the EVSE is still processing
+            else:
+                last = [base, offset, offset, 1, 0, None]
+                self.exchanges.append(last)
+            self.open_request = offset
+        else:
+            if last is None or last[0] != base:
+                last = [base, offset, offset, 0, 0, None]
+                self.exchanges.append(last)
+            elif self.open_request is not None:
+                last[4] += offset - self.open_request
+            self.open_request = None
+            if code:
+                if code.startswith('FAILED'):
+                    self.failed = True
+                if last[5] is None or not last[5].startswith('FAILED'):
+                    last[5] = code
+            if base == 'SessionStop':
+                self.complete = True
+        last[2] = offset
+
+    def session(self, trace=None):
+        exchanges = tuple(Exchange(*exchange) for exchange in self.exchanges)
+        setup = next((exchange.start_ms for exchange in exchanges if exchange.name in CHARGE_LOOP), None)
+        return TraceSession(self.session_id, self.protocol, self.payment, self.start, self.last - self.start, setup,
+                            self.messages, self.complete, self.failed, exchanges, trace)
+
+
+def _open_trace(path):
+    return gzip.open(path, 'rb') if path.endswith('.gz') else open(path, 'rb')
+
+
+def _wrapper_tag(path):
+    """Tag of the trace's first top-level element if it is a wrapper, None for bare messages"""
+    depth = 0
+    with _open_trace(path) as f:
+        for event, element in etree.iterparse(f, events=('start', 'end'), huge_tree=True):
+            if event == 'end':
+                depth -= 1
+                continue
+            depth += 1
+            if depth == 2:
+                return element.tag if _local(element.tag) in WRAPPERS else None
+    return None
+
+
+def _wrapped_records(path, wrapper, block_bytes=BLOCK_BYTES):
+    """Top-level elements of a wrapped trace, parsed a block of whole records at a time
+
+    Each block is its own small document under a copy of the trace's root tag.
+    One document for the whole file would grow without bound: libxml2 keeps
+    every namespace declaration of a document, and each message carries its own.
+    """
+    closing = f"</{wrapper}>".encode('utf-8')
+    parser = etree.XMLParser(huge_tree=True)
+    with _open_trace(path) as f:
+        data = f.read(block_bytes)
+        root = _START_TAG.search(data)
+        if root is None or root.group(2):
+            return  # no records
+        prolog, root_end = data[:root.end()], b'</' + root.group(1) + b'>'
+        data = data[root.end():]
+        while True:
+            chunk = f.read(block_bytes)
+            data += chunk
+            if chunk:
+                cut = data.rfind(closing)
+                if cut < 0:
+                    continue  # a record longer than a block
+                cut += len(closing)
+            else:
+                cut = data.rfind(root_end)
+                if cut < 0:
+                    # A capture cut short still yields its whole records
+                    cut = data.rfind(closing)
+                    cut = cut + len(closing) if cut >= 0 else 0
+            block, data = data[:cut], data[cut:]
+            if block.strip():
+                yield from etree.fromstring(prolog + block + root_end, parser).iterchildren(etree.Element)
+            if not chunk:
+                return
+
+
+def _streamed_records(path):
+    """Top-level elements of any trace via iterparse, dropped once the caller is done with them"""
+    with _open_trace(path) as f:
+        for _, element in etree.iterparse(f, events=('end',), huge_tree=True):
+            parent = element.getparent()
+            if parent is None or parent.getparent() is not None:
+                continue  # the document element, or an element inside a message
+            yield element
+            element.clear()
+            parent.remove(element)
+
+
+def parse_trace(path):
+    """Yield the TraceSession objects of one trace file, streaming it in constant memory
+
+    Messages sent before the EVSE assigns a session ID (supportedAppProtocol,
+    SessionSetupReq) belong to the session that SessionSetupRes opens.
+    """
+    connections = {}  # connection -> [session builder, messages awaiting a session id, last time]
+    wrapper = _wrapper_tag(path)
+    # Unprefixed wrappers can be cut apart as text; anything else is parsed as a whole
+    records = _wrapped_records(path, wrapper) if wrapper and wrapper[0] != '{' else _streamed_records(path)
+    for element in records:
+        if _local(element.tag) in WRAPPERS:
+            stamp, connection = element.get('time') or element.get('timestamp'), element.get('connection')
+            message = next(element.iterchildren(etree.Element), None)
+        else:
+            stamp, connection, message = None, None, element
+        decoded = _decode(message) if message is not None else None
+        if decoded is None:
+            continue
+        name, protocol, session_id, code, header_stamp, payment = decoded
+        state = connections.setdefault(connection, [None, [], 0])
+        current, pending, last_time = state
+        t = _stamp_ms(stamp) if stamp else header_stamp if header_stamp is not None else last_time
+        state[2] = t
+        anonymous = not session_id or not session_id.strip('0')
+        if anonymous:
+            if name in ('supportedAppProtocolReq', 'SessionSetupReq') and current is not None:
+                yield current.session(path)
+                state[0] = None
+            pending.append((name, protocol, t, code, payment))
+            continue
+        if current is None or current.session_id != session_id:
+            if current is not None:
+                yield current.session(path)
+            current = state[0] = _SessionBuilder(session_id)
+            for args in pending:
+                current.add(*args)
+            pending.clear()
+        current.add(name, protocol, t, code, payment)
+    for current, _, _ in connections.values():
+        if current is not None:
+            yield current.session(path)
+
+
+def _session_row(session, trace):
+    exchanges = [[e.name, e.start_ms, e.end_ms, e.count, e.latency_ms, e.code] for e in session.exchanges]
+    return (session.session_id, trace, session.protocol, session.payment, session.start_ms,
+            session.duration_ms, session.setup_ms, session.messages, int(session.complete), int(session.failed),
+            json.dumps(exchanges, separators=(',', ':')))
+
+
+def _row_session(row):
+    session_id, trace, protocol, payment, start, duration, setup, messages, complete, failed, exchanges = row
+    return TraceSession(session_id, protocol, payment, start, duration, setup, messages, bool(complete),
+                        bool(failed), tuple(Exchange(*exchange) for exchange in json.loads(exchanges)), trace)
+
+
+class SessionIndex:
+    """SQLite index of trace sessions: summary columns, indexed by session ID and
+    setup time, plus each session's exchanges as JSON
+
+    Picking a session or a percentile reads a handful of index pages, whatever
+    the number of sessions indexed.
+    """
+
+    def __init__(self, path, readonly=False):
+        self.path = path
+        if readonly:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"no session index at {path}; build one with v2g_traces.py")
+            self.db = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+        else:
+            self.db = sqlite3.connect(path)
+            self.db.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def add_trace(self, trace_path):
+        """Index one trace file; returns the sessions indexed, or None if it is unchanged"""
+        key = os.path.abspath(trace_path)
+        st = os.stat(trace_path)
+        known = self.db.execute("SELECT size, mtime_ns FROM traces WHERE path = ?", (key,)).fetchone()
+        if known == (st.st_size, st.st_mtime_ns):
+            return None
+        count = 0
+        with self.db:
+            self.db.execute("DELETE FROM sessions WHERE trace = ?", (key,))
+            batch = []
+            for session in parse_trace(trace_path):
+                batch.append(_session_row(session, key))
+                if len(batch) >= INSERT_BATCH:
+                    self._insert(batch)
+                    count += len(batch)
+                    batch = []
+            self._insert(batch)
+            count += len(batch)
+            self.db.execute("INSERT OR REPLACE INTO traces VALUES (?, ?, ?, ?)",
+                            (key, st.st_size, st.st_mtime_ns, count))
+        return count
+
+    def _insert(self, rows):
+        self.db.executemany(f"INSERT INTO sessions ({_COLUMNS}) VALUES ({', '.join('?' * 11)})", rows)
+
+    def session(self, session_id):
+        """The earliest indexed session with this ID, or None"""
+        row = self.db.execute(f"SELECT {_COLUMNS} FROM sessions WHERE session_id = ? ORDER BY start_ms LIMIT 1",
+                              (session_id.upper(),)).fetchone()
+        return _row_session(row) if row else None
+
+    def _setup_where(self, protocol, payment):
+        return ("complete = 1 AND protocol IS ? AND payment IS ? AND setup_ms IS NOT NULL", (protocol, payment))
+
+    def _setup_at(self, protocol, payment, count, fraction):
+        where, args = self._setup_where(protocol, payment)
+        offset = min(int(count * fraction), count - 1)
+        return self.db.execute(f"SELECT setup_ms FROM sessions WHERE {where} ORDER BY setup_ms LIMIT 1 OFFSET ?",
+                               (*args, offset)).fetchone()[0]
+
+    def representative(self, protocol, payment):
+        """The completed session with the median time to energy transfer in a protocol/authorization group"""
+        where, args = self._setup_where(protocol, payment)
+        count = self.db.execute(f"SELECT COUNT(*) FROM sessions WHERE {where}", args).fetchone()[0]
+        if not count:
+            return None
+        row = self.db.execute(f"SELECT {_COLUMNS} FROM sessions WHERE {where} ORDER BY setup_ms LIMIT 1 OFFSET ?",
+                              (*args, count // 2)).fetchone()
+        return _row_session(row)
+
+    def stats(self):
+        """(protocol, payment, sessions, median and p90 time to energy transfer in ms), largest group first"""
+        groups = self.db.execute("SELECT protocol, payment, COUNT(*) FROM sessions "
+                                 "WHERE complete = 1 AND setup_ms IS NOT NULL "
+                                 "GROUP BY protocol, payment ORDER BY COUNT(*) DESC").fetchall()
+        return [(protocol, payment, count, self._setup_at(protocol, payment, count, 0.5),
+                 self._setup_at(protocol, payment, count, 0.9))
+                for protocol, payment, count in groups]
+
+    def counts(self):
+        """(traces, sessions) indexed"""
+        return (self.db.execute("SELECT COUNT(*) FROM traces").fetchone()[0],
+                self.db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0])
+
+
+def _duration(ms):
+    if ms is None:
+        return "n/a"
+    if ms < 1000:
+        return f"{ms:,} ms"
+    if ms < 60000:
+        return f"{ms / 1000:.1f} s"
+    return f"{ms / 60000:.1f} min"
+
+
+def phase_times(session):
+    """{phase: ms} in session order; each exchange run lasts until the next one starts"""
+    times = {}
+    exchanges = session.exchanges
+    for i, exchange in enumerate(exchanges):
+        end = exchanges[i + 1].start_ms if i + 1 < len(exchanges) else exchange.end_ms
+        times[exchange.phase] = times.get(exchange.phase, 0) + end - exchange.start_ms
+    return times
+
+
+def sequence_source(exchanges):
+    """Mermaid sequenceDiagram of exchanges between the EV and the EVSE"""
+    lines = ["sequenceDiagram", "    participant EV", "    participant EVSE as Charging Station"]
+    for e in exchanges:
+        code = f" {e.code}" if e.code and e.code != 'OK' else ''
+        if e.count > 1:
+            lines.append(f"    loop {e.count}x in {_duration(e.end_ms - e.start_ms)}")
+            latency = f"avg {_duration(e.latency_ms // e.count)}"
+        else:
+            latency = _duration(e.latency_ms)
+        if e.count:
+            lines.append(f"    EV->>EVSE: {e.name}Req at {_duration(e.start_ms)}")
+            lines.append(f"    EVSE-->>EV: {e.name}Res{code}, {latency}")
+        else:
+            lines.append(f"    EVSE-->>EV: {e.name}Res{code}")
+        if e.count > 1:
+            lines.append("    end")
+    return '\n'.join(lines)
+
+
+def _bars(values, width=BAR_WIDTH):
+    """Monospaced bar chart lines for {label: ms}"""
+    top = max(values.values(), default=0) or 1
+    label_width = max((len(label) for label in values), default=0)
+    return '\n'.join(f"{label:>{label_width}} {'█' * round(width * ms / top):<{width}} {_duration(ms)}"
+                     for label, ms in values.items())
+
+
+def session_slides(session, stats=()):
+    """Sequence-diagram slides plus a timing slide (slide IR) for one TraceSession"""
+    s = session
+    authorization = PAYMENT_LABELS.get(s.payment, s.payment)
+    started = datetime.fromtimestamp(s.start_ms / 1000, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    heading = f"Session {s.session_id}, {started} UTC:"
+
+    pages = []
+    for exchange in s.exchanges:
+        if not pages or sum(2 if e.count else 1 for e in pages[-1]) + 2 > SEQUENCE_ROWS:
+            pages.append([])
+        pages[-1].append(exchange)
+    slides = []
+    for number, page in enumerate(pages, 1):
+        suffix = f" ({number}/{len(pages)})" if len(pages) > 1 else ''
+        slides.append(Slide(f"Recorded {s.protocol or 'V2G'} Session{suffix}", (
+            Section(heading, items=(Diagram(MERMAID, sequence_source(page)),)),
+        ), name='v2g_sequence'))
+
+    phases = phase_times(s)
+    before_charging = {phase: phases[phase] for phase, _ in PHASES[:5] if phase in phases}
+    slowest = max(s.exchanges, key=lambda e: e.latency_ms / e.count if e.count else 0, default=None)
+    outcome = ("❌ Failed: " + ', '.join(e.code for e in s.exchanges if e.code and e.code.startswith('FAILED'))
+               if s.failed else "✅ Completed with SessionStop" if s.complete else "❌ Ended without SessionStop")
+    sections = [
+        Section("Time to Energy Transfer by Phase:", items=(Listing(_bars(before_charging)),)),
+        Section(f"{s.protocol or 'V2G'}, {authorization}:", 'SECONDARY_GREEN', tuple(Bullet(text) for text in (
+            f"{_duration(s.setup_ms)} to energy transfer, {_duration(s.duration_ms)} in total",
+            f"{s.messages:,} messages in {len(s.exchanges)} exchanges",
+            f"Slowest EVSE response: {slowest.name}, {_duration(slowest.latency_ms // max(slowest.count, 1))}"
+            if slowest else "No responses recorded",
+            outcome,
+        ))),
+    ]
+    if stats:
+        sections.append(Section("All Indexed Sessions, Time to Energy Transfer:", 'ACCENT_ORANGE', tuple(
+            Bullet(f"{protocol}, {PAYMENT_LABELS.get(payment, payment)}: median {_duration(median)}, "
+                   f"p90 {_duration(p90)} ({count:,} sessions)")
+            for protocol, payment, count, median, p90 in stats[:3])))
+    slides.append(Slide(f"Recorded Session Timing ({s.protocol or 'V2G'}, {s.payment or 'unknown'})",
+                        tuple(sections), name='v2g_timing'))
+    return slides
+
+
+def index_slides(index_path, session_ids=()):
+    """Slides for the given session IDs, or for the median session of the largest groups in the index"""
+    with SessionIndex(index_path, readonly=True) as index:
+        stats = index.stats()
+        if session_ids:
+            sessions = []
+            for session_id in session_ids:
+                session = index.session(session_id)
+                if session is None:
+                    raise ValueError(f"no session {session_id!r} in {index_path}")
+                sessions.append(session)
+        else:
+            sessions = [index.representative(protocol, payment)
+                        for protocol, payment, *_ in stats[:DEFAULT_SESSIONS]]
+    if not sessions:
+        return (Slide("Recorded ISO 15118 Sessions", (
+            Section("No completed sessions indexed", items=(Text(index_path, italic=True),)),
+        ), name='v2g_sequence'),)
+    return tuple(slide for session in sessions for slide in session_slides(session, stats))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index ISO 15118 V2G message traces by session")
+    parser.add_argument('traces', nargs='*', help="decoded trace files (.xml, optionally .gz) to index")
+    parser.add_argument('--db', default='v2g_sessions.sqlite', help="session index to build or query")
+    parser.add_argument('--session', metavar='ID', help="print the exchanges of one session")
+    args = parser.parse_args()
+
+    with SessionIndex(args.db, readonly=not args.traces) as index:
+        for path in args.traces:
+            start = time.perf_counter()
+            count = index.add_trace(path)
+            if count is None:
+                print(f"✅ {path}: unchanged")
+            else:
+                print(f"✅ {path}: {count:,} sessions indexed in {time.perf_counter() - start:.1f}s")
+
+        if args.session:
+            session = index.session(args.session)
+            if session is None:
+                raise ValueError(f"no session {args.session!r} in {args.db}")
+            print(f"📊 {session.session_id} {session.protocol} {session.payment or ''}: "
+                  f"{_duration(session.setup_ms)} to energy transfer, {_duration(session.duration_ms)} total")
+            for e in session.exchanges:
+                print(f"   {_duration(e.start_ms):>10}  {e.name:<28} x{e.count:<5} {e.code or ''}")
+            return
+
+        traces, sessions = index.counts()
+        print(f"📊 {sessions:,} sessions from {traces:,} trace file(s) in {args.db}")
+        for protocol, payment, count, median, p90 in index.stats():
+            print(f"   {protocol or '?':<13} {payment or '?':<4} {count:>10,} sessions  "
+                  f"median {_duration(median)} to energy transfer, p90 {_duration(p90)}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except (OSError, ValueError, sqlite3.Error, etree.XMLSyntaxError) as e:
+        print(f"❌ Error indexing traces: {e}")
+        sys.exit(1)